@@ -29,6 +29,20 @@ from artwork_actions import ActionFetchArtworkPure
 from artist_actions import ActionFetchArtist
 from greeting_actions import ActionGreet, ActionGoodbye
 from museum_actions import ActionFetchMuseumInfo
+from utils import wikipedia_client, warm_cache, start_refresh_scheduler
+
+# Open pooled Wikipedia connections while the action server starts up
+# (opt-in: this module is also imported by rasa train/test and offline runs)
+if os.getenv("WIKIPEDIA_WARMUP_ON_START", "false").lower() == "true":
+    wikipedia_client.warm_up(background=True)
+
+# Resolve the known catalog into the response cache before the first visitor asks
+if os.getenv("WIKIPEDIA_CACHE_WARMUP_ON_START", "false").lower() == "true":
+    warm_cache(wikipedia_client, concurrency=int(os.getenv("WIKIPEDIA_WARMUP_CONCURRENCY", "8")), background=True)
+
+# Refresh the most requested cache entries ahead of expiry while visitors are quiet
+if os.getenv("WIKIPEDIA_REFRESH_SCHEDULER", "false").lower() == "true":
+    start_refresh_scheduler(wikipedia_client)
 
 # Import comprehensive actions for enhanced functionality
 try:
@@ -6,6 +6,7 @@ import os
 import sys
 from typing import Any, Text, Dict, List
 from rasa_sdk import Action, Tracker
+from rasa_sdk.events import SlotSet
 from rasa_sdk.executor import CollectingDispatcher
 
 # Add utils to path
@@ -16,16 +17,24 @@ if utils_path not in sys.path:
 from utils import (
     setup_logger,
     extract_artist_from_message,
-    wikipedia_client,
+    knowledge_sources,
+    async_wikipedia_client,
+    make_cursor,
+    cursor_matches,
     summarize_artist_biography,
     extract_biographical_info,
     detect_user_language,
-    get_response_template
+    get_response_template,
+    Deadline,
+    LOOKUP_BUDGET
 )
 from utils.mappings import KNOWN_ARTISTS # Added import
 
 logger = setup_logger(__name__)
 
+# Follow-up intents answered with the next section of the artist's page
+FOLLOW_UP_INTENTS = ('ask_artist_bio',)
+
 
 class ActionFetchArtist(Action):
     """Intelligent artist search with natural, interpreted responses"""
@@ -89,10 +98,30 @@ class ActionFetchArtist(Action):
         
         dispatcher.utter_message(text=message)
     
-    def run(self, dispatcher: CollectingDispatcher,
+    async def continue_reading(self, dispatcher: CollectingDispatcher, cursor: Dict, user_language: str,
+                               deadline: Deadline) -> List[Dict[Text, Any]]:
+        """Answers a follow-up with the next section of the biography the visitor is reading, and moves the cursor on"""
+        section, cursor = await async_wikipedia_client.read_next_section(cursor, deadline=deadline)
+        if section:
+            logger.info(f"Continuing '{cursor['title']}' with section '{section['heading']}' (index {section['index']})")
+            heading_template = get_response_template(user_language, 'more_about')
+            message = heading_template.format(title=cursor['title'], heading=section['heading'] or cursor['title'])
+            message += f"\n\n{summarize_artist_biography(section['text'], cursor['title'])}"
+            dispatcher.utter_message(text=message)
+        elif cursor.get('finished'):
+            no_more_template = get_response_template(user_language, 'no_more_sections')
+            dispatcher.utter_message(text=no_more_template.format(title=cursor['title']))
+        else:
+            technical_error_template = get_response_template(user_language, 'technical_error')
+            dispatcher.utter_message(text=technical_error_template)
+        return [SlotSet("content_cursor", cursor)]
+    
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
+        # Latency budget for all Wikipedia calls of this action run
+        deadline = Deadline(LOOKUP_BUDGET)
         user_message = tracker.latest_message.get('text', '')
         user_language = detect_user_language(user_message)
         
@@ -101,6 +130,12 @@ class ActionFetchArtist(Action):
         artist_name_intent_extracted = extract_artist_from_message(user_message)
 
         logger.debug(f"Artist slot: '{artist_name_slot}', Artist from message extraction: '{artist_name_intent_extracted}'")
+        
+        # "Tell me more" about the artist the visitor is reading: next section instead of a new lookup
+        cursor = tracker.get_slot("content_cursor")
+        if tracker.latest_message.get('intent', {}).get('name') in FOLLOW_UP_INTENTS and \
+           cursor_matches(cursor, 'artist', next(tracker.get_latest_entity_values("artist_name"), None)):
+            return await self.continue_reading(dispatcher, cursor, user_language, deadline)
 
         chosen_artist_name = None
         if artist_name_slot and artist_name_intent_extracted:
@@ -144,12 +179,13 @@ class ActionFetchArtist(Action):
                  cleaned_artist_name_for_search = artist_name_for_search # revert to original
 
             logger.info(f"Cleaned artist name for Wikipedia client: '{cleaned_artist_name_for_search}'")
-            wiki_data = wikipedia_client.search_artist(cleaned_artist_name_for_search)
+            wiki_data = await knowledge_sources.search_artist(cleaned_artist_name_for_search, deadline=deadline)
             
             if wiki_data and wiki_data.get('extract') and wiki_data.get('title'):
                 # Use the title from Wikipedia as the display name
                 display_name = wiki_data.get('title')
                 self.create_artist_response(dispatcher, wiki_data, display_name, user_language)
+                return [SlotSet("content_cursor", make_cursor('artist', wiki_data))]
             else:
                 logger.warning(f"No sufficient Wikipedia data found for artist '{cleaned_artist_name_for_search}'. Searched for: '{artist_name_for_search}'")
                 artist_not_found_template = get_response_template(user_language, 'artist_not_found')
@@ -161,4 +197,4 @@ class ActionFetchArtist(Action):
             technical_error_template = get_response_template(user_language, 'technical_error')
             dispatcher.utter_message(text=technical_error_template)
         
-        return []
+        return [SlotSet("content_cursor", None)]
@@ -6,6 +6,7 @@ import os
 import sys
 from typing import Any, Text, Dict, List
 from rasa_sdk import Action, Tracker
+from rasa_sdk.events import SlotSet
 from rasa_sdk.executor import CollectingDispatcher
 
 # Add utils to path
@@ -16,17 +17,25 @@ if utils_path not in sys.path:
 from utils import (
     setup_logger,
     extract_artwork_from_message,
-    wikipedia_client,
+    knowledge_sources,
+    async_wikipedia_client,
+    make_cursor,
+    cursor_matches,
     summarize_wikipedia_content,
     extract_artist_from_wikipedia,
     detect_user_language,
     get_response_template,
     ARTWORK_INFO,
+    Deadline,
+    LOOKUP_BUDGET,
     clean_artwork_name # Added missing import
 )
 
 logger = setup_logger(__name__)
 
+# Follow-up intents answered with the next section of the artwork's page
+FOLLOW_UP_INTENTS = ('ask_artwork_details', 'ask_interpretation')
+
 
 class ActionFetchArtworkPure(Action):
     """Intelligent artwork search with natural, interpreted responses"""
@@ -101,10 +110,38 @@ class ActionFetchArtworkPure(Action):
           # Send the beautifully formatted response
         dispatcher.utter_message(text=message)
     
-    def run(self, dispatcher: CollectingDispatcher,
+    def respond_from_artwork_info(self, dispatcher: CollectingDispatcher, artwork_name: str, user_language: str = 'de') -> bool:
+        """Answers from ARTWORK_INFO alone (catalog source, or Wikipedia did not deliver in time); returns False for unknown artworks"""
+        if artwork_name.lower() not in ARTWORK_INFO:
+            return False
+        logger.info(f"Answering '{artwork_name}' from ARTWORK_INFO without Wikipedia data")
+        self.create_natural_response(dispatcher, {}, artwork_name, user_language)
+        return True
+    
+    async def continue_reading(self, dispatcher: CollectingDispatcher, cursor: Dict, user_language: str,
+                               deadline: Deadline) -> List[Dict[Text, Any]]:
+        """Answers a follow-up with the next section of the page the visitor is reading, and moves the cursor on"""
+        section, cursor = await async_wikipedia_client.read_next_section(cursor, deadline=deadline)
+        if section:
+            logger.info(f"Continuing '{cursor['title']}' with section '{section['heading']}' (index {section['index']})")
+            heading_template = get_response_template(user_language, 'more_about')
+            message = heading_template.format(title=cursor['title'], heading=section['heading'] or cursor['title'])
+            message += f"\n\n{summarize_wikipedia_content(section['text'], cursor['title'])}"
+            dispatcher.utter_message(text=message)
+        elif cursor.get('finished'):
+            no_more_template = get_response_template(user_language, 'no_more_sections')
+            dispatcher.utter_message(text=no_more_template.format(title=cursor['title']))
+        else:
+            technical_error_template = get_response_template(user_language, 'technical_error')
+            dispatcher.utter_message(text=technical_error_template)
+        return [SlotSet("content_cursor", cursor)]
+    
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
+        # Latency budget for all Wikipedia calls of this action run
+        deadline = Deadline(LOOKUP_BUDGET)
         user_message = tracker.latest_message.get('text', '')
         user_language = detect_user_language(user_message)
         
@@ -112,6 +149,12 @@ class ActionFetchArtworkPure(Action):
         # Always try to extract from the message, as slot might be stale or less specific
         artwork_name_intent = extract_artwork_from_message(user_message)
         
+        # "Tell me more" about the artwork the visitor is reading: next section instead of a new lookup
+        cursor = tracker.get_slot("content_cursor")
+        if tracker.latest_message.get('intent', {}).get('name') in FOLLOW_UP_INTENTS and \
+           cursor_matches(cursor, 'artwork', next(tracker.get_latest_entity_values("artwork_name"), None)):
+            return await self.continue_reading(dispatcher, cursor, user_language, deadline)
+        
         # Prioritize intent extraction if it's more specific or slot is missing
         if artwork_name_intent and (not artwork_name_slot or len(artwork_name_intent) > len(artwork_name_slot)):
             artwork_name = artwork_name_intent
@@ -133,23 +176,29 @@ class ActionFetchArtworkPure(Action):
         logger.info(f"Suche nach Kunstwerk: '{artwork_name_for_search}' (Original extracted: '{artwork_name}', Language: {user_language})")
         
         try:
-            # Wikipedia search with improved validation
-            wiki_data = wikipedia_client.search_artwork(artwork_name_for_search)
+            # Knowledge sources (Wikipedia first, plus any configured secondary sources)
+            wiki_data = await knowledge_sources.search_artwork(artwork_name_for_search, deadline=deadline)
             
             if wiki_data and wiki_data.get('extract'):
                 logger.info(f"Wikipedia data found for '{artwork_name_for_search}'. Creating natural response.")
                 # Use the most accurate title from Wikipedia if available, otherwise the searched name
                 display_artwork_name = wiki_data.get('title', artwork_name_for_search)
                 self.create_natural_response(dispatcher, wiki_data, display_artwork_name, user_language)
+                return [SlotSet("content_cursor", make_cursor('artwork', wiki_data))]
+            elif wiki_data.get('catalog_record') and self.respond_from_artwork_info(dispatcher, wiki_data['title'], user_language):
+                logger.info(f"Local catalog answered for '{artwork_name_for_search}'.")
             else:
-                logger.warning(f"No valid Wikipedia data found for '{artwork_name_for_search}'.")
-                not_found_template = get_response_template(user_language, 'artwork_not_found')
-                # Display the name the user originally asked for, if possible, for clarity
-                dispatcher.utter_message(text=not_found_template.format(artwork_name=artwork_name))
+                logger.warning(f"No valid Wikipedia data found for '{artwork_name_for_search}' (lookup budget spent: {deadline.expired()}).")
+                # Known artworks can still be answered from the local catalog
+                if not self.respond_from_artwork_info(dispatcher, artwork_name_for_search, user_language):
+                    not_found_template = get_response_template(user_language, 'artwork_not_found')
+                    # Display the name the user originally asked for, if possible, for clarity
+                    dispatcher.utter_message(text=not_found_template.format(artwork_name=artwork_name))
                 
         except Exception as e:
             logger.error(f"Fehler bei Kunstwerk-Suche: {e}")
-            technical_error_template = get_response_template(user_language, 'technical_error')
-            dispatcher.utter_message(text=technical_error_template)
+            if not self.respond_from_artwork_info(dispatcher, artwork_name_for_search, user_language):
+                technical_error_template = get_response_template(user_language, 'technical_error')
+                dispatcher.utter_message(text=technical_error_template)
         
-        return []
+        return [SlotSet("content_cursor", None)]
@@ -16,10 +16,11 @@ if utils_path not in sys.path:
 
 from utils import (
     setup_logger,
-    wikipedia_client,
+    async_wikipedia_client,
     summarize_wikipedia_content,
     detect_user_language,
-    get_response_template
+    get_response_template,
+    LOOKUP_BUDGET
 )
 
 logger = setup_logger(__name__)
@@ -31,7 +32,7 @@ class ActionFetchArtInfo(Action):
     def name(self) -> Text:
         return "action_fetch_art_info"
     
-    def run(self, dispatcher: CollectingDispatcher,
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
@@ -139,32 +140,30 @@ class ActionFetchArtInfo(Action):
             logger.info(f"Suche Kunstinformationen für: '{search_term}' (Kategorie: {category or 'Unbekannt'})")
             
             # Suche in Wikipedia
-            # Ensure wikipedia_client is initialized (assuming it is from utils)
-            page = None
+            page = {}
             try:
-                page = wikipedia_client.page(search_term) # Search with the cleaner term
-            except Exception as wiki_error: # Catch specific wikipedia exceptions if possible
+                page = await async_wikipedia_client.get_summary(search_term.replace(' ', '_'), 'de', deadline=LOOKUP_BUDGET) # Search with the cleaner term
+            except Exception as wiki_error:
                 logger.error(f"Wikipedia search error for '{search_term}': {wiki_error}")
             
-            if page and page.exists(): # Check if page actually exists
-                content = summarize_wikipedia_content(page.summary, max_sentences=5) # Use summary, often cleaner
-                
-                if not content.strip(): # If summary is empty or just whitespace
-                    content = summarize_wikipedia_content(page.content, max_sentences=5) # Fallback to full content
+            if page and page.get('extract'): # Check if page actually exists
+                content = summarize_wikipedia_content(page['extract'], search_term)
+                page_url = page.get('content_urls', {}).get('desktop', {}).get('page', '')
 
                 if not content.strip(): # If still no content
-                    dispatcher.utter_message(text=f"Ich habe einen Artikel zu '{page.title}' gefunden, konnte aber keine Zusammenfassung erstellen. Möchten Sie den Link zur Seite? {page.fullurl}")
+                    dispatcher.utter_message(text=f"Ich habe einen Artikel zu '{page.get('title', search_term)}' gefunden, konnte aber keine Zusammenfassung erstellen. Möchten Sie den Link zur Seite? {page_url}")
                     return [SlotSet("last_query", search_term), SlotSet("conversation_context", category)]
 
                 # Formatierte Antwort
-                title = page.title
+                title = page.get('title', search_term)
                 if category:
                     response_text = f"🎨 **{category}: {title}**\\n\\n"
                 else:
                     response_text = f"🎨 **{title}**\\n\\n"
 
                 response_text += f"📖 **Information (Quelle: Wikipedia):**\\n{content}\\n\\n"
-                response_text += f"🔗 Mehr dazu: {page.fullurl}\\n\\n"
+                if page_url:
+                    response_text += f"🔗 Mehr dazu: {page_url}\\n\\n"
                 
                 # Zusätzliche Empfehlungen je nach Kategorie
                 if category == "Kunstrichtung" and (art_movement_slot or search_term.lower() in art_keywords_map): # Check if it was indeed an art movement
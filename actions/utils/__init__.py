@@ -19,7 +19,8 @@ from .text_cleaner import (
 from .validation import (
     is_artwork_content,
     calculate_relevance_score,
-    calculate_artist_relevance
+    calculate_artist_relevance,
+    is_artist_content
 )
 from .summarizer import (
     summarize_wikipedia_content,
@@ -28,7 +29,22 @@ from .summarizer import (
     extract_biographical_info,
     clean_text_content
 )
-from .wikipedia_client import WikipediaClient, wikipedia_client
+from .response_cache import ResponseCache, response_cache
+from .deadline import Deadline, LOOKUP_BUDGET
+from .wikipedia_client import ClientConfig, WikipediaClient, wikipedia_client
+from .async_wikipedia_client import AsyncWikipediaClient, async_wikipedia_client
+from .cache_warmup import warm_cache, format_warm_up_report
+from .refresh_scheduler import RefreshScheduler, start_refresh_scheduler
+from .section_reader import make_cursor, cursor_matches
+from .europeana_service import EuropeanaService, europeana_service
+from .knowledge_sources import (
+    KnowledgeSource,
+    WikipediaSource,
+    EuropeanaSource,
+    CatalogSource,
+    FederatedSearch,
+    knowledge_sources
+)
 from .language_detector import (
     detect_user_language,
     get_response_template,
@@ -56,16 +72,46 @@ __all__ = [
     # Validation
     'is_artwork_content',
     'calculate_relevance_score',
-    'calculate_artist_relevance',    # Summarization
+    'calculate_artist_relevance',
+    'is_artist_content',    # Summarization
     'summarize_wikipedia_content',
     'summarize_artist_biography',
     'extract_artist_from_wikipedia',
     'extract_biographical_info',
     'clean_text_content',
     
+    # Response cache
+    'ResponseCache',
+    'response_cache',
+    
+    # Lookup deadline
+    'Deadline',
+    'LOOKUP_BUDGET',
+    
     # Wikipedia client
+    'ClientConfig',
     'WikipediaClient',
     'wikipedia_client',
+    'AsyncWikipediaClient',
+    'async_wikipedia_client',
+    'warm_cache',
+    'format_warm_up_report',
+    'RefreshScheduler',
+    'start_refresh_scheduler',
+    
+    # Section paging
+    'make_cursor',
+    'cursor_matches',
+    
+    # Knowledge sources
+    'EuropeanaService',
+    'europeana_service',
+    'KnowledgeSource',
+    'WikipediaSource',
+    'EuropeanaSource',
+    'CatalogSource',
+    'FederatedSearch',
+    'knowledge_sources',
     
     # Language detection
     'detect_user_language',
@@ -0,0 +1,89 @@
+"""
+Access statistics of cached Wikipedia lookups
+Both clients count every lookup here; the counts decay over time, so the top entries are the
+ones visitors asked for recently and often. The refresh scheduler keeps those entries fresh.
+"""
+import heapq
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from .response_cache import normalize_cache_key
+
+# (kind, language, normalized query) of a lookup, as in the response cache key
+LookupKey = Tuple[str, str, str]
+
+
+class AccessStats:
+    """Thread-safe, bounded map of lookup -> decaying access count"""
+    
+    def __init__(self, max_entries: int = 2000):
+        """
+        Args:
+            max_entries: Lookups tracked at most; the coldest ones are dropped beyond that
+        """
+        self.max_entries = max_entries
+        self._counts: Dict[LookupKey, float] = {}
+        self._lock = threading.Lock()
+        self._last_access: Optional[float] = None
+    
+    def record(self, kind: str, language: str, query: str):
+        """
+        Count one lookup
+        
+        Args:
+            kind: Lookup type
+            language: Language code
+            query: Title or query text
+        """
+        key = (kind, language, normalize_cache_key(query))
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0.0) + 1
+            self._last_access = time.monotonic()
+            if len(self._counts) > self.max_entries:
+                # Prune to 90% at once so the O(n) sweep does not run on every new lookup
+                keep = heapq.nlargest(int(self.max_entries * 0.9), self._counts.items(), key=lambda item: item[1])
+                self._counts = dict(keep)
+    
+    def decay(self, factor: float):
+        """
+        Age all counts, forgetting lookups whose count dropped below 0.01
+        
+        Args:
+            factor: Multiplier between 0 and 1 applied to every count
+        """
+        with self._lock:
+            self._counts = {key: count * factor for key, count in self._counts.items() if count * factor >= 0.01}
+    
+    def top(self, n: int) -> List[Tuple[LookupKey, float]]:
+        """
+        Get the hottest lookups
+        
+        Args:
+            n: Number of lookups returned
+        
+        Returns:
+            List of ((kind, language, normalized query), count), hottest first
+        """
+        with self._lock:
+            return heapq.nlargest(n, self._counts.items(), key=lambda item: item[1])
+    
+    def idle_for(self) -> float:
+        """Seconds since the last lookup (infinite if there was none yet)"""
+        with self._lock:
+            last_access = self._last_access
+        return float('inf') if last_access is None else time.monotonic() - last_access
+    
+    def clear(self):
+        """Forget all counts"""
+        with self._lock:
+            self._counts.clear()
+    
+    def __len__(self) -> int:
+        return len(self._counts)
+
+
+# Global instance shared by the sync and async Wikipedia clients, kept only for the refresh scheduler
+access_stats = AccessStats(
+    max_entries=int(os.getenv('WIKIPEDIA_REFRESH_TRACKED', '2000'))
+) if os.getenv('WIKIPEDIA_REFRESH_SCHEDULER', 'false').lower() == 'true' else None
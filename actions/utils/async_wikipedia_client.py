@@ -0,0 +1,199 @@
+"""
+Asyncio Wikipedia API client for artwork and artist information retrieval
+Non-blocking twin of WikipediaClient for use inside async Rasa actions: the lookups are the
+steps of WikipediaClientBase, this client only performs their I/O with aiohttp and tasks
+"""
+import asyncio
+import ssl
+import aiohttp
+from typing import Any, Dict, Optional, Tuple, Union
+from .logging_config import setup_logger
+from .deadline import Deadline, deadline_scope, detached_scope
+from .http_fixtures import AsyncRecordingSession, AsyncReplaySession
+from .single_flight import AsyncSingleFlight
+from .wikipedia_client import (
+    USER_AGENT,
+    Background,
+    Blocking,
+    Cancel,
+    ClientConfig,
+    Handle,
+    RequestFailed,
+    Send,
+    Shared,
+    Sleep,
+    Start,
+    Step,
+    Wait,
+    WikipediaClientBase
+)
+
+logger = setup_logger(__name__)
+
+
+class AsyncWikipediaClient(WikipediaClientBase):
+    """Async client for interacting with Wikipedia API, same search semantics as WikipediaClient"""
+    
+    def __init__(self, config: Optional[ClientConfig] = None, **options: Any):
+        """
+        Args:
+            config: Client options, see ClientConfig (defaults to ClientConfig())
+            **options: ClientConfig fields overriding those of config
+        """
+        super().__init__(config, **options)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._flights = AsyncSingleFlight(empty={})
+        self._refresh_tasks: set = set()
+    
+    def _ssl_option(self) -> Union[bool, ssl.SSLContext]:
+        """Translate the verify setting into aiohttp's ssl argument"""
+        if isinstance(self.verify, str):
+            return ssl.create_default_context(cafile=self.verify)
+        return bool(self.verify)
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Get the pooled session of the running event loop, creating it on first use
+        
+        Returns:
+            aiohttp.ClientSession with a per-host connection limit
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            connector = aiohttp.TCPConnector(limit_per_host=self.pool_size, ssl=self._ssl_option())
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={'User-Agent': USER_AGENT},
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._session_loop = loop
+            logger.debug(f"Created aiohttp session (pool size per host: {self.pool_size})")
+        return self._session
+    
+    def _transport_session(self):
+        """
+        Get the session that sends a request: the pooled one, recording into or replaced by the fixtures
+        
+        Returns:
+            aiohttp.ClientSession, AsyncRecordingSession or AsyncReplaySession
+        """
+        if self.transport == 'replay':
+            return AsyncReplaySession(self.fixtures)
+        session = self._get_session()
+        if self.transport == 'record':
+            return AsyncRecordingSession(session, self.fixtures)
+        return session
+    
+    
+    async def _run(self, step: Step, deadline: Union[Deadline, float, None] = None) -> Any:
+        """
+        Drive a step to completion on the event loop; started steps run as tasks
+        
+        Args:
+            step: Lookup step
+            deadline: Latency budget (Deadline or seconds) for all HTTP calls of the step
+        
+        Returns:
+            The step's result
+        """
+        with deadline_scope(deadline):
+            result, error = None, None
+            while True:
+                try:
+                    op = step.throw(error) if error is not None else step.send(result)
+                except StopIteration as stop:
+                    return stop.value
+                try:
+                    result, error = await self._perform(op), None
+                except BaseException as e:
+                    # Includes CancelledError, so the step's finally blocks run before the task ends
+                    result, error = None, e
+    
+    async def _perform(self, op: Any) -> Any:
+        """Perform one operation yielded by a step"""
+        if isinstance(op, Send):
+            return await self._send(op)
+        if isinstance(op, Sleep):
+            await asyncio.sleep(op.seconds)
+            return None
+        if isinstance(op, Start):
+            return Handle(asyncio.ensure_future(self._run(op.step, op.deadline)), op.deadline)
+        if isinstance(op, Wait):
+            if not op.handles:
+                return set()
+            tasks = {handle.future: handle for handle in op.handles}
+            done, _ = await asyncio.wait(tasks, timeout=op.timeout,
+                                         return_when=asyncio.FIRST_COMPLETED if op.first else asyncio.ALL_COMPLETED)
+            return {tasks[task] for task in done}
+        if isinstance(op, Cancel):
+            for handle in op.handles:
+                handle.cancel()
+            return None
+        if isinstance(op, Shared):
+            return await self._flights.do(op.key, lambda: self._run(op.step))
+        if isinstance(op, Background):
+            # Keep a reference, the event loop only holds weak ones
+            task = asyncio.ensure_future(self._run_detached(op.step))
+            self._refresh_tasks.add(task)
+            task.add_done_callback(self._refresh_tasks.discard)
+            return None
+        if isinstance(op, Blocking):
+            # SQLite calls wait on file locks (up to their busy timeout); keep them off the event loop
+            return await asyncio.to_thread(op.function, *op.args)
+        raise TypeError(f"Unknown step operation: {op!r}")
+    
+    async def _send(self, op: Send) -> Tuple[int, Any]:
+        """
+        Send one request
+        
+        Returns:
+            Tuple of (HTTP status, decoded JSON body or None)
+        
+        Raises:
+            RequestFailed: On connection errors and timeouts
+            FixtureMissing: In replay mode, for a request that was never recorded
+        """
+        try:
+            async with self._transport_session().get(op.url, params=op.params,
+                                                     timeout=aiohttp.ClientTimeout(total=op.timeout)) as response:
+                body = None
+                if response.status == 200:
+                    try:
+                        body = await response.json(content_type=None)
+                    except ValueError as e:
+                        logger.debug(f"Invalid JSON from {op.url}: {e}")
+                return response.status, body
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise RequestFailed(str(e) or type(e).__name__) from e
+    
+    async def _run_detached(self, step: Step) -> Any:
+        """Run a step without any lookup deadline (background refreshes)"""
+        with detached_scope():
+            return await self._run(step)
+    
+    async def _make_request(self, url: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Make a request to Wikipedia API (see WikipediaClientBase._request)
+        
+        Args:
+            url: Wikipedia API URL
+            params: Optional query parameters
+        
+        Returns:
+            API response data, PageNotFound for HTTP 404 or empty dict on error
+        """
+        return await self._run(self._request(url, params))
+    
+    async def close(self):
+        """Cancel pending background refreshes and close the pooled session"""
+        for task in list(self._refresh_tasks):
+            task.cancel()
+        if self._refresh_tasks:
+            await asyncio.gather(*self._refresh_tasks, return_exceptions=True)
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+# Global instance for easy import
+async_wikipedia_client = AsyncWikipediaClient(ClientConfig.from_env())
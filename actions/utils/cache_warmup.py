@@ -0,0 +1,132 @@
+"""
+Cache warm-up for the known catalog
+Resolves every artwork and artist named in the mappings before the first visitor asks,
+so their lookups are answered from the response cache
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Sequence, Tuple
+from .logging_config import setup_logger
+from .mappings import KNOWN_ARTWORKS, KNOWN_ARTISTS, WIKIPEDIA_ARTWORK_MAPPINGS, ARTWORK_INFO
+from .response_cache import normalize_cache_key
+from .wikipedia_client import WikipediaClient
+
+logger = setup_logger(__name__)
+
+
+def _unique(names: List[str]) -> List[str]:
+    """Drop names that share a cache key, keeping the first spelling"""
+    seen = set()
+    unique = []
+    for name in names:
+        key = normalize_cache_key(name)
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(name)
+    return unique
+
+
+def catalog_lookups(languages: Sequence[str] = ('de', 'en')) -> List[Tuple[str, str, str]]:
+    """
+    Collect the lookups visitors trigger for the known catalog
+    
+    Args:
+        languages: Languages whose page summaries are warmed for canonical titles
+    
+    Returns:
+        List of (kind, language, query) with kind 'artwork', 'artist' or 'summary'.
+        Artwork and artist searches always start on German Wikipedia and fall back to English.
+    """
+    artworks = _unique(list(KNOWN_ARTWORKS) + list(KNOWN_ARTWORKS.values())
+                       + list(WIKIPEDIA_ARTWORK_MAPPINGS) + list(ARTWORK_INFO))
+    artists = _unique(list(KNOWN_ARTISTS) + list(KNOWN_ARTISTS.values())
+                      + [info['artist'] for info in ARTWORK_INFO.values() if info.get('artist')])
+    titles = _unique(list(KNOWN_ARTWORKS.values()) + list(KNOWN_ARTISTS.values()))
+    
+    lookups = [('artwork', 'de', name) for name in artworks]
+    lookups += [('artist', 'de', name) for name in artists]
+    lookups += [('summary', lang, title) for lang in languages for title in titles]
+    return lookups
+
+
+def warm_cache(client: WikipediaClient, concurrency: int = 8,
+               languages: Sequence[str] = ('de', 'en'), background: bool = False) -> Dict[str, Any]:
+    """
+    Resolve all catalog lookups in parallel so they land in the client's response cache
+    
+    Args:
+        client: Wikipedia client whose cache is filled
+        concurrency: Number of lookups running at the same time
+        languages: Languages whose page summaries are warmed
+        background: Run the warm-up in a daemon thread and return immediately
+    
+    Returns:
+        Report with 'lookups', 'resolved', 'failed' (list of (kind, language, query, reason)),
+        'seconds' and 'http_requests' (empty dict in background mode)
+    """
+    if background:
+        threading.Thread(target=warm_cache, args=(client, concurrency, languages),
+                         name="cache-warm-up", daemon=True).start()
+        return {}
+    
+    if client.cache is None:
+        logger.warning("Cache warm-up requested but the Wikipedia client has no response cache")
+    
+    lookups = catalog_lookups(languages)
+    requests_before = client.get_metrics().get('http_requests', 0)
+    start = time.perf_counter()
+    
+    def resolve(kind: str, lang: str, query: str) -> Dict[str, Any]:
+        if kind == 'artwork':
+            return client.search_artwork(query)
+        if kind == 'artist':
+            return client.search_artist(query)
+        return client.get_summary(query.replace(' ', '_'), lang)
+    
+    resolved = 0
+    failed = []
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="cache-warm-up") as executor:
+        futures = {executor.submit(resolve, *lookup): lookup for lookup in lookups}
+        for future in as_completed(futures):
+            kind, lang, query = futures[future]
+            try:
+                if future.result():
+                    resolved += 1
+                else:
+                    failed.append((kind, lang, query, 'not found'))
+            except Exception as e:
+                failed.append((kind, lang, query, str(e)))
+    
+    report = {
+        'lookups': len(lookups),
+        'resolved': resolved,
+        'failed': sorted(failed),
+        'seconds': time.perf_counter() - start,
+        'http_requests': client.get_metrics().get('http_requests', 0) - requests_before
+    }
+    logger.info(f"Cache warm-up finished: {resolved}/{len(lookups)} lookups resolved in {report['seconds']:.1f}s "
+                f"({report['http_requests']} HTTP requests, {len(failed)} failures)")
+    return report
+
+
+def format_warm_up_report(report: Dict[str, Any]) -> str:
+    """
+    Render a warm-up report for the console
+    
+    Args:
+        report: Report returned by warm_cache
+    
+    Returns:
+        Multi-line report text
+    """
+    lines = [
+        f"🔥 Cache warm-up: {report['resolved']}/{report['lookups']} lookups resolved "
+        f"in {report['seconds']:.1f}s ({report['http_requests']} HTTP requests)"
+    ]
+    if report['failed']:
+        lines.append(f"❌ {len(report['failed'])} failures:")
+        lines.extend(f"   - {kind} ({lang}): {query} — {reason}" for kind, lang, query, reason in report['failed'])
+    else:
+        lines.append("✅ No failures")
+    return '\n'.join(lines)
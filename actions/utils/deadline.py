@@ -0,0 +1,113 @@
+"""
+Latency budget for Wikipedia lookups
+An action creates a Deadline and hands it to the client; every HTTP call made for the
+lookup shrinks its timeout to the remaining budget and is skipped once the budget is spent.
+"""
+import contextvars
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional, Union
+
+# Seconds an action may spend on Wikipedia before answering with what it has
+LOOKUP_BUDGET = float(os.getenv('WIKIPEDIA_LOOKUP_BUDGET', '8'))
+
+_current_deadline: contextvars.ContextVar = contextvars.ContextVar('wikipedia_deadline', default=None)
+
+
+class Deadline:
+    """Point in time (monotonic clock) by which a lookup has to be finished"""
+    
+    def __init__(self, seconds: float):
+        """
+        Args:
+            seconds: Budget from now on
+        """
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+    
+    def remaining(self) -> float:
+        """Seconds left (never negative)"""
+        return max(0.0, self.expires_at - time.monotonic())
+    
+    def expired(self) -> bool:
+        """Whether the budget is spent"""
+        return time.monotonic() >= self.expires_at
+    
+    def clamp(self, timeout: float) -> float:
+        """
+        Shrink a timeout to the remaining budget
+        
+        Args:
+            timeout: Configured timeout in seconds
+        
+        Returns:
+            The smaller of timeout and the remaining budget
+        """
+        return min(timeout, self.remaining())
+    
+    def cancel(self):
+        """Expire the deadline now, so work running under it sends no further requests"""
+        self.expires_at = min(self.expires_at, time.monotonic())
+    
+    def __repr__(self) -> str:
+        return f"Deadline({self.seconds}s, {self.remaining():.3f}s left)"
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Get the deadline of the lookup running in this thread or task, if any"""
+    return _current_deadline.get()
+
+
+def cancellable_deadline() -> Deadline:
+    """
+    Create a deadline with the current lookup's expiry (unbounded without one) that can be
+    cancelled on its own, e.g. to stop a speculative pass without touching the lookup
+    
+    Returns:
+        New Deadline to be entered with deadline_scope()
+    """
+    outer = _current_deadline.get()
+    deadline = Deadline(float('inf'))
+    if outer is not None:
+        deadline.seconds, deadline.expires_at = outer.seconds, outer.expires_at
+    return deadline
+
+
+@contextmanager
+def deadline_scope(deadline: Union[Deadline, float, None]) -> Iterator[Optional[Deadline]]:
+    """
+    Make a deadline the current one for all calls inside the block.
+    Nested scopes can only tighten the budget, never extend it.
+    
+    Args:
+        deadline: Deadline, budget in seconds, or None to keep the current deadline
+    
+    Yields:
+        The deadline in effect inside the block
+    """
+    if isinstance(deadline, (int, float)):
+        deadline = Deadline(deadline)
+    outer = _current_deadline.get()
+    if deadline is None or (outer is not None and outer.expires_at < deadline.expires_at):
+        yield outer
+        return
+    
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+@contextmanager
+def detached_scope() -> Iterator[None]:
+    """
+    Run the block without any deadline, e.g. background work started by a lookup that must
+    not be cut short when the visitor's budget runs out
+    """
+    token = _current_deadline.set(None)
+    try:
+        yield
+    finally:
+        _current_deadline.reset(token)
@@ -0,0 +1,180 @@
+"""
+Europeana Search API client for artwork information
+Europeana aggregates the collection records of European museums. Records carry a title,
+creator, date, provider and a preview image; the description text is often short, so
+results are usually a secondary source next to Wikipedia (see knowledge_sources.py).
+An API key (EUROPEANA_API_KEY) is required; without one the service is not created.
+"""
+import asyncio
+import os
+import time
+import aiohttp
+from collections import Counter
+from typing import Any, Dict, List, Optional
+from .logging_config import setup_logger
+from .deadline import current_deadline
+from .validation import calculate_relevance_score
+
+logger = setup_logger(__name__)
+
+SEARCH_URL = 'https://api.europeana.eu/record/v2/search.json'
+
+
+def _first(value: Any, language: Optional[str] = None) -> str:
+    """
+    Get the first string of a Europeana field (plain list or language map)
+    
+    Args:
+        value: Field value (list of strings, dict language -> list, or string)
+        language: Preferred language of a language map
+    
+    Returns:
+        First string or empty string
+    """
+    if isinstance(value, dict):
+        preferred = value.get(language) or value.get('def') or next(iter(value.values()), [])
+        return _first(preferred)
+    if isinstance(value, list):
+        return str(value[0]).strip() if value else ''
+    return str(value).strip() if value else ''
+
+
+class EuropeanaService:
+    """Async client for the Europeana Search API"""
+    
+    def __init__(self, api_key: str, timeout: float = 5, rows: int = 5, search_url: str = SEARCH_URL):
+        """
+        Args:
+            api_key: Europeana API key (wskey)
+            timeout: Request timeout in seconds
+            rows: Records requested per search
+            search_url: Search API endpoint
+        """
+        self.api_key = api_key
+        self.timeout = timeout
+        self.rows = rows
+        self.search_url = search_url
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._metrics: Counter = Counter()
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the session of the running event loop, creating it on first use"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout))
+            self._session_loop = loop
+        return self._session
+    
+    async def _make_request(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Query the Search API, within the remaining lookup budget
+        
+        Args:
+            params: Query parameters (the API key is added)
+        
+        Returns:
+            API response data or empty dict on error
+        """
+        timeout = self.timeout
+        deadline = current_deadline()
+        if deadline is not None:
+            timeout = deadline.clamp(timeout)
+            if timeout <= 0:
+                self._metrics['deadline_skips'] += 1
+                return {}
+        
+        start = time.monotonic()
+        try:
+            self._metrics['http_requests'] += 1
+            async with self._get_session().get(self.search_url, params={**params, 'wskey': self.api_key},
+                                               timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                if response.status != 200:
+                    logger.debug(f"Europeana returned HTTP {response.status}")
+                    self._metrics['http_errors'] += 1
+                    return {}
+                return await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self._metrics['http_errors'] += 1
+            logger.debug(f"Europeana request error after {time.monotonic() - start:.2f}s: {e}")
+            return {}
+    
+    def _record_to_page(self, item: Dict[str, Any], language: str) -> Dict[str, Any]:
+        """
+        Convert a search record into summary-shaped page data like the Wikipedia clients return
+        
+        Args:
+            item: Record of the Search API response
+            language: Preferred language of the texts
+        
+        Returns:
+            Page data with 'title', 'extract', 'thumbnail', 'content_urls' and 'source'
+        """
+        title = _first(item.get('dcTitleLangAware'), language) or _first(item.get('title'))
+        creator = _first(item.get('dcCreatorLangAware'), language) or _first(item.get('dcCreator'))
+        description = _first(item.get('dcDescriptionLangAware'), language) or _first(item.get('dcDescription'))
+        year = _first(item.get('year'))
+        provider = _first(item.get('dataProvider'))
+        
+        # Records without a description still name creator, date and holding museum
+        extract = description
+        facts = [fact for fact in (creator, year) if fact]
+        if not extract and facts:
+            extract = f"{title} ({', '.join(facts)})."
+        if provider and provider not in extract:
+            extract = f"{extract} {'Sammlung' if language == 'de' else 'Collection'}: {provider}."
+        
+        page = {
+            'title': title,
+            'extract': extract.strip(),
+            'description': creator,
+            'content_urls': {'desktop': {'page': item.get('guid', '')}},
+            'language': language,
+            'source': 'europeana'
+        }
+        preview = _first(item.get('edmPreview'))
+        if preview:
+            page['thumbnail'] = {'source': preview}
+        return page
+    
+    async def search_artwork(self, query: str, language: str = 'de') -> Dict[str, Any]:
+        """
+        Search Europeana for an artwork and return the most relevant image record
+        
+        Args:
+            query: Artwork name
+            language: Preferred language of the texts
+        
+        Returns:
+            Summary-shaped page data or empty dict
+        """
+        data = await self._make_request({'query': query, 'rows': self.rows, 'profile': 'standard',
+                                         'qf': 'TYPE:IMAGE', 'reusability': 'open'})
+        items: List[Dict[str, Any]] = data.get('items') or []
+        best_page, best_score = {}, 0.0
+        for item in items:
+            page = self._record_to_page(item, language)
+            score = calculate_relevance_score(query, page['title'], page['extract'])
+            if score > best_score:
+                best_page, best_score = page, score
+        if best_page:
+            logger.debug(f"Europeana match for '{query}': {best_page['title']} (score: {best_score})")
+        return best_page
+    
+    def get_metrics(self) -> Dict[str, int]:
+        """Get request counters ('http_requests', 'http_errors', 'deadline_skips')"""
+        return dict(self._metrics)
+    
+    async def close(self):
+        """Close the session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+# Global instance, created only when an API key is configured
+europeana_service = EuropeanaService(
+    api_key=os.environ['EUROPEANA_API_KEY'],
+    timeout=float(os.getenv('EUROPEANA_TIMEOUT', '3')),
+    rows=int(os.getenv('EUROPEANA_ROWS', '5'))
+) if os.getenv('EUROPEANA_API_KEY') else None
@@ -0,0 +1,209 @@
+"""
+Per-host health tracking for the Wikipedia clients
+Latency percentiles, a circuit breaker per language host and jittered retry backoff
+"""
+import random
+import threading
+import time
+import urllib.parse
+from collections import deque
+from typing import Any, Dict, Optional
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS = (429, 500, 502, 503, 504)
+
+
+def jittered_backoff(attempt: int, base: float = 0.2, cap: float = 5.0) -> float:
+    """
+    Delay before a retry ("full jitter": uniform between 0 and the exponential backoff)
+    
+    Args:
+        attempt: Retry number starting at 1
+        base: Backoff of the first retry in seconds
+        cap: Upper bound of the backoff in seconds
+    
+    Returns:
+        Seconds to sleep before the retry
+    """
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+class LatencyWindow:
+    """Rolling window of recent latencies with percentile lookup"""
+    
+    def __init__(self, size: int = 200):
+        """
+        Args:
+            size: Number of most recent samples kept
+        """
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+    
+    def add(self, seconds: float):
+        """Record one latency sample"""
+        with self._lock:
+            self._samples.append(seconds)
+    
+    def percentile(self, percent: float, min_samples: int = 1) -> Optional[float]:
+        """
+        Get a latency percentile
+        
+        Args:
+            percent: Percentile between 0 and 100
+            min_samples: Samples needed before a value is reported
+        
+        Returns:
+            Latency in seconds or None if there are not enough samples
+        """
+        with self._lock:
+            ordered = sorted(self._samples)
+        if len(ordered) < max(1, min_samples):
+            return None
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+    
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+class HostHealth:
+    """
+    Circuit breaker and latency statistics for one host.
+    After `failure_threshold` consecutive failures the circuit opens and requests are
+    rejected for `reset_timeout` seconds; then a single trial request is let through
+    (half-open) and its outcome closes or re-opens the circuit.
+    """
+    
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    
+    def __init__(self, host: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Args:
+            host: Host name (e.g. de.wikipedia.org)
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a trial request
+        """
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.latency = LatencyWindow()
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_count = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+    
+    def rejecting(self) -> bool:
+        """Whether a request would be turned away right now (checked without claiming a trial slot)"""
+        with self._lock:
+            if self.state == self.OPEN:
+                return time.monotonic() - self._opened_at < self.reset_timeout
+            return self.state == self.HALF_OPEN and self._trial_in_flight
+    
+    def acquire(self) -> Optional[bool]:
+        """
+        Claim permission to send a request to the host now
+        
+        Returns:
+            None while the circuit is open (or a half-open trial is already running), True if the
+            caller got the half-open trial slot, False for a request through the closed circuit.
+            A trial ends with record_success or record_failure; if the request is never answered
+            (skipped or cancelled), the caller must give the slot back with release_trial.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return False
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return None
+    
+    def release_trial(self):
+        """Give back a half-open trial slot whose request got no answer, so the next request can be the trial"""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._trial_in_flight = False
+    
+    def record_success(self, latency: float):
+        """Record an answered request and close the circuit"""
+        self.latency.add(latency)
+        with self._lock:
+            self.consecutive_failures = 0
+            self.state = self.CLOSED
+            self._trial_in_flight = False
+    
+    def record_failure(self):
+        """Record a failed request (error, timeout or retryable status); may open the circuit"""
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.opened_count += 1
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the current health of the host
+        
+        Returns:
+            Dict with 'state', 'consecutive_failures', 'opened_count', 'samples' and 'p95_ms'
+        """
+        p95 = self.latency.percentile(95)
+        return {
+            'state': self.state,
+            'consecutive_failures': self.consecutive_failures,
+            'opened_count': self.opened_count,
+            'samples': len(self.latency),
+            'p95_ms': round(p95 * 1000, 1) if p95 is not None else None
+        }
+
+
+class HostHealthRegistry:
+    """Thread-safe map of host name -> HostHealth"""
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open a host's circuit
+            reset_timeout: Seconds a circuit stays open before a trial request
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._hosts: Dict[str, HostHealth] = {}
+        self._lock = threading.Lock()
+    
+    def for_url(self, url: str) -> HostHealth:
+        """
+        Get the health tracker for the host of a URL, creating it on first use
+        
+        Args:
+            url: Request URL
+        
+        Returns:
+            HostHealth of the URL's host
+        """
+        host = urllib.parse.urlsplit(url).netloc
+        with self._lock:
+            health = self._hosts.get(host)
+            if health is None:
+                health = HostHealth(host, self.failure_threshold, self.reset_timeout)
+                self._hosts[host] = health
+            return health
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the health of all hosts seen so far
+        
+        Returns:
+            Host name -> HostHealth.snapshot()
+        """
+        with self._lock:
+            hosts = list(self._hosts.values())
+        return {health.host: health.snapshot() for health in hosts}
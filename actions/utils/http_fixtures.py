@@ -0,0 +1,249 @@
+"""
+Record/replay transport for the Wikipedia clients
+In 'record' mode every Wikipedia response is written to a fixture directory; in 'replay'
+mode the clients are answered from those fixtures without network access, and a request
+that was never recorded raises FixtureMissing rather than passing for a 404. The same
+fixtures feed scripts/wikipedia_standin.py, a local HTTP stand-in for load tests.
+
+Fixture layout: <directory>/<lang>/<key>.json with the request (path, params) and
+the response (status, body). Keys ignore the host, so fixtures recorded against
+de.wikipedia.org replay for a stand-in at http://127.0.0.1:8765/de as well.
+"""
+import hashlib
+import json
+import os
+import threading
+import urllib.parse
+from typing import Any, Dict, Iterator, Optional, Tuple
+from .logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+TRANSPORTS = ('live', 'record', 'replay')
+
+# Statuses worth recording: answers, not failures
+RECORDED_STATUS = (200, 404)
+
+
+class FixtureMissing(LookupError):
+    """Raised by the replay sessions for a request that was never recorded"""
+
+
+def split_wikipedia_url(url: str) -> Tuple[str, str]:
+    """
+    Split a Wikipedia or stand-in URL into language and endpoint path
+    
+    Args:
+        url: https://de.wikipedia.org/w/api.php, http://127.0.0.1:8765/de/w/api.php or /de/w/api.php
+    
+    Returns:
+        Tuple of (language code, unquoted path such as /api/rest_v1/page/summary/Mona Lisa)
+    """
+    parts = urllib.parse.urlsplit(url)
+    path = urllib.parse.unquote(parts.path)
+    if parts.netloc.endswith('.wikipedia.org'):
+        return parts.netloc.split('.', 1)[0], path
+    lang, _, rest = path.lstrip('/').partition('/')
+    return lang, '/' + rest
+
+
+def fixture_key(lang: str, path: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Stable key of a request, independent of host and parameter order
+    
+    Args:
+        lang: Language code
+        path: Unquoted endpoint path
+        params: Query parameters (values are compared as strings)
+    
+    Returns:
+        Hex digest naming the fixture file
+    """
+    canonical = json.dumps([lang, path, sorted((str(k), str(v)) for k, v in (params or {}).items())],
+                           ensure_ascii=False)
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()[:24]
+
+
+class FixtureStore:
+    """Directory of recorded Wikipedia responses, loaded into memory on open"""
+    
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory: Fixture directory (created on first write)
+        """
+        self.directory = directory
+        self.misses = 0
+        self._fixtures: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if os.path.isdir(directory):
+            for lang in os.listdir(directory):
+                lang_dir = os.path.join(directory, lang)
+                if not os.path.isdir(lang_dir):
+                    continue
+                for name in os.listdir(lang_dir):
+                    if name.endswith('.json'):
+                        with open(os.path.join(lang_dir, name), encoding='utf-8') as fixture_file:
+                            self._fixtures[name[:-5]] = json.load(fixture_file)
+        logger.info(f"Loaded {len(self._fixtures)} Wikipedia fixtures from {directory}")
+    
+    def lookup(self, lang: str, path: str, params: Optional[Dict[str, Any]] = None) -> Optional[Tuple[int, Any]]:
+        """
+        Find the recorded response of a request
+        
+        Args:
+            lang: Language code
+            path: Unquoted endpoint path
+            params: Query parameters
+        
+        Returns:
+            Tuple of (status, body) or None if the request was never recorded
+        """
+        fixture = self._fixtures.get(fixture_key(lang, path, params))
+        if fixture is None:
+            with self._lock:
+                self.misses += 1
+            logger.warning(f"No fixture for {lang}:{path} {params or ''}")
+            return None
+        return fixture['status'], fixture['body']
+    
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[Tuple[int, Any]]:
+        """Find the recorded response of a request by URL"""
+        return self.lookup(*split_wikipedia_url(url), params)
+    
+    def put(self, url: str, params: Optional[Dict[str, Any]], status: int, body: Any):
+        """
+        Record a response
+        
+        Args:
+            url: Request URL
+            params: Query parameters
+            status: HTTP status
+            body: Decoded JSON body
+        """
+        lang, path = split_wikipedia_url(url)
+        key = fixture_key(lang, path, params)
+        fixture = {
+            'lang': lang,
+            'path': path,
+            'params': {str(k): str(v) for k, v in (params or {}).items()},
+            'status': status,
+            'body': body
+        }
+        lang_dir = os.path.join(self.directory, lang)
+        with self._lock:
+            self._fixtures[key] = fixture
+            os.makedirs(lang_dir, exist_ok=True)
+            with open(os.path.join(lang_dir, f"{key}.json"), 'w', encoding='utf-8') as fixture_file:
+                json.dump(fixture, fixture_file, ensure_ascii=False, indent=1)
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(list(self._fixtures.values()))
+    
+    def __len__(self) -> int:
+        return len(self._fixtures)
+
+
+class FixtureResponse:
+    """Recorded response with the parts of the requests response API the sync client uses"""
+    
+    def __init__(self, status: int, body: Any):
+        self.status_code = status
+        self._body = body
+    
+    def json(self) -> Any:
+        return self._body
+
+
+class AsyncFixtureResponse:
+    """Recorded response with the parts of the aiohttp response API the async client uses"""
+    
+    def __init__(self, status: int, body: Any):
+        self.status = status
+        self._body = body
+    
+    async def json(self, content_type: Optional[str] = None) -> Any:
+        return self._body
+
+
+class ReplaySession:
+    """Stands in for requests.Session, answering from fixtures (unrecorded requests raise FixtureMissing)"""
+    
+    def __init__(self, store: FixtureStore):
+        self.store = store
+    
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> FixtureResponse:
+        recorded = self.store.get(url, params)
+        if recorded is None:
+            raise FixtureMissing(f"No fixture for {url} {params or ''}")
+        return FixtureResponse(*recorded)
+
+
+class RecordingSession:
+    """Wraps a requests.Session and records every answered request"""
+    
+    def __init__(self, session, store: FixtureStore):
+        self.session = session
+        self.store = store
+    
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs):
+        response = self.session.get(url, params=params, **kwargs)
+        if response.status_code in RECORDED_STATUS:
+            try:
+                body = response.json() if response.status_code == 200 else {}
+            except ValueError:
+                return response
+            self.store.put(url, params, response.status_code, body)
+        return response
+
+
+class _AsyncFixtureContext:
+    """`async with session.get(...)` result of the async fixture sessions"""
+    
+    def __init__(self, produce):
+        self._produce = produce
+    
+    async def __aenter__(self) -> AsyncFixtureResponse:
+        return await self._produce()
+    
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class AsyncReplaySession:
+    """Stands in for aiohttp.ClientSession, answering from fixtures (unrecorded requests raise FixtureMissing)"""
+    
+    def __init__(self, store: FixtureStore):
+        self.store = store
+    
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> _AsyncFixtureContext:
+        async def produce() -> AsyncFixtureResponse:
+            recorded = self.store.get(url, params)
+            if recorded is None:
+                raise FixtureMissing(f"No fixture for {url} {params or ''}")
+            return AsyncFixtureResponse(*recorded)
+        return _AsyncFixtureContext(produce)
+
+
+class AsyncRecordingSession:
+    """Wraps an aiohttp.ClientSession and records every answered request"""
+    
+    def __init__(self, session, store: FixtureStore):
+        self.session = session
+        self.store = store
+    
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> _AsyncFixtureContext:
+        async def produce() -> AsyncFixtureResponse:
+            async with self.session.get(url, params=params, **kwargs) as response:
+                body = await response.json(content_type=None) if response.status == 200 else {}
+                if response.status in RECORDED_STATUS:
+                    self.store.put(url, params, response.status, body)
+                return AsyncFixtureResponse(response.status, body)
+        return _AsyncFixtureContext(produce)
+
+
+# Global instance, opened only when a fixture transport is selected
+fixture_store = (
+    FixtureStore(os.getenv('WIKIPEDIA_FIXTURES', 'benchmarks/fixtures'))
+    if os.getenv('WIKIPEDIA_TRANSPORT', 'live') != 'live' else None
+)
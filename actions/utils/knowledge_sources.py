@@ -0,0 +1,398 @@
+"""
+Federated knowledge sources for the actions
+The actions ask a FederatedSearch instead of a single client. It runs every registered
+source concurrently, each under its own timeout, and answers with the best-priority result
+that passes validation: a lower-priority source only wins once every source ranked above it
+has failed, timed out or returned nothing usable (or right away with strategy 'first').
+The sources still running at that point are cancelled. With a single source the call goes
+straight to it, so the default setup (Wikipedia only) answers exactly as fast as before.
+Sources keep to their timeout through the current deadline (deadline.py), like every lookup
+in the actions, and wrap up with what they have when it runs out.
+"""
+import asyncio
+import os
+from abc import ABC, abstractmethod
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Union
+from .logging_config import setup_logger
+from .async_wikipedia_client import AsyncWikipediaClient, async_wikipedia_client
+from .deadline import Deadline, LOOKUP_BUDGET, deadline_scope
+from .europeana_service import EuropeanaService, europeana_service
+from .mappings import ARTWORK_INFO, KNOWN_ARTISTS, KNOWN_ARTWORKS, WIKIPEDIA_ARTWORK_MAPPINGS
+from .offline_index import OfflineIndex, offline_index
+from .validation import is_artist_content, is_artwork_content
+
+logger = setup_logger(__name__)
+
+KINDS = ('artwork', 'artist')
+STRATEGIES = ('priority', 'first')
+# Fields a merged answer may take over from other sources
+MERGE_FIELDS = ('description', 'thumbnail', 'content_urls', 'pageid')
+
+
+class KnowledgeSource(ABC):
+    """Base class of a source the federation can ask; subclasses implement search()"""
+    
+    name = 'source'
+    kinds = KINDS
+    
+    def __init__(self, priority: int = 0, timeout: float = LOOKUP_BUDGET):
+        """
+        Args:
+            priority: Rank of the source's answers (lower wins)
+            timeout: Seconds the source may take before it is given up
+        """
+        self.priority = priority
+        self.timeout = timeout
+    
+    @abstractmethod
+    async def search(self, kind: str, query: str) -> Dict[str, Any]:
+        """
+        Look up an artwork or artist, giving up when the current deadline runs out
+        
+        Args:
+            kind: 'artwork' or 'artist'
+            query: Artwork or artist name
+        
+        Returns:
+            Page data with at least 'title' or empty dict
+        """
+    
+    def validate(self, kind: str, data: Dict[str, Any]) -> bool:
+        """
+        Check whether an answer is usable for the actions
+        
+        Args:
+            kind: 'artwork' or 'artist'
+            data: Answer of search()
+        
+        Returns:
+            True if the answer describes an artwork or artist
+        """
+        if not data or not data.get('extract') or not data.get('title'):
+            return False
+        if kind == 'artwork':
+            return is_artwork_content(data['extract'], data['title'])
+        return is_artist_content(data['extract'], data['title'])
+    
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(priority={self.priority}, timeout={self.timeout})"
+
+
+class WikipediaSource(KnowledgeSource):
+    """The async Wikipedia client as a source"""
+    
+    name = 'wikipedia'
+    
+    def __init__(self, client: AsyncWikipediaClient, priority: int = 0, timeout: float = LOOKUP_BUDGET):
+        """
+        Args:
+            client: Async Wikipedia client
+            priority: Rank of the source's answers (lower wins)
+            timeout: Seconds the source may take before it is given up
+        """
+        super().__init__(priority, timeout)
+        self.client = client
+    
+    async def search(self, kind: str, query: str) -> Dict[str, Any]:
+        if kind == 'artwork':
+            return await self.client.search_artwork(query)
+        return await self.client.search_artist(query)
+    
+    def validate(self, kind: str, data: Dict[str, Any]) -> bool:
+        # The client scores and validates its pages itself; re-checking would reject answers it accepts today
+        return bool(data and data.get('extract') and data.get('title'))
+
+
+class EuropeanaSource(KnowledgeSource):
+    """Europeana collection records as a source (artworks only)"""
+    
+    name = 'europeana'
+    kinds = ('artwork',)
+    
+    def __init__(self, service: EuropeanaService, priority: int = 1, timeout: float = 3):
+        """
+        Args:
+            service: Europeana Search API client
+            priority: Rank of the source's answers (lower wins)
+            timeout: Seconds the source may take before it is given up
+        """
+        super().__init__(priority, timeout)
+        self.service = service
+    
+    async def search(self, kind: str, query: str) -> Dict[str, Any]:
+        return await self.service.search_artwork(query)
+
+
+class CatalogSource(KnowledgeSource):
+    """
+    The museum's local catalog as a source: the offline extract index (see offline_index.py), if
+    one is configured, and the ARTWORK_INFO records of known artworks. Answers without network access.
+    Index pages are summary-shaped; an ARTWORK_INFO record comes back as {'title', 'catalog_record',
+    'source'} without an extract, for the artwork action to answer with respond_from_artwork_info.
+    """
+    
+    name = 'catalog'
+    
+    def __init__(self, index: Optional[OfflineIndex] = None, priority: int = 2, timeout: float = 1):
+        """
+        Args:
+            index: Offline extract index (None for ARTWORK_INFO only)
+            priority: Rank of the source's answers (lower wins)
+            timeout: Seconds the source may take before it is given up
+        """
+        super().__init__(priority, timeout)
+        self.index = index
+    
+    def _from_index(self, titles: List[str], kind: str) -> Dict[str, Any]:
+        """Look up the first title found in the offline index, German first"""
+        if self.index is None:
+            return {}
+        for lang in ('de', 'en'):
+            for title in titles:
+                page = self.index.get(lang, title, kind)
+                if page:
+                    page['source'] = self.name
+                    return page
+        return {}
+    
+    def _from_artwork_info(self, query: str) -> Dict[str, Any]:
+        """Look up the ARTWORK_INFO record of a known artwork"""
+        key = query.lower().strip()
+        name = KNOWN_ARTWORKS.get(key, query)
+        if name.lower() not in ARTWORK_INFO:
+            if key not in ARTWORK_INFO:
+                return {}
+            name = query
+        return {'title': name, 'catalog_record': ARTWORK_INFO[name.lower()], 'source': self.name}
+    
+    async def search(self, kind: str, query: str) -> Dict[str, Any]:
+        key = query.lower().strip()
+        if kind == 'artwork':
+            titles = [WIKIPEDIA_ARTWORK_MAPPINGS.get(key, query), KNOWN_ARTWORKS.get(key, query)]
+            return self._from_index(titles, kind) or self._from_artwork_info(query)
+        return self._from_index([KNOWN_ARTISTS.get(key, query)], kind)
+    
+    def validate(self, kind: str, data: Dict[str, Any]) -> bool:
+        # Catalog records are curated; only index pages go through the content checks
+        if data and data.get('catalog_record'):
+            return True
+        return super().validate(kind, data)
+
+
+class FederatedSearch:
+    """Runs the registered knowledge sources concurrently and picks one answer"""
+    
+    def __init__(self, sources: List[KnowledgeSource], strategy: str = 'priority', merge: bool = False):
+        """
+        Args:
+            sources: Registered sources
+            strategy: 'priority' (best-ranked usable answer) or 'first' (first usable answer)
+            merge: Fill fields the winning answer lacks (thumbnail, description, ...) from
+                   usable answers of other sources that have already arrived
+        
+        Raises:
+            ValueError: If the strategy is unknown
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy '{strategy}', expected one of {STRATEGIES}")
+        self.sources = sorted(sources, key=lambda source: source.priority)
+        self.strategy = strategy
+        self.merge = merge
+        self._metrics: Counter = Counter()
+        self._metrics_lock = threading.Lock()
+    
+    def _count(self, name: str, amount: int = 1):
+        with self._metrics_lock:
+            self._metrics[name] += amount
+    
+    def register(self, source: KnowledgeSource):
+        """Add a source, keeping the sources ordered by priority"""
+        self.sources = sorted(self.sources + [source], key=lambda registered: registered.priority)
+    
+    async def search_artwork(self, query: str, deadline: Union[Deadline, float, None] = None) -> Dict[str, Any]:
+        """
+        Look up an artwork in all sources
+        
+        Args:
+            query: Artwork name
+            deadline: Latency budget (Deadline or seconds) for the whole lookup
+        
+        Returns:
+            Summary-shaped page data or catalog record with 'source', or empty dict
+        """
+        return await self.search('artwork', query, deadline)
+    
+    async def search_artist(self, query: str, deadline: Union[Deadline, float, None] = None) -> Dict[str, Any]:
+        """
+        Look up an artist in all sources
+        
+        Args:
+            query: Artist name
+            deadline: Latency budget (Deadline or seconds) for the whole lookup
+        
+        Returns:
+            Summary-shaped page data or catalog record with 'source', or empty dict
+        """
+        return await self.search('artist', query, deadline)
+    
+    async def _ask(self, source: KnowledgeSource, kind: str, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Ask one source within its timeout and the lookup budget
+        
+        Returns:
+            Usable answer, or None if the source failed, timed out or had nothing usable
+        """
+        try:
+            with deadline_scope(source.timeout) as deadline:
+                data = await source.search(kind, query)
+        except Exception as e:
+            self._count(f'{source.name}_errors')
+            logger.warning(f"Source {source.name} failed for {kind} '{query}': {e}")
+            return None
+        if not data and deadline is not None and deadline.expired():
+            self._count(f'{source.name}_timeouts')
+            logger.debug(f"Source {source.name} ran out of time for {kind} '{query}'")
+            return None
+        if not source.validate(kind, data):
+            self._count(f'{source.name}_empty')
+            return None
+        return data
+    
+    def _pick(self, sources: List[KnowledgeSource], answers: Dict[str, Optional[Dict[str, Any]]]) -> Optional[KnowledgeSource]:
+        """
+        Pick the winning source from the answers received so far
+        
+        Args:
+            sources: Asked sources in priority order
+            answers: Source name -> usable answer or None, for the finished sources
+        
+        Returns:
+            Winning source, or None if no decision is possible yet (or no source had an answer)
+        """
+        for source in sources:
+            if source.name not in answers:
+                if self.strategy == 'priority':
+                    return None
+                continue
+            if answers[source.name] is not None:
+                return source
+        return None
+    
+    def _merged(self, winner: KnowledgeSource, sources: List[KnowledgeSource],
+                answers: Dict[str, Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Copy the winning answer and, with merging enabled, fill its gaps from the other answers"""
+        result = dict(answers[winner.name])
+        result['source'] = winner.name
+        if not self.merge:
+            return result
+        result['sources'] = [winner.name]
+        for source in sources:
+            other = answers.get(source.name)
+            if source is winner or other is None:
+                continue
+            filled = [field for field in MERGE_FIELDS if not result.get(field) and other.get(field)]
+            for field in filled:
+                result[field] = other[field]
+            if filled:
+                result['sources'].append(source.name)
+        return result
+    
+    async def search(self, kind: str, query: str, deadline: Union[Deadline, float, None] = None) -> Dict[str, Any]:
+        """
+        Look up an artwork or artist in all sources that support the kind
+        
+        Args:
+            kind: 'artwork' or 'artist'
+            query: Artwork or artist name
+            deadline: Latency budget (Deadline or seconds) for the whole lookup
+        
+        Returns:
+            Summary-shaped page data or catalog record with 'source' (and 'sources' when merged), or empty dict
+        """
+        sources = [source for source in self.sources if kind in source.kinds]
+        if not sources:
+            return {}
+        
+        with deadline_scope(deadline):
+            if len(sources) == 1:
+                answer = await self._ask(sources[0], kind, query)
+                self._count(f'{sources[0].name}_wins' if answer is not None else 'no_answer')
+                return self._merged(sources[0], sources, {sources[0].name: answer}) if answer is not None else {}
+            
+            # Tasks copy the current context, so every source runs under the lookup deadline
+            tasks = {asyncio.ensure_future(self._ask(source, kind, query)): source for source in sources}
+            answers: Dict[str, Optional[Dict[str, Any]]] = {}
+            pending = set(tasks)
+            winner = None
+            try:
+                while pending and winner is None:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        answers[tasks[task].name] = task.result()
+                    winner = self._pick(sources, answers)
+            finally:
+                for task in pending:
+                    task.cancel()
+                    self._count(f'{tasks[task].name}_cancelled')
+        
+        if winner is None:
+            self._count('no_answer')
+            logger.info(f"No source found {kind} '{query}' ({', '.join(source.name for source in sources)})")
+            return {}
+        self._count(f'{winner.name}_wins')
+        logger.info(f"Answering {kind} '{query}' from {winner.name} "
+                    f"({len(answers)} of {len(sources)} sources finished)")
+        return self._merged(winner, sources, answers)
+    
+    def get_metrics(self) -> Dict[str, int]:
+        """
+        Get federation metrics
+        
+        Returns:
+            Metric name -> count: '<source>_wins', '<source>_timeouts', '<source>_errors',
+            '<source>_empty', '<source>_cancelled' and 'no_answer'
+        """
+        with self._metrics_lock:
+            return dict(self._metrics)
+    
+    def reset_metrics(self):
+        """Reset all federation metrics to zero"""
+        with self._metrics_lock:
+            self._metrics.clear()
+
+
+def build_knowledge_sources(names: str) -> List[KnowledgeSource]:
+    """
+    Create the sources named in a comma-separated list; list order is priority order
+    
+    Args:
+        names: e.g. "wikipedia,europeana,catalog"
+    
+    Returns:
+        Sources that could be created (Europeana is skipped without an API key)
+    """
+    sources: List[KnowledgeSource] = []
+    for priority, name in enumerate(name.strip().lower() for name in names.split(',') if name.strip()):
+        if name == 'wikipedia':
+            sources.append(WikipediaSource(async_wikipedia_client, priority,
+                                           float(os.getenv('WIKIPEDIA_SOURCE_TIMEOUT', str(LOOKUP_BUDGET)))))
+        elif name == 'europeana':
+            if europeana_service is None:
+                logger.warning("Europeana source configured but EUROPEANA_API_KEY is not set, skipping it")
+                continue
+            sources.append(EuropeanaSource(europeana_service, priority, europeana_service.timeout))
+        elif name == 'catalog':
+            sources.append(CatalogSource(offline_index, priority, float(os.getenv('CATALOG_SOURCE_TIMEOUT', '1'))))
+        else:
+            logger.warning(f"Unknown knowledge source '{name}' in KNOWLEDGE_SOURCES, skipping it")
+    return sources
+
+
+# Global instance used by the actions
+knowledge_sources = FederatedSearch(
+    build_knowledge_sources(os.getenv('KNOWLEDGE_SOURCES', 'wikipedia')),
+    strategy=os.getenv('KNOWLEDGE_STRATEGY', 'priority'),
+    merge=os.getenv('KNOWLEDGE_MERGE', 'false').lower() == 'true'
+)
@@ -186,7 +186,9 @@ RESPONSE_TEMPLATES = {
         'artist_label': "👨‍🎨 **Künstler:**",
         'biography': "📖 **Biographie:**",
         'learn_more': "🔗 **Mehr erfahren:**",
-        'remarkable_artwork': "Dieses bemerkenswerte Kunstwerk stammt von **{artist}**."
+        'remarkable_artwork': "Dieses bemerkenswerte Kunstwerk stammt von **{artist}**.",
+        'more_about': "📖 **{title}: {heading}**",
+        'no_more_sections': "Mehr kann ich Ihnen zu **{title}** leider nicht erzählen."
     },
     'en': {
         'artwork_not_found': (
@@ -219,7 +221,9 @@ RESPONSE_TEMPLATES = {
         'artist_label': "👨‍🎨 **Artist:**",
         'biography': "📖 **Biography:**",
         'learn_more': "🔗 **Learn more:**",
-        'remarkable_artwork': "This remarkable artwork was created by **{artist}**."
+        'remarkable_artwork': "This remarkable artwork was created by **{artist}**.",
+        'more_about': "📖 **{title}: {heading}**",
+        'no_more_sections': "That is all I can tell you about **{title}**."
     }
 }
 
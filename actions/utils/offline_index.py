@@ -0,0 +1,251 @@
+"""
+Offline Wikipedia extract index for kiosks without a reliable uplink
+Built once from a local extracts dump; lookups read memory-mapped files, so startup
+does not load the index into RAM and a lookup takes microseconds.
+
+On-disk layout (directory):
+    extracts.idx   header + open-addressing hash table of (key hash, blob offset, record length)
+    extracts.blob  concatenated UTF-8 JSON records
+"""
+import bz2
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+from typing import Any, Dict, Iterator, Optional
+from .logging_config import setup_logger
+from .response_cache import normalize_cache_key
+from .validation import is_artwork_content, is_artist_content
+
+logger = setup_logger(__name__)
+
+INDEX_FILE = 'extracts.idx'
+BLOB_FILE = 'extracts.blob'
+INDEX_MAGIC = b'MCBIDX1\0'
+HEADER = struct.Struct('<8sQQ')   # magic, slot count, entry count
+SLOT = struct.Struct('<QQI')      # key hash (0 = empty slot), blob offset, record length
+
+
+def _index_key(lang: str, title: str) -> str:
+    """Lookup key of a page: language plus normalized title"""
+    return f"{lang}|{normalize_cache_key(title)}"
+
+
+def _key_hash(key: str) -> int:
+    """64-bit key hash; 0 is reserved for empty slots"""
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little') or 1
+
+
+def iter_dump(dump_path: str, default_lang: str = 'de') -> Iterator[Dict[str, Any]]:
+    """
+    Read an extracts dump: one JSON object per line with title, extract and lang
+    (optional: description, url, pageid). Files ending in .bz2 are decompressed on the fly.
+    
+    Args:
+        dump_path: Path to a .jsonl or .jsonl.bz2 file
+        default_lang: Language for records without 'lang'
+    
+    Yields:
+        Dump records with title and extract
+    """
+    opener = bz2.open if dump_path.endswith('.bz2') else open
+    with opener(dump_path, 'rt', encoding='utf-8') as dump:
+        for line_number, line in enumerate(dump, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping malformed dump line {line_number}")
+                continue
+            if record.get('title') and record.get('extract'):
+                record.setdefault('lang', default_lang)
+                yield record
+
+
+def build_offline_index(dump_path: str, index_dir: str, default_lang: str = 'de') -> Dict[str, int]:
+    """
+    Filter a dump down to artwork and artist pages and write the offline index
+    
+    Args:
+        dump_path: Extracts dump (.jsonl or .jsonl.bz2)
+        index_dir: Output directory (created if missing)
+        default_lang: Language for records without 'lang'
+    
+    Returns:
+        Counters 'read', 'artworks', 'artists', 'duplicates' and 'indexed'
+    """
+    os.makedirs(index_dir, exist_ok=True)
+    stats = {'read': 0, 'artworks': 0, 'artists': 0, 'duplicates': 0, 'indexed': 0}
+    entries = []
+    seen = set()
+    
+    # The validators log every decision; far too chatty for millions of dump records
+    validation_logger = logging.getLogger(is_artwork_content.__module__)
+    previous_level = validation_logger.level
+    validation_logger.setLevel(logging.WARNING)
+    try:
+        with open(os.path.join(index_dir, BLOB_FILE), 'wb') as blob:
+            for record in iter_dump(dump_path, default_lang):
+                stats['read'] += 1
+                title, extract, lang = record['title'], record['extract'], record['lang']
+                
+                kinds = []
+                if is_artwork_content(extract, title):
+                    kinds.append('artwork')
+                if is_artist_content(extract, title):
+                    kinds.append('artist')
+                if not kinds:
+                    continue
+                
+                key_hash = _key_hash(_index_key(lang, title))
+                if key_hash in seen:
+                    stats['duplicates'] += 1
+                    continue
+                seen.add(key_hash)
+                
+                payload = json.dumps({
+                    'title': title,
+                    'pageid': record.get('pageid'),
+                    'extract': extract,
+                    'description': record.get('description', ''),
+                    'url': record.get('url', ''),
+                    'lang': lang,
+                    'kinds': kinds
+                }, ensure_ascii=False).encode('utf-8')
+                entries.append((key_hash, blob.tell(), len(payload)))
+                blob.write(payload)
+                stats['artworks'] += 'artwork' in kinds
+                stats['artists'] += 'artist' in kinds
+    finally:
+        validation_logger.setLevel(previous_level)
+    
+    # Power-of-two table at most half full keeps linear probe chains short
+    slot_count = 1
+    while slot_count < max(2 * len(entries), 8):
+        slot_count *= 2
+    table = bytearray(slot_count * SLOT.size)
+    mask = slot_count - 1
+    for key_hash, offset, length in entries:
+        slot = key_hash & mask
+        while SLOT.unpack_from(table, slot * SLOT.size)[0]:
+            slot = (slot + 1) & mask
+        SLOT.pack_into(table, slot * SLOT.size, key_hash, offset, length)
+    
+    with open(os.path.join(index_dir, INDEX_FILE), 'wb') as index_file:
+        index_file.write(HEADER.pack(INDEX_MAGIC, slot_count, len(entries)))
+        index_file.write(table)
+    
+    stats['indexed'] = len(entries)
+    logger.info(f"Offline index written to {index_dir}: {stats}")
+    return stats
+
+
+class OfflineIndex:
+    """Read-only, memory-mapped view of an index built by build_offline_index"""
+    
+    def __init__(self, index_dir: str):
+        """
+        Args:
+            index_dir: Directory containing extracts.idx and extracts.blob
+        
+        Raises:
+            ValueError: If the index file is not an offline index
+        """
+        self.index_dir = index_dir
+        self._index_file = open(os.path.join(index_dir, INDEX_FILE), 'rb')
+        try:
+            self._blob_file = open(os.path.join(index_dir, BLOB_FILE), 'rb')
+        except OSError:
+            self._index_file.close()
+            raise
+        try:
+            self._index = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, self.slot_count, self.entry_count = HEADER.unpack_from(self._index, 0)
+        except (ValueError, struct.error):
+            magic = None
+        if magic != INDEX_MAGIC:
+            self.close()
+            raise ValueError(f"{index_dir} does not contain an offline extract index")
+        # mmap cannot map empty files
+        self._blob = (mmap.mmap(self._blob_file.fileno(), 0, access=mmap.ACCESS_READ)
+                      if os.path.getsize(self._blob_file.name) else b'')
+        self._mask = self.slot_count - 1
+        logger.info(f"Opened offline index {index_dir} ({self.entry_count} pages)")
+    
+    def _find(self, key: str) -> Optional[Dict[str, Any]]:
+        """Probe the hash table for a key and decode the matching record"""
+        key_hash = _key_hash(key)
+        slot = key_hash & self._mask
+        while True:
+            slot_hash, offset, length = SLOT.unpack_from(self._index, HEADER.size + slot * SLOT.size)
+            if slot_hash == 0:
+                return None
+            if slot_hash == key_hash:
+                record = json.loads(self._blob[offset:offset + length])
+                # Guard against 64-bit hash collisions
+                if _index_key(record['lang'], record['title']) == key:
+                    return record
+            slot = (slot + 1) & self._mask
+    
+    def get(self, lang: str, title: str, kind: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Look up a page by title
+        
+        Args:
+            lang: Language code
+            title: Page title (case, underscores and extra whitespace are ignored)
+            kind: Only return pages classified as 'artwork' or 'artist' (None for any)
+        
+        Returns:
+            Summary-shaped page data like the REST summary endpoint, or None
+        """
+        record = self._find(_index_key(lang, title))
+        if record is None or (kind and kind not in record['kinds']):
+            return None
+        return {
+            'title': record['title'],
+            'pageid': record.get('pageid'),
+            'extract': record['extract'],
+            'description': record.get('description', ''),
+            'content_urls': {'desktop': {'page': record.get('url', '')}},
+            'language': record['lang']
+        }
+    
+    def __len__(self) -> int:
+        return self.entry_count
+    
+    def close(self):
+        """Unmap and close the index files"""
+        for mapped in (getattr(self, '_index', None), getattr(self, '_blob', None)):
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+        self._index_file.close()
+        self._blob_file.close()
+
+
+def open_offline_index(index_dir: str) -> Optional[OfflineIndex]:
+    """
+    Open an offline index, logging instead of raising when it is missing or unreadable
+    
+    Args:
+        index_dir: Directory containing extracts.idx and extracts.blob
+    
+    Returns:
+        OfflineIndex or None if it cannot be opened
+    """
+    try:
+        return OfflineIndex(index_dir)
+    except (OSError, ValueError, struct.error) as e:
+        logger.error(f"Offline index {index_dir} unavailable, lookups use live Wikipedia: {e}")
+        return None
+
+
+# Global instance, opened only when the offline backend is selected
+offline_index = (
+    open_offline_index(os.getenv('WIKIPEDIA_OFFLINE_INDEX', '.cache/offline_index'))
+    if os.getenv('WIKIPEDIA_BACKEND', 'wikipedia') == 'offline' else None
+)
@@ -0,0 +1,204 @@
+"""
+Token-bucket rate limiter for Wikipedia requests, shared by all action server worker processes
+Bucket state lives in a SQLite file (like the response cache), so the processes on one
+host together stay within a per-host request budget instead of each spending its own.
+"""
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from .logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def parse_host_rates(spec: str) -> Dict[str, float]:
+    """
+    Parse per-host budgets like "de.wikipedia.org=20,en.wikipedia.org=10"
+    
+    Args:
+        spec: Comma-separated host=requests-per-second pairs
+    
+    Returns:
+        Host name -> requests per second
+    """
+    rates = {}
+    for item in spec.split(','):
+        host, _, rate = item.partition('=')
+        if host.strip() and rate.strip():
+            try:
+                rates[host.strip()] = float(rate)
+            except ValueError:
+                logger.warning(f"Ignoring invalid rate limit '{item}'")
+    return rates
+
+
+class TokenBucketLimiter:
+    """
+    Per-host token buckets. Each request takes one token; tokens refill at `rate` per second
+    up to `burst`. A request arriving at an empty bucket reserves the next free token and waits
+    for it, but only if that wait is at most `max_wait` - otherwise it is rejected, so the queue
+    in front of a host never grows beyond max_wait * rate requests.
+    """
+    
+    def __init__(self, rate: float = 10.0, burst: float = 20.0, max_wait: float = 1.0,
+                 host_rates: Optional[Dict[str, float]] = None, path: Optional[str] = None):
+        """
+        Args:
+            rate: Default requests per second per host (0 or less disables limiting)
+            burst: Bucket size, i.e. requests allowed back to back after an idle period
+            max_wait: Longest wait in seconds a request may queue for a token
+            host_rates: Requests per second for specific hosts (overrides rate)
+            path: SQLite file shared by all processes (None keeps the buckets in this process)
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = max_wait
+        self.host_rates = host_rates or {}
+        self.path = path
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+    
+    def rate_for(self, host: str) -> float:
+        """Requests per second allowed for a host"""
+        return self.host_rates.get(host, self.rate)
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, creating the database on first use"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS buckets '
+                '(host TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)'
+            )
+            self._local.connection = connection
+        return connection
+    
+    def _refill(self, host: str, tokens: float, updated: float, now: float) -> float:
+        """Token count of a bucket at `now`"""
+        return min(self.burst, tokens + max(0.0, now - updated) * self.rate_for(host))
+    
+    def _take(self, host: str, state: Optional[Tuple[float, float]], now: float,
+              max_wait: float) -> Tuple[Optional[float], Optional[Tuple[float, float]]]:
+        """
+        Take a token from a bucket state
+        
+        Returns:
+            Tuple of (seconds to wait or None if rejected, new bucket state or None if unchanged)
+        """
+        tokens = self._refill(host, *state, now) if state else self.burst
+        if tokens >= 1:
+            return 0.0, (tokens - 1, now)
+        wait = (1 - tokens) / self.rate_for(host)
+        if wait > max_wait:
+            return None, None
+        # Negative token counts are reservations of future tokens by waiting requests
+        return wait, (tokens - 1, now)
+    
+    def reserve(self, host: str, max_wait: Optional[float] = None) -> Optional[float]:
+        """
+        Take a token for a request to a host
+        
+        Args:
+            host: Host name
+            max_wait: Longest acceptable wait (defaults to the limiter's max_wait)
+        
+        Returns:
+            Seconds the caller has to wait before sending, or None if the request is rejected
+        """
+        if self.rate_for(host) <= 0:
+            return 0.0
+        max_wait = self.max_wait if max_wait is None else min(max_wait, self.max_wait)
+        now = time.time()
+        
+        if self.path is None:
+            with self._lock:
+                wait, state = self._take(host, self._buckets.get(host), now, max_wait)
+                if state is not None:
+                    self._buckets[host] = state
+            return wait
+        
+        try:
+            connection = self._connection()
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                row = connection.execute('SELECT tokens, updated FROM buckets WHERE host = ?', (host,)).fetchone()
+                wait, state = self._take(host, row, now, max_wait)
+                if state is not None:
+                    connection.execute('INSERT OR REPLACE INTO buckets (host, tokens, updated) VALUES (?, ?, ?)',
+                                       (host, *state))
+                connection.execute('COMMIT')
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+            return wait
+        except sqlite3.Error as e:
+            # Never block requests because the limiter's state is unavailable
+            logger.warning(f"Rate limiter state unavailable ({self.path}): {e}")
+            return 0.0
+    
+    def acquire(self, host: str, max_wait: Optional[float] = None) -> bool:
+        """
+        Take a token, sleeping until it is available
+        
+        Args:
+            host: Host name
+            max_wait: Longest acceptable wait (defaults to the limiter's max_wait)
+        
+        Returns:
+            False if the request was rejected because the wait would be too long
+        """
+        wait = self.reserve(host, max_wait)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+    
+    def saturated(self, host: str) -> bool:
+        """
+        Check without taking a token whether a request to the host would have to queue
+        
+        Args:
+            host: Host name
+        
+        Returns:
+            True if the host's bucket is empty right now
+        """
+        if self.rate_for(host) <= 0:
+            return False
+        if self.path is None:
+            with self._lock:
+                state = self._buckets.get(host)
+        else:
+            try:
+                state = self._connection().execute(
+                    'SELECT tokens, updated FROM buckets WHERE host = ?', (host,)
+                ).fetchone()
+            except sqlite3.Error:
+                return False
+        return state is not None and self._refill(host, *state, time.time()) < 1
+    
+    def close(self):
+        """Close this thread's connection"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+# Global instance shared by the sync and async Wikipedia clients
+rate_limiter = TokenBucketLimiter(
+    rate=float(os.getenv('WIKIPEDIA_RATE_LIMIT', '20')),
+    burst=float(os.getenv('WIKIPEDIA_RATE_LIMIT_BURST', '40')),
+    max_wait=float(os.getenv('WIKIPEDIA_RATE_LIMIT_MAX_WAIT', '1.0')),
+    host_rates=parse_host_rates(os.getenv('WIKIPEDIA_RATE_LIMIT_HOSTS', '')),
+    path=os.getenv('WIKIPEDIA_RATE_LIMIT_PATH', '') or None
+) if float(os.getenv('WIKIPEDIA_RATE_LIMIT', '20')) > 0 else None
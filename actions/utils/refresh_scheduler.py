@@ -0,0 +1,230 @@
+"""
+Background refresh of hot cache entries
+The scheduler wakes up every `interval` seconds and, once visitors have been quiet for a moment,
+refreshes the most requested cache entries that are about to expire. Popular artworks are thus
+renewed ahead of time instead of expiring in the middle of a busy afternoon. Refreshes run on a
+small thread pool and are capped by a token bucket; state and counters are available from
+snapshot(), and stop() ends the loop at interpreter exit.
+"""
+import atexit
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from .access_stats import AccessStats
+from .logging_config import setup_logger
+from .rate_limiter import TokenBucketLimiter
+from .wikipedia_client import WikipediaClient
+
+logger = setup_logger(__name__)
+
+# Token bucket name of the scheduler's own budget
+REFRESH_BUCKET = 'refresh'
+
+
+class RefreshScheduler:
+    """Keeps the top-N most requested lookups of a client's response cache from expiring"""
+    
+    def __init__(self, client: WikipediaClient, stats: AccessStats, top_n: int = 50,
+                 window: float = 3600, interval: float = 30, idle_after: float = 5,
+                 max_defer: float = 600, concurrency: int = 2, rate: float = 1.0, decay: float = 0.98):
+        """
+        Args:
+            client: Sync Wikipedia client whose response cache is refreshed
+            stats: Access counts of the lookups (shared with the clients that serve visitors)
+            top_n: Hottest lookups considered per cycle
+            window: Refresh entries that expire within this many seconds (or expired within the cache's grace)
+            interval: Seconds between cycles
+            idle_after: Seconds without a lookup after which the action server counts as idle
+            max_defer: Seconds after which a cycle runs even if visitors never paused
+            concurrency: Refresh threads working at the same time
+            rate: Entries refreshed per second on average (0 or less disables the cap)
+            decay: Factor applied to all access counts once per cycle
+        """
+        self.client = client
+        self.stats = stats
+        self.top_n = top_n
+        self.window = window
+        self.interval = interval
+        self.idle_after = idle_after
+        self.max_defer = max_defer
+        self.concurrency = max(1, concurrency)
+        self.decay = decay
+        self.limiter = TokenBucketLimiter(rate=rate, burst=max(1.0, rate * interval), max_wait=0)
+        self._counters: Counter = Counter()
+        self._counters_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._last_cycle = time.monotonic()
+        self._last_cycle_seconds: Optional[float] = None
+    
+    def _count(self, name: str, amount: int = 1):
+        with self._counters_lock:
+            self._counters[name] += amount
+    
+    def start(self):
+        """Start the scheduler thread (no-op if it is already running)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="cache-refresh")
+        self._thread = threading.Thread(target=self._run, name="cache-refresh-scheduler", daemon=True)
+        self._thread.start()
+        logger.info(f"Refresh scheduler started (top {self.top_n}, every {self.interval}s, "
+                    f"{self.concurrency} threads)")
+    
+    def stop(self, timeout: float = 10.0):
+        """
+        Stop the scheduler: no new cycle starts, queued refreshes are cancelled and the
+        running ones are given `timeout` seconds to finish
+        
+        Args:
+            timeout: Seconds to wait for the scheduler thread
+        """
+        self._stop.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                logger.warning("Refresh scheduler did not stop within the timeout")
+            self._thread = None
+        self._executor = None
+        logger.info(f"Refresh scheduler stopped: {self.snapshot()['counters']}")
+    
+    def running(self) -> bool:
+        """Whether the scheduler thread is alive"""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Refresh cycle failed: {e}", exc_info=True)
+    
+    def due_entries(self) -> List[Tuple[str, str, str, Dict[str, Any]]]:
+        """
+        Pick the hot lookups whose cache entries expire within the window, within the rate cap
+        
+        Returns:
+            List of (kind, language, query, cached value), hottest first
+        """
+        due = []
+        for (kind, language, query), _ in self.stats.top(self.top_n):
+            peeked = self.client.cache.peek(kind, language, query)
+            if peeked is None or peeked[1] > self.window:
+                continue
+            if self.limiter.reserve(REFRESH_BUCKET, max_wait=0) is None:
+                self._count('rate_capped')
+                break
+            due.append((kind, language, query, peeked[0]))
+        return due
+    
+    def run_once(self, force: bool = False) -> Dict[str, int]:
+        """
+        Run one refresh cycle if the action server is idle (or the last cycle is too long ago)
+        
+        Args:
+            force: Run regardless of visitor activity
+        
+        Returns:
+            Refresh counters of this cycle (empty if it was deferred)
+        """
+        if self.client.cache is None:
+            return {}
+        overdue = time.monotonic() - self._last_cycle >= self.max_defer
+        if not force and not overdue and self.stats.idle_for() < self.idle_after:
+            self._count('deferred_busy')
+            return {}
+        
+        start = time.perf_counter()
+        self._last_cycle = time.monotonic()
+        self.stats.decay(self.decay)
+        due = self.due_entries()
+        report: Counter = Counter()
+        if due:
+            chunks = [due[i::self.concurrency] for i in range(min(self.concurrency, len(due)))]
+            executor = self._executor or ThreadPoolExecutor(max_workers=self.concurrency,
+                                                            thread_name_prefix="cache-refresh")
+            try:
+                futures = [executor.submit(self.client.refresh_entries, chunk) for chunk in chunks]
+                for future in futures:
+                    try:
+                        report.update(future.result())
+                    except CancelledError:
+                        self._count('cancelled')
+                    except Exception as e:
+                        self._count('errors')
+                        logger.warning(f"Cache refresh failed: {e}")
+            except RuntimeError:
+                # Executor shut down by stop() while the cycle was starting
+                self._count('cancelled')
+            finally:
+                if executor is not self._executor:
+                    executor.shutdown(wait=False)
+        
+        self._last_cycle_seconds = time.perf_counter() - start
+        self._count('cycles')
+        self._count('due', len(due))
+        for name, count in report.items():
+            self._count(name, count)
+        if due:
+            logger.info(f"Refreshed {len(due)} hot cache entries in {self._last_cycle_seconds:.2f}s: {dict(report)}")
+        return dict(report)
+    
+    def snapshot(self, hottest: int = 5) -> Dict[str, Any]:
+        """
+        Get the scheduler's state for monitoring
+        
+        Args:
+            hottest: Number of hottest lookups listed
+        
+        Returns:
+            Dict with 'running', 'tracked' lookups, 'idle_s', 'last_cycle_s', 'hot'
+            (list of (kind, language, query, count)) and 'counters' ('cycles', 'due',
+            'deferred_busy', 'rate_capped', 'checked', 'unchanged', 'changed', 'refetched', ...)
+        """
+        with self._counters_lock:
+            counters = dict(self._counters)
+        idle = self.stats.idle_for()
+        return {
+            'running': self.running(),
+            'tracked': len(self.stats),
+            'idle_s': round(idle, 1) if idle != float('inf') else None,
+            'last_cycle_s': round(self._last_cycle_seconds, 3) if self._last_cycle_seconds is not None else None,
+            'hot': [(kind, language, query, round(count, 2))
+                    for (kind, language, query), count in self.stats.top(hottest)],
+            'counters': counters
+        }
+
+
+def start_refresh_scheduler(client: WikipediaClient) -> Optional[RefreshScheduler]:
+    """
+    Start a scheduler configured by the WIKIPEDIA_REFRESH_* variables and stop it at interpreter exit
+    
+    Args:
+        client: Sync Wikipedia client whose response cache is refreshed (needs access_stats and a cache)
+    
+    Returns:
+        The running scheduler, or None if the client tracks no access counts or has no cache
+    """
+    if client.access_stats is None or client.cache is None:
+        logger.warning("Refresh scheduler needs a Wikipedia client with access_stats and a response cache")
+        return None
+    scheduler = RefreshScheduler(
+        client,
+        client.access_stats,
+        top_n=int(os.getenv('WIKIPEDIA_REFRESH_TOP_N', '50')),
+        window=float(os.getenv('WIKIPEDIA_REFRESH_WINDOW', '3600')),
+        interval=float(os.getenv('WIKIPEDIA_REFRESH_INTERVAL', '30')),
+        idle_after=float(os.getenv('WIKIPEDIA_REFRESH_IDLE_AFTER', '5')),
+        concurrency=int(os.getenv('WIKIPEDIA_REFRESH_CONCURRENCY', '2')),
+        rate=float(os.getenv('WIKIPEDIA_REFRESH_RATE', '1.0'))
+    )
+    scheduler.start()
+    atexit.register(scheduler.stop)
+    return scheduler
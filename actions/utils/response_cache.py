@@ -0,0 +1,544 @@
+"""
+Two-tier response cache for Wikipedia lookups
+Tier 1 is a bounded in-process LRU with TTL, tier 2 a SQLite file shared by all
+action server worker processes on the same host
+"""
+import copy
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from .logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def normalize_cache_key(text: str) -> str:
+    """
+    Normalize a title or query so that spelling variants share one cache entry
+    
+    Args:
+        text: Page title or user query
+    
+    Returns:
+        Lower-cased text with underscores and repeated whitespace collapsed
+    """
+    return ' '.join(text.replace('_', ' ').lower().split())
+
+
+class MemoryCache:
+    """Thread-safe LRU cache with a per-entry time to live"""
+    
+    def __init__(self, max_entries: int = 512, ttl: float = 86400, stale_ttl: float = 0):
+        """
+        Args:
+            max_entries: Maximum number of entries before the least recently used one is evicted
+            ttl: Seconds an entry stays valid
+            stale_ttl: Seconds an expired entry is kept for get(max_age=...) lookups
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str, max_age: Optional[float] = None) -> Optional[Tuple[Any, float]]:
+        """
+        Look up an entry and mark it as recently used
+        
+        Args:
+            key: Cache key
+            max_age: Accept entries up to this age in seconds instead of the TTL
+        
+        Returns:
+            Tuple of (value, stored_at) or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            age = time.time() - entry[1]
+            if age > self.ttl + self.stale_ttl:
+                del self._entries[key]
+                return None
+            if age > (self.ttl if max_age is None else max_age):
+                return None
+            self._entries.move_to_end(key)
+            return entry
+    
+    def set(self, key: str, value: Any, stored_at: Optional[float] = None):
+        """
+        Store an entry, evicting the least recently used one when full
+        
+        Args:
+            key: Cache key
+            value: Value to store
+            stored_at: Original store time (defaults to now)
+        """
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, stored_at or time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def expired(self, limit: int) -> List[Tuple[str, Any, float]]:
+        """
+        List entries past their TTL that are still within the stale window
+        
+        Args:
+            limit: Maximum number of entries returned
+        
+        Returns:
+            List of (key, value, stored_at), oldest first
+        """
+        now = time.time()
+        with self._lock:
+            entries = [(key, value, stored_at) for key, (value, stored_at) in self._entries.items()
+                       if self.ttl < now - stored_at <= self.ttl + self.stale_ttl]
+        return sorted(entries, key=lambda entry: entry[2])[:limit]
+    
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """
+    Persistent cache in a SQLite file. Uses WAL mode and one connection per thread,
+    so several processes and threads can read and write concurrently.
+    """
+    
+    def __init__(self, path: str, ttl: float = 86400, table: str = 'responses', stale_ttl: float = 0):
+        """
+        Args:
+            path: SQLite database file (created on first use)
+            ttl: Seconds an entry stays valid
+            table: Table holding the entries (several caches can share one file)
+            stale_ttl: Seconds an expired entry is kept for get(max_age=...) lookups
+        """
+        self.path = path
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.table = table
+        self._local = threading.local()
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, creating the database on first use"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute(
+                f'CREATE TABLE IF NOT EXISTS {self.table} '
+                '(key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)'
+            )
+            connection.commit()
+            self._local.connection = connection
+        return connection
+    
+    def get(self, key: str, max_age: Optional[float] = None) -> Optional[Tuple[Any, float]]:
+        """
+        Look up an entry
+        
+        Args:
+            key: Cache key
+            max_age: Accept entries up to this age in seconds instead of the TTL
+        
+        Returns:
+            Tuple of (value, stored_at) or None if missing, expired or unreadable
+        """
+        try:
+            row = self._connection().execute(
+                f'SELECT value, stored_at FROM {self.table} WHERE key = ?', (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"SQLite cache read failed ({self.path}): {e}")
+            return None
+        if row is None or time.time() - row[1] > (self.ttl if max_age is None else max_age):
+            return None
+        return json.loads(row[0]), row[1]
+    
+    def set(self, key: str, value: Any, stored_at: Optional[float] = None):
+        """
+        Store an entry (JSON-serializable values only)
+        
+        Args:
+            key: Cache key
+            value: Value to store
+            stored_at: Original store time (defaults to now)
+        """
+        try:
+            connection = self._connection()
+            connection.execute(
+                f'INSERT OR REPLACE INTO {self.table} (key, value, stored_at) VALUES (?, ?, ?)',
+                (key, json.dumps(value, ensure_ascii=False), stored_at or time.time())
+            )
+            connection.commit()
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"SQLite cache write failed ({self.path}): {e}")
+    
+    def expired(self, limit: int) -> List[Tuple[str, Any, float]]:
+        """
+        List entries past their TTL that are still within the stale window
+        
+        Args:
+            limit: Maximum number of entries returned
+        
+        Returns:
+            List of (key, value, stored_at), oldest first
+        """
+        now = time.time()
+        try:
+            rows = self._connection().execute(
+                f'SELECT key, value, stored_at FROM {self.table} WHERE stored_at < ? AND stored_at >= ? '
+                'ORDER BY stored_at LIMIT ?',
+                (now - self.ttl, now - self.ttl - self.stale_ttl, limit)
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"SQLite cache scan failed ({self.path}): {e}")
+            return []
+        return [(key, json.loads(value), stored_at) for key, value, stored_at in rows]
+    
+    def purge_expired(self) -> int:
+        """
+        Delete entries that are expired and past the stale window
+        
+        Returns:
+            Number of deleted entries
+        """
+        try:
+            connection = self._connection()
+            deleted = connection.execute(
+                f'DELETE FROM {self.table} WHERE stored_at < ?', (time.time() - self.ttl - self.stale_ttl,)
+            ).rowcount
+            connection.commit()
+            return deleted
+        except sqlite3.Error as e:
+            logger.warning(f"SQLite cache purge failed ({self.path}): {e}")
+            return 0
+    
+    def clear(self):
+        """Remove all entries"""
+        try:
+            connection = self._connection()
+            connection.execute(f'DELETE FROM {self.table}')
+            connection.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"SQLite cache clear failed ({self.path}): {e}")
+    
+    def close(self):
+        """Close this thread's connection"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+class ResponseCache:
+    """
+    Memory LRU in front of an optional SQLite store, keyed by (kind, language, normalized title/query).
+    Entries found on disk are promoted to memory. Callers always receive a private copy.
+    
+    A separate negative tier with its own TTL remembers (language, title) pairs that are known
+    not to resolve ('missing') or not to describe an artwork ('not_artwork').
+    
+    Expired entries are kept for another `stale_ttl` seconds; get_stale() serves them when
+    Wikipedia cannot be asked right now (rate limited, circuit open, out of time). During the
+    first `grace` seconds after expiry get_grace() serves them to every caller, who then
+    refresh the entry in the background (stale-while-revalidate).
+    """
+    
+    def __init__(self, max_entries: int = 512, ttl: float = 86400, path: Optional[str] = None,
+                 negative_ttl: float = 21600, stale_ttl: float = 604800, grace: float = 3600):
+        """
+        Args:
+            max_entries: Size of the in-memory LRU tier
+            ttl: Seconds an entry stays valid in both tiers
+            path: SQLite file for the persistent tier (None for memory only)
+            negative_ttl: Seconds a negative result stays valid
+            stale_ttl: Seconds after expiry an entry can still be served by get_stale()
+            grace: Seconds after expiry an entry is served by get_grace() while it is refreshed
+                (capped at stale_ttl, 0 disables stale-while-revalidate)
+        """
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.grace = min(grace, stale_ttl)
+        self.memory = MemoryCache(max_entries, ttl, stale_ttl)
+        self.disk = SQLiteCache(path, ttl, stale_ttl=stale_ttl) if path else None
+        self.negative_memory = MemoryCache(max_entries * 4, negative_ttl)
+        self.negative_disk = SQLiteCache(path, negative_ttl, table='negative_results') if path else None
+        self._stats: Counter = Counter()
+        self._stats_lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(kind: str, language: str, query: str) -> str:
+        """
+        Build the cache key for a lookup
+        
+        Args:
+            kind: Lookup type ('artwork', 'artist', 'summary', ...)
+            language: Language code of the lookup
+            query: Title or query text
+        
+        Returns:
+            Cache key string
+        """
+        return f"{kind}|{language}|{normalize_cache_key(query)}"
+    
+    def _record(self, name: str):
+        with self._stats_lock:
+            self._stats[name] += 1
+    
+    def get(self, kind: str, language: str, query: str) -> Optional[Any]:
+        """
+        Look up a cached lookup result
+        
+        Args:
+            kind: Lookup type
+            language: Language code
+            query: Title or query text
+        
+        Returns:
+            Copy of the cached value or None on a miss
+        """
+        value = self.get_memory(kind, language, query)
+        if value is not None:
+            return value
+        
+        key = self.make_key(kind, language, query)
+        if self.disk is not None:
+            entry = self.disk.get(key)
+            if entry is not None:
+                self._record('disk_hits')
+                self.memory.set(key, entry[0], stored_at=entry[1])
+                return copy.deepcopy(entry[0])
+        
+        self._record('misses')
+        return None
+    
+    def get_memory(self, kind: str, language: str, query: str) -> Optional[Any]:
+        """
+        Look up a cached lookup result in the memory tier only (never blocks on the SQLite file).
+        A miss is not counted: callers go on with get() when the entry may be on disk.
+        
+        Args:
+            kind: Lookup type
+            language: Language code
+            query: Title or query text
+        
+        Returns:
+            Copy of the cached value or None
+        """
+        entry = self.memory.get(self.make_key(kind, language, query))
+        if entry is None:
+            return None
+        self._record('memory_hits')
+        return copy.deepcopy(entry[0])
+    
+    def get_stale(self, kind: str, language: str, query: str) -> Optional[Any]:
+        """
+        Look up a lookup result that may be expired, as long as it is within the stale window
+        
+        Args:
+            kind: Lookup type
+            language: Language code
+            query: Title or query text
+        
+        Returns:
+            Copy of the cached value or None
+        """
+        entry = self._get_expired(kind, language, query, self.stale_ttl)
+        if entry is None:
+            return None
+        self._record('stale_hits')
+        return copy.deepcopy(entry[0])
+    
+    def get_grace(self, kind: str, language: str, query: str) -> Optional[Tuple[Any, float]]:
+        """
+        Look up a lookup result that expired less than `grace` seconds ago
+        
+        Args:
+            kind: Lookup type
+            language: Language code
+            query: Title or query text
+        
+        Returns:
+            Tuple of (copy of the cached value, seconds since it expired) or None
+        """
+        if self.grace <= 0:
+            return None
+        entry = self._get_expired(kind, language, query, self.grace)
+        if entry is None:
+            return None
+        self._record('grace_hits')
+        return copy.deepcopy(entry[0]), max(0.0, time.time() - entry[1] - self.ttl)
+    
+    def peek(self, kind: str, language: str, query: str) -> Optional[Tuple[Any, float]]:
+        """
+        Look up a lookup result for background maintenance, without counting a hit or miss
+        
+        Args:
+            kind: Lookup type
+            language: Language code
+            query: Title or query text
+        
+        Returns:
+            Tuple of (copy of the cached value, seconds until it expires, negative once expired),
+            or None if nothing is cached or the entry is past the grace period
+        """
+        entry = self._get_expired(kind, language, query, self.grace)
+        if entry is None:
+            return None
+        return copy.deepcopy(entry[0]), entry[1] + self.ttl - time.time()
+    
+    def _get_expired(self, kind: str, language: str, query: str, window: float) -> Optional[Tuple[Any, float]]:
+        """Look up an entry in either tier that is at most `window` seconds past its TTL"""
+        key = self.make_key(kind, language, query)
+        max_age = self.ttl + window
+        entry = self.memory.get(key, max_age=max_age)
+        if entry is None and self.disk is not None:
+            entry = self.disk.get(key, max_age=max_age)
+        return entry
+    
+    def expired(self, limit: int = 500) -> List[Tuple[str, str, str, Any]]:
+        """
+        List expired lookup results that can still be revalidated instead of refetched
+        
+        Args:
+            limit: Maximum number of entries returned
+        
+        Returns:
+            List of (kind, language, normalized query, value), oldest first
+        """
+        store = self.disk if self.disk is not None else self.memory
+        entries = []
+        for key, value, _ in store.expired(limit):
+            kind, language, query = key.split('|', 2)
+            entries.append((kind, language, query, copy.deepcopy(value)))
+        return entries
+    
+    def set(self, kind: str, language: str, query: str, value: Any, disk: bool = True):
+        """
+        Store a lookup result in both tiers
+        
+        Args:
+            kind: Lookup type
+            language: Language code
+            query: Title or query text
+            value: JSON-serializable result
+            disk: Also write the SQLite tier (False leaves that to a later set_disk())
+        """
+        key = self.make_key(kind, language, query)
+        stored_at = time.time()
+        self.memory.set(key, copy.deepcopy(value), stored_at=stored_at)
+        if disk and self.disk is not None:
+            self.disk.set(key, value, stored_at=stored_at)
+        self._record('stores')
+    
+    def set_disk(self, kind: str, language: str, query: str, value: Any):
+        """Store a lookup result in the SQLite tier only (the memory tier already has it)"""
+        if self.disk is not None:
+            self.disk.set(self.make_key(kind, language, query), value)
+    
+    def get_negative(self, language: str, title: str, disk: bool = True) -> Optional[str]:
+        """
+        Look up a known negative result for a title
+        
+        Args:
+            language: Language code
+            title: Requested page title
+            disk: Also look in the SQLite tier (False for the memory tier only)
+        
+        Returns:
+            Reason ('missing' or 'not_artwork') or None if nothing negative is known
+        """
+        key = self.make_key('negative', language, title)
+        entry = self.negative_memory.get(key)
+        if entry is None and disk and self.negative_disk is not None:
+            entry = self.negative_disk.get(key)
+            if entry is not None:
+                self.negative_memory.set(key, entry[0], stored_at=entry[1])
+        if entry is None:
+            return None
+        self._record('negative_hits')
+        return entry[0]
+    
+    def set_negative(self, language: str, title: str, reason: str, disk: bool = True):
+        """
+        Remember that a title did not resolve or is not usable
+        
+        Args:
+            language: Language code
+            title: Requested page title
+            reason: 'missing' or 'not_artwork'
+            disk: Also write the SQLite tier (False leaves that to a later set_negative_disk())
+        """
+        key = self.make_key('negative', language, title)
+        stored_at = time.time()
+        self.negative_memory.set(key, reason, stored_at=stored_at)
+        if disk and self.negative_disk is not None:
+            self.negative_disk.set(key, reason, stored_at=stored_at)
+        self._record('negative_stores')
+    
+    def set_negative_disk(self, language: str, title: str, reason: str):
+        """Store a negative result in the SQLite tier only (the memory tier already has it)"""
+        if self.negative_disk is not None:
+            self.negative_disk.set(self.make_key('negative', language, title), reason)
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Get hit/miss counters
+        
+        Returns:
+            Counters 'memory_hits', 'disk_hits', 'misses', 'stores', 'negative_hits',
+            'negative_stores', 'stale_hits', 'grace_hits' and current 'memory_entries'
+        """
+        with self._stats_lock:
+            stats = {name: self._stats[name] for name in ('memory_hits', 'disk_hits', 'misses', 'stores',
+                                                          'negative_hits', 'negative_stores', 'stale_hits',
+                                                          'grace_hits')}
+        stats['memory_entries'] = len(self.memory)
+        return stats
+    
+    def reset_stats(self):
+        """Reset hit/miss counters"""
+        with self._stats_lock:
+            self._stats.clear()
+    
+    def clear(self):
+        """Remove all entries from both tiers, including negative results"""
+        self.memory.clear()
+        self.negative_memory.clear()
+        for store in (self.disk, self.negative_disk):
+            if store is not None:
+                store.clear()
+    
+    def close(self):
+        """Close the persistent tier's connections of the calling thread"""
+        for store in (self.disk, self.negative_disk):
+            if store is not None:
+                store.close()
+
+
+# Global instance shared by the sync and async Wikipedia clients
+response_cache = ResponseCache(
+    max_entries=int(os.getenv('WIKIPEDIA_CACHE_SIZE', '512')),
+    ttl=float(os.getenv('WIKIPEDIA_CACHE_TTL', '86400')),
+    path=os.getenv('WIKIPEDIA_CACHE_PATH', '') or None,
+    negative_ttl=float(os.getenv('WIKIPEDIA_NEGATIVE_CACHE_TTL', '21600')),
+    stale_ttl=float(os.getenv('WIKIPEDIA_STALE_TTL', '604800')),
+    grace=float(os.getenv('WIKIPEDIA_STALE_GRACE', '3600'))
+) if os.getenv('WIKIPEDIA_CACHE_ENABLED', 'true').lower() == 'true' else None
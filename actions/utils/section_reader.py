@@ -0,0 +1,164 @@
+"""
+Section paging for "tell me more" follow-ups
+The artwork and artist actions keep a cursor (page id, language, last section read) in the
+content_cursor slot. A follow-up asks the client for the next readable section only: the
+section list and every section's text are cached on their own (kinds 'sections' and
+'section'), so a conversation never downloads the same part of a page twice.
+"""
+import re
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Tuple
+
+# Response cache kinds of a page's section list and of one section's text
+SECTIONS_KIND = 'sections'
+SECTION_KIND = 'section'
+
+# Sections without prose worth summarizing (compared lower-case)
+SKIPPED_SECTIONS = {
+    'literatur', 'weblinks', 'einzelnachweise', 'anmerkungen', 'siehe auch', 'quellen',
+    'galerie', 'filmografie', 'werke', 'werkverzeichnis', 'ausstellungen',
+    'references', 'external links', 'see also', 'notes', 'further reading', 'bibliography',
+    'sources', 'gallery', 'citations', 'footnotes', 'list of works', 'exhibitions'
+}
+
+# Elements whose content is never part of a section's prose
+_SKIPPED_TAGS = {'table', 'style', 'script', 'sup', 'figure', 'figcaption', 'math', 'noscript'}
+_SKIPPED_CLASSES = ('reference', 'mw-editsection', 'thumb', 'navbox', 'hatnote', 'metadata',
+                    'infobox', 'gallery', 'noprint', 'mw-empty-elt')
+_BLOCK_TAGS = {'p', 'li', 'dd'}
+_HEADING_TAGS = {'h2', 'h3', 'h4', 'h5', 'h6'}
+_VOID_TAGS = {'br', 'img', 'hr', 'meta', 'link', 'input', 'wbr', 'col', 'area', 'base', 'source'}
+
+
+class _SectionTextParser(HTMLParser):
+    """Collects the heading and the paragraph text of a parsed section's HTML"""
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.heading = ''
+        self.blocks: List[str] = []
+        self._stack: List[Tuple[str, bool]] = []
+        self._skip_depth = 0
+        self._current: Optional[List[str]] = None
+        self._in_heading = False
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in _VOID_TAGS:
+            if tag == 'br':
+                self.handle_data(' ')
+            return
+        classes = dict(attrs).get('class') or ''
+        skipped = tag in _SKIPPED_TAGS or any(name in classes for name in _SKIPPED_CLASSES)
+        self._stack.append((tag, skipped))
+        if skipped:
+            self._skip_depth += 1
+        elif not self._skip_depth:
+            if tag in _HEADING_TAGS and not self.heading:
+                self._in_heading = True
+                self._current = []
+            elif tag in _BLOCK_TAGS and self._current is None:
+                self._current = []
+    
+    def handle_endtag(self, tag):
+        if tag in _VOID_TAGS:
+            return
+        # Tolerate unclosed tags: pop up to the matching start tag
+        while self._stack:
+            open_tag, skipped = self._stack.pop()
+            if skipped:
+                self._skip_depth -= 1
+            if open_tag == tag:
+                break
+        if self._current is None or self._skip_depth:
+            return
+        text = re.sub(r'\s+', ' ', ''.join(self._current)).strip()
+        if self._in_heading and tag in _HEADING_TAGS:
+            self.heading = text
+            self._in_heading = False
+            self._current = None
+        elif not self._in_heading and tag in _BLOCK_TAGS:
+            if text:
+                self.blocks.append(text)
+            self._current = None
+    
+    def handle_data(self, data):
+        if self._current is not None and not self._skip_depth:
+            self._current.append(data)
+
+
+def section_text(html: str) -> Tuple[str, str]:
+    """
+    Turn the HTML of one parsed section into plain text
+    
+    Args:
+        html: action=parse text of the section
+    
+    Returns:
+        Tuple of (heading, paragraph text without tables, references and image captions)
+    """
+    parser = _SectionTextParser()
+    parser.feed(html or '')
+    parser.close()
+    return parser.heading, '\n'.join(parser.blocks)
+
+
+def readable_sections(sections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Pick the top-level sections of a page that hold prose
+    
+    Args:
+        sections: 'sections' of an action=parse&prop=sections response
+    
+    Returns:
+        List of {'index': section number, 'title': heading} in page order
+    """
+    readable = []
+    for section in sections:
+        index = str(section.get('index', ''))
+        # Sections transcluded from templates have indexes like "T-1" and cannot be fetched by number
+        if not index.isdigit() or section.get('toclevel') != 1:
+            continue
+        title = re.sub(r'<[^>]+>', '', section.get('line', '')).strip()
+        if title.lower() in SKIPPED_SECTIONS:
+            continue
+        readable.append({'index': int(index), 'title': title})
+    return readable
+
+
+def make_cursor(kind: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Create the cursor of a page the bot just answered with from its intro
+    
+    Args:
+        kind: 'artwork' or 'artist'
+        data: Lookup result (needs 'pageid', 'title' and 'language' of a Wikipedia page)
+    
+    Returns:
+        Cursor dict for the content_cursor slot, or None if the page cannot be paged
+    """
+    if not data or data.get('source', 'wikipedia') != 'wikipedia':
+        return None
+    if not data.get('pageid') or not data.get('title') or data.get('language') not in ('de', 'en'):
+        return None
+    return {'kind': kind, 'title': data['title'], 'pageid': int(data['pageid']),
+            'language': data['language'], 'section': 0}
+
+
+def cursor_matches(cursor: Any, kind: str, name: Optional[str] = None) -> bool:
+    """
+    Check whether a slot value is a cursor a follow-up about this kind (and entity) can continue
+    
+    Args:
+        cursor: Value of the content_cursor slot
+        kind: 'artwork' or 'artist'
+        name: Entity the visitor named in the follow-up, if any
+    
+    Returns:
+        True if the follow-up continues the cursor's page
+    """
+    if not isinstance(cursor, dict) or cursor.get('kind') != kind or not cursor.get('pageid'):
+        return False
+    if not name:
+        return True
+    name, title = name.lower().strip(), cursor.get('title', '').lower()
+    return name in title or title in name
@@ -0,0 +1,143 @@
+"""
+Request coalescing (single-flight) for concurrent identical lookups
+Concurrent callers with the same key share one in-flight call and all receive its result.
+A caller that joins another's call waits no longer than its own lookup deadline allows.
+"""
+import asyncio
+import copy
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from .deadline import current_deadline
+
+
+def _follower_timeout() -> Optional[float]:
+    """Seconds a joining caller may wait for the shared call: what is left of its deadline (None: no limit)"""
+    deadline = current_deadline()
+    return max(0.0, deadline.remaining()) if deadline is not None else None
+
+
+class _Call:
+    """One in-flight call shared by a leader thread and its followers"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """Single-flight for thread-pool execution"""
+    
+    def __init__(self, empty: Any = None):
+        """
+        Args:
+            empty: Result of a joining caller whose deadline runs out before the shared call finishes
+        """
+        self.empty = empty
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+    
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run fn once per key at a time; concurrent callers with the same key wait for that run
+        
+        Args:
+            key: Lookup key
+            fn: Function doing the actual lookup
+        
+        Returns:
+            Tuple of (result, whether this caller joined another caller's in-flight call).
+            Results shared by several callers are handed out as private copies; a joining caller
+            whose deadline runs out first gets a copy of `empty`.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                call.followers += 1
+        
+        if not leader:
+            if not call.done.wait(_follower_timeout()):
+                return copy.deepcopy(self.empty), True
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result), True
+        
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            # No follower can join once the call is unregistered, so the count below is final
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        
+        if call.followers:
+            return copy.deepcopy(call.result), False
+        return call.result, False
+
+
+class _AsyncCall:
+    """One in-flight lookup task and the number of callers that joined it"""
+    
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.followers = 0
+
+
+class AsyncSingleFlight:
+    """
+    Single-flight for asyncio execution. The shared call runs as its own task, so a
+    cancelled caller does not cancel the lookup for the others.
+    """
+    
+    def __init__(self, empty: Any = None):
+        """
+        Args:
+            empty: Result of a joining caller whose deadline runs out before the shared call finishes
+        """
+        self.empty = empty
+        # Tasks are bound to their event loop, so in-flight calls are tracked per loop
+        self._calls: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, _AsyncCall]]" = weakref.WeakKeyDictionary()
+    
+    async def do(self, key: str, coro_fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Await coro_fn once per key at a time; concurrent callers with the same key await that run
+        
+        Args:
+            key: Lookup key
+            coro_fn: Coroutine function doing the actual lookup
+        
+        Returns:
+            Tuple of (result, whether this caller joined another caller's in-flight call).
+            Results shared by several callers are handed out as private copies; a joining caller
+            whose deadline runs out first gets a copy of `empty`.
+        """
+        calls = self._calls.setdefault(asyncio.get_running_loop(), {})
+        call = calls.get(key)
+        joined = call is not None
+        if joined:
+            call.followers += 1
+        else:
+            call = _AsyncCall(asyncio.ensure_future(coro_fn()))
+            calls[key] = call
+            # Runs before any awaiting caller resumes, so the follower count is final by then
+            call.task.add_done_callback(lambda _: calls.pop(key, None))
+        
+        if joined:
+            try:
+                result = await asyncio.wait_for(asyncio.shield(call.task), _follower_timeout())
+            except asyncio.TimeoutError:
+                return copy.deepcopy(self.empty), True
+        else:
+            result = await asyncio.shield(call.task)
+        if call.followers:
+            return copy.deepcopy(result), joined
+        return result, joined
@@ -7,6 +7,42 @@ from .logging_config import setup_logger
 
 logger = setup_logger(__name__)
 
+# Abbreviations whose dot does not end a sentence (compared lower-case, without the dot)
+ABBREVIATIONS = {
+    'bzw', 'ca', 'etc', 'usw', 'vgl', 'geb', 'gest', 'nr', 'dr', 'prof', 'st', 'hl', 'jh', 'jhd',
+    'evtl', 'sog', 'inkl', 'ggf', 'bzgl', 'eigtl', 'urspr', 'chr', 'hrsg', 'bd', 'abb', 'ff',
+    'mr', 'mrs', 'ms', 'jr', 'sr', 'vs', 'no', 'op'
+}
+
+_SENTENCE_END = re.compile(r'[.!?]["“”»«\')\]]*\s+')
+_LAST_WORD = re.compile(r'(\S+)$')
+
+def sentence_ends(text: str) -> List[int]:
+    """
+    Find where the sentences of a text end
+    
+    Dots of ordinals and dates ("14. April", "20. Jahrhundert"), initials and abbreviations
+    ("u. a.", "z. B.", "ca.") do not end a sentence, and neither does a dot followed by a
+    lower-case word.
+    
+    Args:
+        text: Plain text
+        
+    Returns:
+        Offsets just after the closing punctuation of every sentence followed by more text
+    """
+    ends = []
+    for match in _SENTENCE_END.finditer(text):
+        if text[match.end():match.end() + 1].islower():
+            continue
+        if text[match.start()] == '.':
+            word = _LAST_WORD.search(text, 0, match.start())
+            token = word.group(1).lstrip('(„"»') if word else ''
+            if (token.isdigit() and len(token) <= 2) or len(token) == 1 or token.lower() in ABBREVIATIONS:
+                continue
+        ends.append(match.start() + len(match.group().rstrip()))
+    return ends
+
 def clean_text_content(text: str) -> str:
     """
     Clean text content by removing phonetic pronunciations and citations
@@ -0,0 +1,287 @@
+"""
+Learned query -> canonical page memo for the Wikipedia clients
+Every successful artwork or artist search remembers which page the normalized query resolved
+to (language, canonical title, pageid). The next search with the same phrasing skips the
+resolution pipeline and fetches that page directly. Entries outlive the response cache's TTL
+(pages are rarely renamed, and redirects are followed) but not `max_age`: after that the query
+is resolved in full again, in case a better page has appeared since. The memo is bounded and
+evicts the least recently used queries. Like the response cache, it can persist in a SQLite file shared
+by all worker processes.
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Optional
+from .logging_config import setup_logger
+from .response_cache import normalize_cache_key
+
+logger = setup_logger(__name__)
+
+# Leading articles that do not change which page a query means ("die sternennacht")
+LEADING_ARTICLES = ('der', 'die', 'das', 'the')
+
+# Memo hits whose last-use times are collected before they are written to SQLite in one transaction
+TOUCH_BATCH = 64
+
+# Seconds a remembered page answers its query before the search resolves it again (30 days)
+DEFAULT_MAX_AGE = 2592000
+
+
+def memo_key(kind: str, query: str) -> str:
+    """
+    Build the memo key of a search
+    
+    Args:
+        kind: Lookup type ('artwork' or 'artist')
+        query: User query
+    
+    Returns:
+        Key with the query normalized like cache keys and a leading article dropped
+    """
+    words = normalize_cache_key(query).split(' ')
+    if len(words) > 1 and words[0] in LEADING_ARTICLES:
+        words = words[1:]
+    return f"{kind}|{' '.join(words)}"
+
+
+class TitleMemo:
+    """
+    Bounded map of search query -> resolved page, kept in memory and optionally in SQLite.
+    Both tiers hold at most `max_entries` queries; the least recently used ones are evicted.
+    Hits only update the SQLite last-use times in batches (with the next write, every
+    TOUCH_BATCH hits, or on close), so a memory hit never waits on the file.
+    """
+    
+    def __init__(self, max_entries: int = 5000, path: Optional[str] = None, max_age: float = DEFAULT_MAX_AGE):
+        """
+        Args:
+            max_entries: Maximum number of remembered queries
+            path: SQLite file for the persistent tier (None keeps the memo in this process)
+            max_age: Seconds after which a remembered page is forgotten and the query resolved again
+                (0 keeps entries until they are evicted)
+        """
+        self.max_entries = max_entries
+        self.path = path
+        self.max_age = max_age
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stats: Counter = Counter()
+        self._touched: Dict[str, float] = {}
+        self._touch_hits = 0
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, creating the database on first use"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS title_memo '
+                '(key TEXT PRIMARY KEY, language TEXT NOT NULL, title TEXT NOT NULL, '
+                'pageid INTEGER, used_at REAL NOT NULL, stored_at REAL)'
+            )
+            columns = {row[1] for row in connection.execute('PRAGMA table_info(title_memo)')}
+            if 'stored_at' not in columns:
+                # Memo files written before entries expired; their rows count as stored when last used
+                connection.execute('ALTER TABLE title_memo ADD COLUMN stored_at REAL')
+            connection.commit()
+            self._local.connection = connection
+        return connection
+    
+    def _record(self, name: str, amount: int = 1):
+        with self._lock:
+            self._stats[name] += amount
+    
+    def _keep(self, key: str, entry: Dict[str, Any]):
+        """Put an entry into the memory tier, evicting the least recently used one when full"""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def _expired(self, entry: Dict[str, Any]) -> bool:
+        """Whether an entry was stored more than max_age seconds ago"""
+        return self.max_age > 0 and time.time() - entry['stored_at'] > self.max_age
+    
+    def _touch(self, key: str) -> bool:
+        """Note a hit for the next batch of last-use updates; True once the batch is full"""
+        with self._lock:
+            self._touched[key] = time.time()
+            self._touch_hits += 1
+            return self._touch_hits >= TOUCH_BATCH
+    
+    def _write_touches(self, connection: sqlite3.Connection):
+        """Write the pending last-use times (the caller commits)"""
+        with self._lock:
+            touched, self._touched = self._touched, {}
+            self._touch_hits = 0
+        if touched:
+            connection.executemany('UPDATE title_memo SET used_at = ? WHERE key = ?',
+                                   [(used_at, key) for key, used_at in touched.items()])
+    
+    def flush(self):
+        """Write the pending last-use times of memo hits to SQLite"""
+        if self.path is None or not self._touched:
+            return
+        try:
+            connection = self._connection()
+            self._write_touches(connection)
+            connection.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Title memo write failed ({self.path}): {e}")
+    
+    def get(self, kind: str, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up the page a search resolved to before and mark it as recently used
+        
+        Args:
+            kind: Lookup type
+            query: User query
+        
+        Returns:
+            Dict with 'language', 'title', 'pageid' and 'stored_at', or None if the query is unknown
+            or its entry is older than max_age (then it is forgotten)
+        """
+        key = memo_key(kind, query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        
+        if entry is None and self.path is not None:
+            try:
+                row = self._connection().execute(
+                    'SELECT language, title, pageid, COALESCE(stored_at, used_at) FROM title_memo WHERE key = ?', (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"Title memo read failed ({self.path}): {e}")
+                row = None
+            if row is not None:
+                entry = {'language': row[0], 'title': row[1], 'pageid': row[2], 'stored_at': row[3]}
+                self._keep(key, entry)
+        
+        if entry is not None and self._expired(entry):
+            self._record('expired')
+            self.forget(kind, query)
+            entry = None
+        
+        if entry is not None and self.path is not None and self._touch(key):
+            self.flush()
+        
+        self._record('hits' if entry is not None else 'misses')
+        return dict(entry) if entry is not None else None
+    
+    def put(self, kind: str, query: str, language: str, title: str, pageid: Optional[int] = None):
+        """
+        Remember the page a search resolved to
+        
+        Args:
+            kind: Lookup type
+            query: User query
+            language: Language code of the page
+            title: Canonical page title
+            pageid: Page id (None if the source did not report one)
+        """
+        key = memo_key(kind, query)
+        stored_at = time.time()
+        self._keep(key, {'language': language, 'title': title, 'pageid': pageid, 'stored_at': stored_at})
+        self._record('stores')
+        if self.path is None:
+            return
+        try:
+            connection = self._connection()
+            self._write_touches(connection)
+            connection.execute(
+                'INSERT OR REPLACE INTO title_memo (key, language, title, pageid, used_at, stored_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (key, language, title, pageid, stored_at, stored_at)
+            )
+            evicted = connection.execute(
+                'DELETE FROM title_memo WHERE key IN '
+                '(SELECT key FROM title_memo ORDER BY used_at DESC LIMIT -1 OFFSET ?)', (self.max_entries,)
+            ).rowcount
+            connection.commit()
+            if evicted > 0:
+                self._record('evictions', evicted)
+        except sqlite3.Error as e:
+            logger.warning(f"Title memo write failed ({self.path}): {e}")
+    
+    def forget(self, kind: str, query: str):
+        """
+        Drop a query whose remembered page no longer answers it
+        
+        Args:
+            kind: Lookup type
+            query: User query
+        """
+        key = memo_key(kind, query)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._touched.pop(key, None)
+        if self.path is None:
+            return
+        try:
+            connection = self._connection()
+            connection.execute('DELETE FROM title_memo WHERE key = ?', (key,))
+            connection.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Title memo write failed ({self.path}): {e}")
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Get memo counters
+        
+        Returns:
+            Counters 'hits', 'misses' (including 'expired' entries), 'stores', 'evictions', 'expired'
+            and current 'entries' in memory
+        """
+        with self._lock:
+            stats = {name: self._stats[name] for name in ('hits', 'misses', 'stores', 'evictions', 'expired')}
+            stats['entries'] = len(self._entries)
+        return stats
+    
+    def reset_stats(self):
+        """Reset the memo counters"""
+        with self._lock:
+            self._stats.clear()
+    
+    def clear(self):
+        """Remove all remembered queries"""
+        with self._lock:
+            self._entries.clear()
+            self._touched.clear()
+        if self.path is None:
+            return
+        try:
+            connection = self._connection()
+            connection.execute('DELETE FROM title_memo')
+            connection.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Title memo clear failed ({self.path}): {e}")
+    
+    def close(self):
+        """Write pending last-use times and close this thread's connection"""
+        self.flush()
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Global instance shared by the sync and async Wikipedia clients
+title_memo = TitleMemo(
+    max_entries=int(os.getenv('WIKIPEDIA_TITLE_MEMO_SIZE', '5000')),
+    path=os.getenv('WIKIPEDIA_TITLE_MEMO_PATH', os.getenv('WIKIPEDIA_CACHE_PATH', '')) or None,
+    max_age=float(os.getenv('WIKIPEDIA_TITLE_MEMO_MAX_AGE', str(DEFAULT_MAX_AGE)))
+) if os.getenv('WIKIPEDIA_TITLE_MEMO_ENABLED', 'true').lower() == 'true' else None
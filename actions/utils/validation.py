@@ -200,3 +200,32 @@ def calculate_artist_relevance(artist_name: str, title: str, extract: str) -> fl
 
     logger.debug(f"Artist relevance for '{artist_name}' | Title: '{title}' | Score: {score} | Extract: {extract[:100]}...")
     return max(0, score) # Ensure score is not negative
+
+def is_artist_content(extract: str, title: str = "") -> bool:
+    """
+    Heuristic check whether a Wikipedia extract describes an artist (used to filter offline dumps)
+    
+    Args:
+        extract: Wikipedia extract text
+        title: Wikipedia page title
+        
+    Returns:
+        True if the opening of the extract names an artistic profession, False otherwise
+    """
+    if not extract or len(extract) < 50:
+        return False
+    
+    extract_lower = extract.lower()
+    title_lower = title.lower() if title else ""
+    
+    # Disambiguation pages never describe a single artist
+    if any(term in extract_lower for term in ['steht für:', 'begriffsklärung', 'disambiguation', 'may refer to']):
+        return False
+    
+    # Profession in the title ("Hans Müller (Maler)") or in the opening sentences
+    profession_terms = [
+        'maler', 'malerin', 'painter', 'bildhauer', 'bildhauerin', 'sculptor',
+        'künstler', 'künstlerin', 'artist', 'zeichner', 'draftsman', 'grafiker', 'graphic artist'
+    ]
+    opening = extract_lower[:300]
+    return any(term in title_lower or term in opening for term in profession_terms)
@@ -1,57 +1,1973 @@
 """
 Wikipedia API client for artwork and artist information retrieval
 """
+import abc
+import contextvars
+import copy
+import dataclasses
+import os
+import threading
+import time
 import requests
 import urllib.parse
-from typing import Dict, Any, List, Tuple
+from collections import Counter, deque
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, Callable, Generator, Iterable, List, Optional, Tuple, Union
 from .logging_config import setup_logger
+from .access_stats import AccessStats, access_stats
+from .deadline import Deadline, cancellable_deadline, current_deadline, deadline_scope, detached_scope
+from .host_health import RETRYABLE_STATUS, HostHealthRegistry, LatencyWindow, jittered_backoff
+from .http_fixtures import TRANSPORTS, FixtureMissing, FixtureStore, RecordingSession, ReplaySession, fixture_store
+from .offline_index import OfflineIndex, offline_index
+from .rate_limiter import TokenBucketLimiter, rate_limiter
+from .section_reader import SECTION_KIND, SECTIONS_KIND, readable_sections, section_text
+from .response_cache import ResponseCache, response_cache
+from .single_flight import SingleFlight
+from .summarizer import sentence_ends
+from .title_memo import TitleMemo, title_memo
 from .mappings import WIKIPEDIA_ARTWORK_MAPPINGS, KNOWN_ARTISTS # Ensure KNOWN_ARTISTS is imported
-from .validation import is_artwork_content, calculate_relevance_score, calculate_artist_relevance
+from .validation import is_artwork_content, is_artist_content, calculate_relevance_score, calculate_artist_relevance
 
 logger = setup_logger(__name__)
 
-class WikipediaClient:
-    """Client for interacting with Wikipedia API"""
+USER_AGENT = "MuseumChatBot/2.0 (Rasa action server; python-requests)"
+
+# How candidate titles are resolved: one summary request per variant, one batched
+# action=query request per language for all variants, or one full-text search per
+# language returning the top-ranked candidates with their extracts
+RESOLUTION_MODES = ('variants', 'batch', 'search')
+
+# Where pages come from: the live Wikipedia APIs or a local index built from a dump
+# (see offline_index.py). The offline backend always resolves titles like 'batch' mode.
+BACKENDS = ('wikipedia', 'offline')
+
+# MediaWiki accepts at most 50 titles per query for regular clients
+MAX_TITLES_PER_QUERY = 50
+
+# Upper bounds of the TextExtracts exsentences/exchars parameters
+MAX_EXTRACT_SENTENCES = 10
+MAX_EXTRACT_CHARS = 1200
+
+# Lookup kind of complete intro extracts fetched for "tell me more" follow-ups
+FULL_EXTRACT_KIND = 'extract'
+
+# Cache kind of the title a page has on the other language's Wikipedia
+LANGLINK_KIND = 'langlink'
+
+# Negative cache reasons that make a probe pointless: any artwork probe is skipped for titles
+# that are missing or known not to be artwork pages, artist probes only for missing titles
+ARTWORK_NEGATIVE_REASONS = ('missing', 'not_artwork')
+ARTIST_NEGATIVE_REASONS = ('missing',)
+
+
+# A German artist pass scoring at least this much is accepted without asking English Wikipedia
+ARTIST_ACCEPT_SCORE = 60
+
+# Threads refreshing expired cache entries in the background (stale-while-revalidate);
+# kept apart from the probe pool so refreshes never delay visitor lookups
+REFRESH_WORKERS = 2
+
+# German pass durations needed before hedging starts using their p95
+HEDGE_MIN_SAMPLES = 20
+
+
+class PageNotFound(dict):
+    """Empty (falsy) response returned for HTTP 404, so callers can tell missing pages from errors"""
+
+
+class ResolvedPages:
+    """
+    Pages resolved so far within one search. Many title variants redirect to the same page
+    ("Picasso", "Pablo Picasso", "Pablo Picasso (Maler)"): a variant that names an already
+    resolved page is not requested again, and a duplicate page is neither scored nor detailed twice.
+    """
+    
+    def __init__(self):
+        self._pages: set = set()
+        self._titles: set = set()
+        self._lock = threading.Lock()
+        self.requests_saved = 0
+        self.duplicates = 0
+    
+    @staticmethod
+    def _title_key(lang: str, title: str) -> Tuple[str, str]:
+        """Language and title as Wikipedia normalizes it (spaces, first letter upper case)"""
+        title = title.replace('_', ' ').strip()
+        return lang, title[:1].upper() + title[1:]
+    
+    def resolved_title(self, lang: str, title: str) -> bool:
+        """
+        Check whether a title is the canonical title of a page this search already resolved
+        
+        Returns:
+            True if the probe can be skipped (counted in requests_saved)
+        """
+        with self._lock:
+            if self._title_key(lang, title) in self._titles:
+                self.requests_saved += 1
+                return True
+        return False
+    
+    def duplicate(self, lang: str, data: Dict[str, Any]) -> bool:
+        """
+        Record a resolved page
+        
+        Args:
+            lang: Language code (page ids are per wiki)
+            data: Page data with 'pageid' (falls back to the title) and 'title'
+        
+        Returns:
+            True if this search has seen the page before (counted in duplicates)
+        """
+        title_key = self._title_key(lang, data.get('title', ''))
+        page_key = (lang, data['pageid']) if data.get('pageid') else title_key
+        with self._lock:
+            self._titles.add(title_key)
+            if page_key in self._pages:
+                self.duplicates += 1
+                return True
+            self._pages.add(page_key)
+        return False
+
+
+class ArtworkSelection:
+    """Keeps track of the best artwork page while probe results are fed in probe order"""
+    
+    # Scores above this are a perfect match that ends the search
+    PERFECT_SCORE = 85
+    
+    def __init__(self, query: str):
+        self.query = query
+        self.best_result: Optional[Dict[str, Any]] = None
+        self.best_score = 0
+        self.perfect_match: Optional[Dict[str, Any]] = None
+    
+    def add(self, data: Optional[Dict[str, Any]], score: float, lang: str) -> bool:
+        """
+        Add one probe result
+        
+        Args:
+            data: Page data or None if the probe missed
+            score: Relevance score of the page
+            lang: Language code of the page
+        
+        Returns:
+            True if the search can stop because a perfect match was found
+        """
+        if not data:
+            return False
+        
+        if score > self.best_score:
+            self.best_score = score
+            self.best_result = data
+            self.best_result['language'] = lang
+        
+        # Very high score = perfect match
+        if self.is_perfect(data, score):
+            logger.info(f"High-score match: {data.get('title', '')} (score: {score})")
+            self.perfect_match = data # Return data directly, not best_result
+            return True
+        return False
+    
+    def is_perfect(self, data: Optional[Dict[str, Any]], score: float) -> bool:
+        """Whether a probe result would end the search as a perfect match"""
+        return bool(data) and score > self.PERFECT_SCORE
+    
+    def result(self) -> Dict[str, Any]:
+        """Get the selected page or empty dict"""
+        if self.perfect_match:
+            return self.perfect_match
+        
+        if self.best_result:
+            logger.info(f"Best Wikipedia result: {self.best_result.get('title')} (score: {self.best_score})")
+        else:
+            logger.warning(f"No valid artwork found on Wikipedia for: {self.query}")
+        
+        return self.best_result or {}
+
+
+# Lookups are written once, in WikipediaClientBase, as generator "steps": a step yields the
+# operations below whenever it needs I/O and the client's driver (_run) sends back the outcome.
+# WikipediaClient performs them with blocking calls and threads, AsyncWikipediaClient with
+# coroutines and tasks. A step that fails or is cancelled gets the exception thrown in at its
+# yield, so its finally blocks run in both clients.
+Step = Generator[Any, Any, Any]
+
+
+class RequestFailed(Exception):
+    """Transport error or timeout of a Send, thrown into the step that yielded it"""
+
+
+class Send:
+    """Step operation: one GET request. Answered with (HTTP status, decoded JSON body or None)"""
+    
+    def __init__(self, url: str, params: Optional[Dict[str, Any]], timeout: float):
+        self.url = url
+        self.params = params
+        self.timeout = timeout
+
+
+class Sleep:
+    """Step operation: wait before the next request"""
+    
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+
+class Start:
+    """Step operation: run another step concurrently. Answered with its Handle"""
+    
+    def __init__(self, step: Step, deadline: Optional[Deadline] = None):
+        self.step = step
+        self.deadline = deadline
+
+
+class Wait:
+    """Step operation: wait for started steps. Answered with the set of finished handles"""
+    
+    def __init__(self, handles: Iterable['Handle'], timeout: Optional[float] = None, first: bool = False):
+        self.handles = list(handles)
+        self.timeout = timeout
+        self.first = first
+
+
+class Cancel:
+    """Step operation: cancel started steps that have not finished (their deadlines end, no further requests)"""
+    
+    def __init__(self, *handles: 'Handle'):
+        self.handles = handles
+
+
+class Shared:
+    """Step operation: run a step once for all concurrent callers with the same key. Answered with (result, joined)"""
+    
+    def __init__(self, key: str, step: Step):
+        self.key = key
+        self.step = step
+
+
+class Background:
+    """Step operation: run a step in the background, without the caller's lookup deadline"""
+    
+    def __init__(self, step: Step):
+        self.step = step
+
+
+class Blocking:
+    """Step operation: a call that may block on disk (SQLite). Answered with its return value;
+    the async client runs it in a worker thread so the event loop keeps going"""
+    
+    def __init__(self, function: Callable[..., Any], *args: Any):
+        self.function = function
+        self.args = args
+
+
+class Handle:
+    """A started step: wraps the Future (sync client) or Task (async client) running it"""
+    
+    def __init__(self, future: Any, deadline: Optional[Deadline] = None):
+        self.future = future
+        self.deadline = deadline
+    
+    def done(self) -> bool:
+        return self.future.done()
+    
+    def succeeded(self) -> bool:
+        """Whether the step finished without an error and was not cancelled"""
+        return self.future.done() and not self.future.cancelled() and self.future.exception() is None
+    
+    def result(self) -> Any:
+        """Result of the finished step (raises what the step raised)"""
+        return self.future.result()
+    
+    def cancel(self):
+        if self.future.done():
+            return
+        if self.deadline is not None:
+            self.deadline.cancel()
+        self.future.cancel()
+
+
+def base_urls_from_template(template: str, languages: Iterable[str] = ('de', 'en')) -> Optional[Dict[str, str]]:
+    """
+    Build base URLs from a template, e.g. to point the clients at scripts/wikipedia_standin.py
+    
+    Args:
+        template: URL with a {lang} placeholder such as http://127.0.0.1:8765/{lang} (empty for Wikipedia)
+        languages: Language codes
+    
+    Returns:
+        Language code -> base URL, or None for the default Wikipedia hosts
+    """
+    if not template:
+        return None
+    return {lang: template.format(lang=lang).rstrip('/') for lang in languages}
+
+
+@dataclasses.dataclass
+class ClientConfig:
+    """
+    Options of the sync and async Wikipedia clients. Both take a ClientConfig, keyword overrides of
+    its fields, or both; the global instances are built from ClientConfig.from_env().
+    
+    Attributes:
+        timeout: Timeout in seconds for a single HTTP call
+        pool_size: Maximum number of pooled connections kept per Wikipedia host
+        keep_alive: Reuse TCP/TLS connections between lookups (sync client; aiohttp always pools)
+        base_urls: Language code -> base URL (defaults to de/en.wikipedia.org)
+        verify: TLS verification flag or CA bundle path
+        concurrent_probes: Fire each language's artwork variant probes at once instead of one after another
+        max_workers: Size of the thread pool used for concurrent probes (sync client; the async one uses tasks)
+        probe_deadline: Seconds to wait for concurrent probes (defaults to timeout)
+        resolution: Default candidate resolution mode, one of RESOLUTION_MODES
+        search_top_k: Number of ranked search hits fetched in 'search' resolution mode
+        cache: Response cache for summaries and search results (None disables caching); its SQLite
+            tier is read and written through Blocking, in worker threads for the async client
+        backend: Page source, one of BACKENDS
+        offline_index: Index answering all lookups when backend is 'offline'
+        max_retries: Retries of a failed request (errors, timeouts, 429/5xx) with jittered backoff
+        retry_backoff: Backoff of the first retry in seconds (doubles per retry, full jitter)
+        breaker_threshold: Consecutive failures that open a host's circuit breaker
+        breaker_reset: Seconds an open circuit rejects requests before a trial request
+        hedging: Start the English artist pass when the German one exceeds its observed p95
+        rate_limiter: Per-host token buckets shared with other worker processes (None disables rate limiting)
+        transport: HTTP transport, one of TRANSPORTS ('record'/'replay' need fixtures)
+        fixtures: Recorded responses written in record and answered from in replay mode
+        parallel_languages: Run the German and English artist passes concurrently (German still wins once it clears the threshold)
+        extract_sentences: Sentences of the intro extract requested (exsentences) and cached; 0 keeps the whole intro
+        extract_chars: Characters of the intro extract requested (exchars) and cached; 0 for no limit
+        title_memo: Learned query -> canonical page memo letting repeated searches skip resolution (None disables it)
+        access_stats: Decaying per-lookup access counts read by the refresh scheduler (None disables tracking)
+    """
+    timeout: int = 10
+    pool_size: int = 10
+    keep_alive: bool = True
+    base_urls: Optional[Dict[str, str]] = None
+    verify: Union[bool, str] = True
+    concurrent_probes: bool = False
+    max_workers: int = 8
+    probe_deadline: Optional[float] = None
+    resolution: str = 'variants'
+    search_top_k: int = 5
+    cache: Optional[ResponseCache] = None
+    backend: str = 'wikipedia'
+    offline_index: Optional[OfflineIndex] = None
+    max_retries: int = 2
+    retry_backoff: float = 0.2
+    breaker_threshold: int = 5
+    breaker_reset: float = 30.0
+    hedging: bool = False
+    rate_limiter: Optional[TokenBucketLimiter] = None
+    transport: str = 'live'
+    fixtures: Optional[FixtureStore] = None
+    parallel_languages: bool = False
+    extract_sentences: int = 0
+    extract_chars: int = 0
+    title_memo: Optional[TitleMemo] = None
+    access_stats: Optional[AccessStats] = None
+    
+    @classmethod
+    def from_env(cls, **overrides: Any) -> 'ClientConfig':
+        """
+        Read the options from the WIKIPEDIA_* environment variables, with the shared cache,
+        offline index, rate limiter, fixture store, title memo and access stats
+        
+        Args:
+            **overrides: Fields taking precedence over the environment
+        
+        Returns:
+            ClientConfig
+        """
+        backend = os.getenv('WIKIPEDIA_BACKEND', 'wikipedia')
+        if backend == 'offline' and offline_index is None:
+            # The index could not be opened (logged by open_offline_index): serve from live Wikipedia
+            backend = 'wikipedia'
+        options = dict(
+            timeout=int(os.getenv('WIKIPEDIA_TIMEOUT', '10')),
+            pool_size=int(os.getenv('WIKIPEDIA_POOL_SIZE', '10')),
+            keep_alive=os.getenv('WIKIPEDIA_KEEP_ALIVE', 'true').lower() == 'true',
+            base_urls=base_urls_from_template(os.getenv('WIKIPEDIA_BASE_URL', '')),
+            concurrent_probes=os.getenv('WIKIPEDIA_CONCURRENT_PROBES', 'false').lower() == 'true',
+            max_workers=int(os.getenv('WIKIPEDIA_MAX_WORKERS', '8')),
+            resolution=os.getenv('WIKIPEDIA_RESOLUTION', 'variants'),
+            search_top_k=int(os.getenv('WIKIPEDIA_SEARCH_TOP_K', '5')),
+            cache=response_cache,
+            backend=backend,
+            offline_index=offline_index,
+            max_retries=int(os.getenv('WIKIPEDIA_MAX_RETRIES', '2')),
+            retry_backoff=float(os.getenv('WIKIPEDIA_RETRY_BACKOFF', '0.2')),
+            breaker_threshold=int(os.getenv('WIKIPEDIA_BREAKER_THRESHOLD', '5')),
+            breaker_reset=float(os.getenv('WIKIPEDIA_BREAKER_RESET', '30')),
+            hedging=os.getenv('WIKIPEDIA_HEDGING', 'false').lower() == 'true',
+            rate_limiter=rate_limiter,
+            transport=os.getenv('WIKIPEDIA_TRANSPORT', 'live'),
+            fixtures=fixture_store,
+            parallel_languages=os.getenv('WIKIPEDIA_PARALLEL_LANGUAGES', 'false').lower() == 'true',
+            extract_sentences=int(os.getenv('WIKIPEDIA_EXTRACT_SENTENCES', '0')),
+            extract_chars=int(os.getenv('WIKIPEDIA_EXTRACT_CHARS', '0')),
+            title_memo=title_memo,
+            access_stats=access_stats
+        )
+        options.update(overrides)
+        return cls(**options)
+
+
+class WikipediaClientBase(abc.ABC):
+    """
+    Configuration, scoring and the lookup steps shared by the sync and async Wikipedia clients.
+    Subclasses only implement the I/O: _run drives a step and performs the operations it yields.
+    """
+    
+    def __init__(self, config: Optional[ClientConfig] = None, **options: Any):
+        """
+        Args:
+            config: Client options, see ClientConfig (defaults to ClientConfig())
+            **options: ClientConfig fields overriding those of config
+        
+        Raises:
+            TypeError: If an option is not a ClientConfig field
+            ValueError: If the backend or transport is unknown, or 'offline'/'record'/'replay'
+                is selected without an index or fixtures
+        """
+        config = dataclasses.replace(config or ClientConfig(), **options)
+        if config.backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{config.backend}', expected one of {BACKENDS}")
+        if config.backend == 'offline' and config.offline_index is None:
+            raise ValueError("The offline backend needs an offline_index")
+        if config.transport not in TRANSPORTS:
+            raise ValueError(f"Unknown transport '{config.transport}', expected one of {TRANSPORTS}")
+        if config.transport != 'live' and config.fixtures is None:
+            raise ValueError(f"The {config.transport} transport needs a fixture store")
+        self.config = config
+        self.backend = config.backend
+        self.offline_index = config.offline_index
+        self.max_retries = config.max_retries
+        self.retry_backoff = config.retry_backoff
+        self.hedging = config.hedging
+        self.parallel_languages = config.parallel_languages
+        self.extract_sentences = config.extract_sentences
+        self.extract_chars = config.extract_chars
+        self.title_memo = config.title_memo
+        self.access_stats = config.access_stats
+        self.rate_limiter = config.rate_limiter
+        self.transport = config.transport
+        self.fixtures = config.fixtures
+        self.health = HostHealthRegistry(config.breaker_threshold, config.breaker_reset)
+        self._pass_latency = {'de': LatencyWindow(), 'en': LatencyWindow()}
+        self._staleness = LatencyWindow()
+        # SQLite writes of the response cache waiting for _flush_cache_writes (memory has them already)
+        self._cache_writes: deque = deque()
+        self._refreshing: set = set()
+        self._refreshing_lock = threading.Lock()
+        self.timeout = config.timeout
+        self.pool_size = config.pool_size
+        self.verify = config.verify
+        self.concurrent_probes = config.concurrent_probes
+        self.probe_deadline = config.probe_deadline if config.probe_deadline is not None else config.timeout
+        self.resolution = config.resolution
+        self._resolve_mode(config.resolution)
+        self.search_top_k = config.search_top_k
+        self.cache = config.cache
+        self._metrics: Counter = Counter()
+        self._metrics_lock = threading.Lock()
+        self.base_urls = config.base_urls or {
+            'de': 'https://de.wikipedia.org',
+            'en': 'https://en.wikipedia.org'
+        }
+    
+    def _count(self, name: str, amount: int = 1):
+        """Increment a client metric"""
+        with self._metrics_lock:
+            self._metrics[name] += amount
+    
+    def get_metrics(self) -> Dict[str, int]:
+        """
+        Get client metrics
+        
+        Returns:
+            Metric name -> count (e.g. 'http_requests', 'cache_memory_hits', 'cache_misses').
+            After stale-while-revalidate answers, 'staleness_p50_s' and 'staleness_max_s' give
+            how many seconds past their TTL the recently served entries were.
+        """
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+        if len(self._staleness):
+            metrics['staleness_p50_s'] = round(self._staleness.percentile(50))
+            metrics['staleness_max_s'] = round(self._staleness.percentile(100))
+        if self.cache is not None:
+            metrics.update({f'cache_{name}': count for name, count in self.cache.stats().items()})
+        if self.title_memo is not None:
+            metrics.update({f'memo_{name}': count for name, count in self.title_memo.stats().items()})
+        return metrics
+    
+    def reset_metrics(self):
+        """Reset all client metrics to zero"""
+        with self._metrics_lock:
+            self._metrics.clear()
+        self._staleness = LatencyWindow()
+        if self.cache is not None:
+            self.cache.reset_stats()
+        if self.title_memo is not None:
+            self.title_memo.reset_stats()
+    
+    def _cached(self, kind: str, language: str, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a previous lookup result in the response cache
+        
+        Args:
+            kind: Lookup type ('artwork', 'artist' or 'summary')
+            language: Language code (searches always start on German Wikipedia and use 'de')
+            query: Title or query text
+        
+        Returns:
+            Cached result or None
+        """
+        if self.access_stats is not None:
+            self.access_stats.record(kind, language, query)
+        if self.cache is None:
+            return None
+        cached = self.cache.get_memory(kind, language, query)
+        if cached is None:
+            cached = yield from self._blocking(self._cache_on_disk(), self.cache.get, kind, language, query)
+        return cached
+    
+    def _cache_on_disk(self) -> bool:
+        """Whether the response cache has a SQLite tier, whose reads and writes go through Blocking"""
+        return self.cache is not None and self.cache.disk is not None
+    
+    def _cache_set(self, kind: str, language: str, query: str, value: Any):
+        """Store a value in the cache's memory tier now and queue its SQLite write for _flush_cache_writes"""
+        self.cache.set(kind, language, query, value, disk=False)
+        if self._cache_on_disk():
+            self._cache_writes.append((self.cache.set_disk, (kind, language, query, copy.deepcopy(value))))
+    
+    def _flush_cache_writes(self) -> Step:
+        """Step: write the queued SQLite writes of the response cache (one Blocking operation for all of them)"""
+        writes = []
+        while self._cache_writes:
+            try:
+                writes.append(self._cache_writes.popleft())
+            except IndexError:
+                break
+        if writes:
+            yield from self._blocking(True, self._write_all, writes)
+    
+    @staticmethod
+    def _write_all(writes: List[Tuple[Callable[..., Any], Tuple[Any, ...]]]):
+        for function, args in writes:
+            function(*args)
+    
+    def _remember(self, kind: str, language: str, query: str, result: Dict[str, Any]) -> Step:
+        """
+        Step: trim a lookup result's extract and store it in the response cache if it is non-empty
+        (unless the lookup ran out of time), together with the SQLite writes queued during the lookup
+        
+        Returns:
+            The result as it is served, i.e. trimmed like the cached copy
+        """
+        if kind != FULL_EXTRACT_KIND:
+            result = self._trimmed(result)
+        deadline = current_deadline()
+        if deadline is not None and deadline.expired():
+            # Best result so far, possibly not the best one; let the next lookup try again
+            self._count('deadline_exceeded')
+        elif self.cache is not None and result:
+            self._cache_set(kind, language, query, result)
+        yield from self._flush_cache_writes()
+        return result
+    
+    def _extract_limit_params(self) -> Dict[str, int]:
+        """TextExtracts parameters limiting intro extracts to the configured length"""
+        if self.extract_sentences > 0:
+            return {'exsentences': min(self.extract_sentences, MAX_EXTRACT_SENTENCES)}
+        if self.extract_chars > 0:
+            return {'exchars': min(self.extract_chars, MAX_EXTRACT_CHARS)}
+        return {}
+    
+    def _trim_extract(self, extract: str) -> str:
+        """
+        Cut an extract to the configured number of sentences and characters, at a sentence end if possible
+        
+        Args:
+            extract: Plain-text extract
+        
+        Returns:
+            Trimmed extract (unchanged if no limit applies)
+        """
+        if self.extract_sentences > 0:
+            ends = sentence_ends(extract)
+            if len(ends) >= self.extract_sentences:
+                extract = extract[:ends[self.extract_sentences - 1]]
+        if self.extract_chars > 0 and len(extract) > self.extract_chars:
+            cut = max((end for end in sentence_ends(extract) if end <= self.extract_chars), default=0)
+            extract = extract[:cut] if cut > 0 else extract[:self.extract_chars]
+        return extract
+    
+    def _trimmed(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Trim the extract of a lookup result (REST summaries and offline pages are not limited at the source)
+        
+        Returns:
+            The result, or a copy with the shorter extract and 'extract_trimmed' set
+        """
+        extract = result.get('extract') if result else None
+        if not extract:
+            return result
+        trimmed = self._trim_extract(extract)
+        if len(trimmed) == len(extract):
+            return result
+        self._count('extract_chars_trimmed', len(extract) - len(trimmed))
+        result = dict(result)
+        result['extract'] = trimmed
+        result['extract_trimmed'] = True
+        return result
+    
+    def _request_timeout(self) -> Optional[float]:
+        """
+        Timeout for the next HTTP call of the running lookup
+        
+        Returns:
+            The configured timeout shrunk to the remaining lookup budget, or None if the budget is spent
+        """
+        deadline = current_deadline()
+        if deadline is None:
+            return self.timeout
+        timeout = deadline.clamp(self.timeout)
+        return timeout if timeout > 0 else None
+    
+    def _blocking(self, on_disk: bool, function: Callable[..., Any], *args: Any) -> Step:
+        """Step: call a function, through a Blocking operation if it touches disk"""
+        if on_disk:
+            return (yield Blocking(function, *args))
+        return function(*args)
+    
+    def _rate_limit_wait(self, url: str) -> Step:
+        """
+        Step: take a rate limiter token for a request
+        
+        Args:
+            url: Request URL (its host selects the bucket)
+        
+        Returns:
+            Seconds to wait before sending, or None if the request has to be dropped because
+            the queue for the host is longer than the limiter's (and the lookup's) time budget
+        """
+        if self.rate_limiter is None or self.transport == 'replay':
+            # Replayed requests never reach Wikipedia
+            return 0.0
+        deadline = current_deadline()
+        wait = yield from self._blocking(self.rate_limiter.path is not None, self.rate_limiter.reserve,
+                                         urllib.parse.urlsplit(url).netloc,
+                                         deadline.remaining() if deadline is not None else None)
+        if wait is None:
+            self._count('rate_limited')
+        elif wait > 0:
+            self._count('rate_limit_waits')
+        return wait
+    
+    def _throttled(self, language: str) -> Step:
+        """Step: whether requests to a language's Wikipedia would have to queue for the rate limiter right now"""
+        if self.rate_limiter is None or self.transport == 'replay':
+            return False
+        return (yield from self._blocking(self.rate_limiter.path is not None, self.rate_limiter.saturated,
+                                          urllib.parse.urlsplit(self.base_urls[language]).netloc))
+    
+    def _cached_stale(self, kind: str, language: str, query: str) -> Step:
+        """
+        Step: look up an expired but still usable lookup result, for when Wikipedia cannot be asked
+        
+        Returns:
+            Cached result or None
+        """
+        if self.cache is None:
+            return None
+        stale = yield from self._blocking(self._cache_on_disk(), self.cache.get_stale, kind, language, query)
+        if stale:
+            self._count('stale_served')
+            return stale
+        return None
+    
+    def _cached_in_grace(self, kind: str, language: str, query: str) -> Step:
+        """
+        Step: look up a recently expired lookup result that is served while it is refreshed in the background
+        
+        Returns:
+            Cached result or None (counted as 'stale_while_revalidate', age tracked for the staleness metrics)
+        """
+        if self.cache is None:
+            return None
+        entry = yield from self._blocking(self._cache_on_disk(), self.cache.get_grace, kind, language, query)
+        if entry is None:
+            return None
+        value, staleness = entry
+        self._count('stale_while_revalidate')
+        self._staleness.add(staleness)
+        return value
+    
+    def _claim_refresh(self, kind: str, language: str, query: str) -> Optional[str]:
+        """
+        Reserve the background refresh of a lookup, so each expired entry is refreshed only once at a time
+        
+        Returns:
+            Cache key to release after the refresh, or None if a refresh is already scheduled
+        """
+        key = ResponseCache.make_key(kind, language, query)
+        with self._refreshing_lock:
+            if key in self._refreshing:
+                return None
+            self._refreshing.add(key)
+        return key
+    
+    def _release_refresh(self, key: str, result: Optional[Dict[str, Any]]):
+        """Finish a background refresh and count its outcome"""
+        with self._refreshing_lock:
+            self._refreshing.discard(key)
+        self._count('background_refreshes' if result else 'background_refresh_failures')
+    
+    def _retry_delay(self, attempt: int) -> float:
+        """Jittered backoff before a retry, never sleeping past the lookup deadline"""
+        delay = jittered_backoff(attempt, self.retry_backoff)
+        deadline = current_deadline()
+        return deadline.clamp(delay) if deadline is not None else delay
+    
+    def get_host_health(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get circuit breaker state and latency of every Wikipedia host used so far
+        
+        Returns:
+            Host name -> {'state', 'consecutive_failures', 'opened_count', 'samples', 'p95_ms'}
+        """
+        return self.health.snapshot()
+    
+    def _english_head_start(self) -> Optional[float]:
+        """
+        Seconds the German artist pass runs alone before a parallel English pass is started
+        
+        Returns:
+            Observed p95 of German pass durations, until there are enough of them the p95 of single
+            German requests (the pass's first probe), or None without any history - then the English
+            pass only starts once the German one has finished unaccepted
+        """
+        head_start = self._pass_latency['de'].percentile(95, min_samples=HEDGE_MIN_SAMPLES)
+        if head_start is None:
+            head_start = self.health.for_url(self._api_url('de')).latency.percentile(95)
+        return head_start
+    
+    def _hedge_delay(self) -> Optional[float]:
+        """
+        Seconds to wait for the German artist pass before hedging with the English one
+        
+        Returns:
+            Observed p95 of German pass durations, or None if hedging is off or history is too short
+        """
+        if not self.hedging:
+            return None
+        return self._pass_latency['de'].percentile(95, min_samples=HEDGE_MIN_SAMPLES)
+    
+    def _artist_pass_accepted(self, best_result: Optional[Dict[str, Any]], best_score: float, confident: bool) -> bool:
+        """Whether an artist pass result is good enough to skip the other language"""
+        return confident or (bool(best_result) and best_score >= ARTIST_ACCEPT_SCORE)
+    
+    def _combine_artist_passes(self, german: Tuple[Optional[Dict[str, Any]], float, bool],
+                               english: Tuple[Optional[Dict[str, Any]], float, bool]) -> Tuple[Optional[Dict[str, Any]], float]:
+        """Pick the better of independently run German and English passes (German wins ties)"""
+        if english[0] and english[1] > german[1]:
+            return english[0], english[1]
+        return german[0], german[1]
+    
+    def _known_negative(self, lang: str, title: str, reasons: Tuple[str, ...]) -> Step:
+        """
+        Step: check whether a probe can be skipped because of a cached negative result
+        
+        Args:
+            lang: Language code
+            title: Title that would be requested
+            reasons: Negative reasons that make the probe pointless
+        
+        Returns:
+            True if the probe should be skipped (counted as 'probes_avoided')
+        """
+        if self.cache is None or not reasons:
+            return False
+        reason = self.cache.get_negative(lang, title, disk=False)
+        if reason is None:
+            reason = yield from self._blocking(self._cache_on_disk(), self.cache.get_negative, lang, title)
+        if reason in reasons:
+            self._count('probes_avoided')
+            return True
+        return False
+    
+    def _remember_negative(self, lang: str, title: str, reason: str):
+        """Store a negative probe result ('missing' or 'not_artwork'); the SQLite write is queued"""
+        if self.cache is not None:
+            self.cache.set_negative(lang, title, reason, disk=False)
+            if self._cache_on_disk():
+                self._cache_writes.append((self.cache.set_negative_disk, (lang, title, reason)))
+    
+    def _memo_usable(self) -> bool:
+        """Whether searches go through the title memo (never for the offline backend, which resolves locally)"""
+        return self.title_memo is not None and self.backend != 'offline'
+    
+    def _memorize(self, kind: str, query: str, result: Dict[str, Any]) -> Step:
+        """Step: remember the page a successful search resolved to"""
+        if self._memo_usable() and result and result.get('title') and result.get('language'):
+            yield from self._blocking(self.title_memo.path is not None, self.title_memo.put,
+                                      kind, query, result['language'], result['title'], result.get('pageid'))
+    
+    def _memo_query_params(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the detail query of a memo entry's page, by pageid if the memo knows it (renames keep it)"""
+        params = self._detail_query_params(entry['title'], lang=entry['language'])
+        if entry.get('pageid'):
+            del params['titles']
+            params['pageids'] = entry['pageid']
+        return params
+    
+    def _memo_result(self, kind: str, entry: Dict[str, Any], data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Shape the page fetched for a memo entry and check that it still answers the search
+        
+        Args:
+            kind: Lookup type ('artwork' or 'artist')
+            entry: Memo entry with 'language', 'title' and 'pageid'
+            data: Action API detail response (formatversion=2)
+        
+        Returns:
+            Summary-shaped page data, or empty dict if the page is gone or no longer an artwork/artist page
+        """
+        page = self._merge_detailed_content({}, data, entry['title'], entry['language'])
+        if not page:
+            return {}
+        if entry.get('pageid'):
+            # Fetched by id: the page the search accepted when it was remembered, whatever its extract
+            # looks like to the content heuristics now
+            return page
+        is_valid = is_artwork_content if kind == 'artwork' else is_artist_content
+        if not is_valid(page.get('extract', ''), page.get('title', '')):
+            return {}
+        return page
+    
+    def _report_duplicates(self, query: str, pages: ResolvedPages):
+        """Count and log the requests and duplicate pages one search skipped"""
+        if not pages.requests_saved and not pages.duplicates:
+            return
+        self._count('dedup_requests_saved', pages.requests_saved)
+        self._count('dedup_pages_skipped', pages.duplicates)
+        logger.info(f"Search '{query}': {pages.requests_saved} requests saved, "
+                    f"{pages.duplicates} duplicate pages skipped")
+    
+    def _other_language(self, lang: str) -> Optional[str]:
+        """The language a lookup falls back to from lang (de <-> en), or None without exactly one"""
+        others = [other for other in self.base_urls if other != lang]
+        return others[0] if len(others) == 1 and lang in self.base_urls else None
+    
+    def _remember_langlinks(self, lang: str, title: str, links: Dict[str, str]):
+        """
+        Store the title a page has on the other language's Wikipedia, in both directions
+        
+        Args:
+            lang: Language code of the page
+            title: Page title
+            links: Language code -> title of the same page there (empty if there is none)
+        """
+        other = self._other_language(lang)
+        if self.cache is None or not other or not title:
+            return
+        self._cache_set(LANGLINK_KIND, lang, title, {other: links.get(other)})
+        if links.get(other):
+            self._cache_set(LANGLINK_KIND, other, links[other], {lang: title})
+    
+    def _known_langlinks(self, page: Dict[str, Any]) -> Step:
+        """
+        Step: get a page's other-language titles without a request
+        
+        Args:
+            page: Summary-shaped page data with 'title' and 'language'
+        
+        Returns:
+            Language code -> title (None where no equivalent exists), or None if not known yet
+        """
+        if 'langlinks' in page:
+            return page['langlinks']
+        if self.cache is None:
+            return None
+        links = self.cache.get_memory(LANGLINK_KIND, page['language'], page['title'])
+        if links is None:
+            links = yield from self._blocking(self._cache_on_disk(), self.cache.get,
+                                              LANGLINK_KIND, page['language'], page['title'])
+        return links
+    
+    def _langlink_query_params(self, title: str, lang: str) -> Dict[str, Any]:
+        """
+        Build action API parameters asking only for a page's title on the other language's Wikipedia
+        
+        Args:
+            title: Page title
+            lang: Language code of the page
+        
+        Returns:
+            Query parameters using prop=langlinks
+        """
+        return {
+            'action': 'query',
+            'format': 'json',
+            'formatversion': 2,
+            'titles': title,
+            'redirects': 1,
+            'prop': 'langlinks',
+            'lllang': self._other_language(lang),
+            'lllimit': 'max'
+        }
+    
+    def _langlinks_from_response(self, title: str, data: Dict[str, Any], lang: str) -> Optional[Dict[str, str]]:
+        """
+        Read and remember the langlinks of a prop=langlinks response
+        
+        Args:
+            title: Requested page title
+            data: Action API response (may be empty)
+            lang: Language code of the page
+        
+        Returns:
+            Language code -> title (empty if the page has no equivalent), or None if the request failed
+        """
+        pages = [page for page in (data or {}).get('query', {}).get('pages', [])
+                 if not page.get('missing') and not page.get('invalid')]
+        if not pages:
+            return None
+        links = {link['lang']: link['title'] for link in pages[0].get('langlinks', [])}
+        self._remember_langlinks(lang, title, links)
+        return links
+    
+    def _langlink_candidate(self, page: Optional[Dict[str, Any]], target_lang: str) -> bool:
+        """Whether a fallback to target_lang can use the equivalent of page instead of a full sweep"""
+        return (bool(page) and bool(page.get('title')) and page.get('language') not in (None, target_lang)
+                and self.backend != 'offline' and self._other_language(page['language']) == target_lang)
+    
+    def _resolve_mode(self, resolution: Optional[str]) -> str:
+        """
+        Get the resolution mode for a search
+        
+        Args:
+            resolution: Requested mode or None for the client default
+        
+        Returns:
+            Validated resolution mode
+        """
+        mode = resolution or self.resolution
+        if self.backend == 'offline':
+            return 'batch'
+        if mode not in RESOLUTION_MODES:
+            raise ValueError(f"Unknown resolution mode '{mode}', expected one of {RESOLUTION_MODES}")
+        return mode
+    
+    def _summary_url(self, title: str, lang: str) -> str:
+        """Build the REST summary URL for a page title"""
+        return f"{self.base_urls[lang]}/api/rest_v1/page/summary/{urllib.parse.quote(title)}"
+    
+    def _api_url(self, lang: str) -> str:
+        """Build the action API URL for a language"""
+        return f"{self.base_urls[lang]}/w/api.php"
+    
+    def _build_artwork_variants(self, query: str) -> List[str]:
+        """
+        Build the title variants probed for an artwork
+        
+        Args:
+            query: Artwork name
+        
+        Returns:
+            Title variants in probe order
+        """
+        return [
+            query.replace(' ', '_'),
+            f"{query.replace(' ', '_')}_(painting)",
+            f"{query.replace(' ', '_')}_(artwork)",
+            f"{query.replace(' ', '_')}_(Gemälde)"
+        ]
+    
+    def _build_artist_variants(self, artist_name: str) -> Tuple[str, List[str]]:
+        """
+        Build the title variants probed for an artist
+        
+        Args:
+            artist_name: Name of the artist to search for
+        
+        Returns:
+            Tuple of (effective base name, de-duplicated variants in probe order)
+        """
+        effective_base_name = KNOWN_ARTISTS.get(artist_name.lower(), artist_name)
+        
+        if effective_base_name.lower() != artist_name.lower():
+            logger.info(f"Original search term '{artist_name}' will use base '{effective_base_name}' for generating variants due to KNOWN_ARTISTS mapping.")
+        else:
+            logger.info(f"Effective base name for search variants is '{effective_base_name}'.")
+        
+        variants_to_try = []
+        suffixes = [" (Maler)", " (Künstler)", " (Artist)", " (Painter)", " (Bildhauer)", " (sculptor)"]
+        
+        # Priority 1: The effective base name and its direct variants
+        variants_to_try.append(effective_base_name)
+        for suffix in suffixes:
+            variants_to_try.append(effective_base_name + suffix)
+        
+        # Priority 2: If the original artist_name was different and shorter
+        if artist_name.lower() != effective_base_name.lower() and len(artist_name) < len(effective_base_name):
+            logger.debug(f"Adding original name '{artist_name}' and its variants as lower priority fallbacks.")
+            variants_to_try.append(artist_name)
+            for suffix in suffixes:
+                variants_to_try.append(artist_name + suffix)
+        
+        # Heuristics for very famous names
+        current_base_lower_for_heuristics = effective_base_name.lower()
+        if "pablo" not in current_base_lower_for_heuristics and "picasso" in current_base_lower_for_heuristics:
+            variants_to_try.extend(["Pablo Picasso", "Pablo Picasso (Maler)"])
+        if "vincent" not in current_base_lower_for_heuristics and "van gogh" in current_base_lower_for_heuristics:
+            variants_to_try.extend(["Vincent van Gogh", "Vincent van Gogh (Maler)"])
+        if current_base_lower_for_heuristics == "leonardo": # Specifically for "Leonardo"
+             variants_to_try.extend(["Leonardo da Vinci", "Leonardo da Vinci (Maler)"])
+        
+        final_search_variants = []
+        seen_variants_lower = set()
+        for v in variants_to_try:
+            v_lower = v.lower()
+            if v_lower not in seen_variants_lower:
+                final_search_variants.append(v)
+                seen_variants_lower.add(v_lower)
+        
+        return effective_base_name, final_search_variants
+    
+    def _score_artwork_page(self, query: str, data: Dict[str, Any], lang: str,
+                            requested_title: Optional[str] = None) -> Tuple[Optional[Dict[str, Any]], float, str]:
+        """
+        Validate and score a fetched artwork page
+        
+        Args:
+            query: Original artwork query used for scoring
+            data: Page data (may be empty)
+            lang: Language code
+            requested_title: Probed title; remembered as 'not_artwork' when the page is no artwork
+        
+        Returns:
+            Tuple of (page data or None if missing/not artwork content, relevance score, language)
+        """
+        if data:
+            extract = data.get("extract", "")
+            title = data.get("title", "")
+            
+            if is_artwork_content(extract, title):
+                return data, calculate_relevance_score(query, title, extract), lang
+            if requested_title:
+                self._remember_negative(lang, requested_title, 'not_artwork')
+        return None, 0, lang
+    
+    def _detail_query_params(self, title: str, full: bool = False, lang: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Build action API parameters fetching everything a detailed page needs in one round trip
+        
+        Args:
+            title: Page title
+            full: Request the complete intro regardless of the configured extract limits
+            lang: Language of the page (adds its title on the other language's Wikipedia)
+        
+        Returns:
+            Query parameters returning intro extract, title, pageid, description, thumbnail and URL
+        """
+        params = self._batch_query_params([title], lang)
+        params['exlimit'] = 1
+        if full:
+            params.pop('exsentences', None)
+            params.pop('exchars', None)
+        return params
     
-    def __init__(self, timeout: int = 10):
-        self.timeout = timeout
-        self.base_urls = {
-            'de': 'https://de.wikipedia.org',
-            'en': 'https://en.wikipedia.org'
+    def _sections_query_params(self, pageid: int) -> Dict[str, Any]:
+        """Build action=parse parameters listing a page's sections (without the page text)"""
+        return {'action': 'parse', 'format': 'json', 'formatversion': 2, 'pageid': pageid,
+                'prop': 'sections|revid', 'redirects': 1}
+    
+    def _section_query_params(self, pageid: int, index: int) -> Dict[str, Any]:
+        """Build action=parse parameters returning the HTML of a single section"""
+        return {'action': 'parse', 'format': 'json', 'formatversion': 2, 'pageid': pageid,
+                'section': index, 'prop': 'text|revid', 'redirects': 1,
+                'disabletoc': 1, 'disableeditsection': 1, 'disablelimitreport': 1}
+    
+    def _sections_from_response(self, data: Dict[str, Any], language: str) -> Dict[str, Any]:
+        """
+        Read a page's section list from an action=parse response
+        
+        Returns:
+            Dict with 'title', 'pageid', 'language', 'revision' and 'sections'
+            (readable top-level sections, see readable_sections), or empty dict
+        """
+        parsed = data.get('parse') if isinstance(data, dict) else None
+        if not parsed:
+            return {}
+        return {
+            'title': parsed.get('title', ''),
+            'pageid': parsed.get('pageid'),
+            'language': language,
+            'revision': str(parsed['revid']) if parsed.get('revid') else None,
+            'sections': readable_sections(parsed.get('sections', []))
+        }
+    
+    def _section_from_response(self, data: Dict[str, Any], language: str, index: int) -> Dict[str, Any]:
+        """
+        Read one section's text from an action=parse response
+        
+        Returns:
+            Dict with 'title' (page), 'pageid', 'language', 'revision', 'index', 'heading'
+            and 'text' (plain paragraphs, possibly empty), or empty dict if the request failed
+        """
+        parsed = data.get('parse') if isinstance(data, dict) else None
+        if not parsed:
+            return {}
+        heading, text = section_text(parsed.get('text', ''))
+        self._count('sections_fetched')
+        return {
+            'title': parsed.get('title', ''),
+            'pageid': parsed.get('pageid'),
+            'language': language,
+            'revision': str(parsed['revid']) if parsed.get('revid') else None,
+            'index': index,
+            'heading': heading,
+            'text': text
         }
     
-    def _make_request(self, url: str) -> Dict[str, Any]:
+    def _next_readable(self, sections: Dict[str, Any], cursor: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Readable sections after the one the cursor read last"""
+        return [section for section in sections.get('sections', []) if section['index'] > cursor.get('section', 0)]
+    
+    def _merge_detailed_content(self, summary_data: Dict[str, Any], data: Dict[str, Any],
+                                title: str, language: str) -> Dict[str, Any]:
         """
-        Make a request to Wikipedia API
+        Merge an action API detail response into summary data
         
         Args:
-            url: Wikipedia API URL
+            summary_data: REST summary data the caller already has (may be empty)
+            data: Action API response (formatversion=2, may be empty)
+            title: Requested page title
+            language: Language code
+        
+        Returns:
+            Summary data with the longer extract and any fields it was missing
+        """
+        pages = [page for page in (data or {}).get('query', {}).get('pages', [])
+                 if not page.get('missing') and not page.get('invalid')]
+        if not pages:
+            if summary_data and 'language' not in summary_data:
+                summary_data['language'] = language
+            return summary_data
+        
+        page = self._summary_from_page(pages[0], language)
+        if not summary_data:
+            logger.info(f"Got detailed extract for {title} ({len(page['extract'])} chars)")
+            return page
+        
+        merged = dict(summary_data)
+        if len(page['extract']) > len(merged.get('extract', '')):
+            merged['extract'] = page['extract']
+            merged['title'] = page['title']
+            logger.info(f"Got detailed extract for {title} ({len(page['extract'])} chars)")
+        for field in ('pageid', 'description', 'thumbnail', 'content_urls', 'revision', 'langlinks'):
+            if not merged.get(field) and page.get(field):
+                merged[field] = page[field]
+        merged.setdefault('language', language)
+        return merged
+    
+    def _batch_query_params(self, titles: List[str], lang: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Build action API parameters resolving many candidate titles in one round trip
+        
+        Args:
+            titles: Candidate page titles
+            lang: Language of the titles (adds each page's title on the other language's Wikipedia)
+        
+        Returns:
+            Query parameters returning intro extract, description, thumbnail and URL per page
+        """
+        params = {
+            'action': 'query',
+            'format': 'json',
+            'formatversion': 2,
+            'titles': '|'.join(titles[:MAX_TITLES_PER_QUERY]),
+            'redirects': 1,
+            'prop': 'extracts|description|pageimages|info',
+            'exintro': 1,
+            'explaintext': 1,
+            'exsectionformat': 'plain',
+            'exlimit': 'max',
+            'piprop': 'thumbnail',
+            'pithumbsize': 320,
+            'inprop': 'url',
+            **self._extract_limit_params()
+        }
+        other = self._other_language(lang) if lang else None
+        if other:
+            params['prop'] += '|langlinks'
+            params.update({'lllang': other, 'lllimit': 'max'})
+        return params
+    
+    def _pages_from_batch(self, titles: List[str], data: Dict[str, Any], lang: str) -> List[Tuple[str, Optional[Dict[str, Any]]]]:
+        """
+        Map a batched action API response back onto the requested titles.
+        Titles the API reports as missing are remembered in the negative cache.
+        
+        Args:
+            titles: Requested candidate titles in probe order
+            data: Action API response (may be empty)
+            lang: Language code
+        
+        Returns:
+            List of (requested title, summary-shaped page data or None if missing) in probe order
+        """
+        query = data.get('query', {}) if data else {}
+        normalized = {entry['from']: entry['to'] for entry in query.get('normalized', [])}
+        redirects = {entry['from']: entry['to'] for entry in query.get('redirects', [])}
+        
+        pages = {}
+        for page in query.get('pages', []):
+            if page.get('missing') or page.get('invalid'):
+                continue
+            pages[page['title']] = page
+        
+        candidates = []
+        for title in titles:
+            resolved_title = normalized.get(title, title)
+            resolved_title = redirects.get(resolved_title, resolved_title)
+            page = pages.get(resolved_title)
+            if page is None and query:
+                self._remember_negative(lang, title, 'missing')
+            candidates.append((title, self._summary_from_page(page, lang) if page else None))
+        return candidates
+    
+    def _revision_query_params(self, titles: List[str]) -> Dict[str, Any]:
+        """
+        Build action API parameters asking only for the current revision id of many pages
+        
+        Args:
+            titles: Page titles (at most MAX_TITLES_PER_QUERY are used)
+        
+        Returns:
+            Query parameters for prop=revisions without content
+        """
+        return {
+            'action': 'query',
+            'format': 'json',
+            'formatversion': 2,
+            'titles': '|'.join(titles[:MAX_TITLES_PER_QUERY]),
+            'redirects': 1,
+            'prop': 'revisions',
+            'rvprop': 'ids'
+        }
+    
+    def _revisions_from_batch(self, titles: List[str], data: Dict[str, Any]) -> Dict[str, Optional[str]]:
+        """
+        Map a prop=revisions response back onto the requested titles
+        
+        Args:
+            titles: Requested page titles
+            data: Action API response (may be empty)
+        
+        Returns:
+            Title -> current revision id, or None if the page no longer exists.
+            Titles the response says nothing about (e.g. failed request) are left out.
+        """
+        query = data.get('query', {}) if data else {}
+        if not query:
+            return {}
+        normalized = {entry['from']: entry['to'] for entry in query.get('normalized', [])}
+        redirects = {entry['from']: entry['to'] for entry in query.get('redirects', [])}
+        pages = {page['title']: page for page in query.get('pages', [])}
+        
+        revisions = {}
+        for title in titles:
+            resolved_title = normalized.get(title, title)
+            page = pages.get(redirects.get(resolved_title, resolved_title))
+            if page is None or page.get('missing') or page.get('invalid'):
+                revisions[title] = None
+            elif page.get('revisions'):
+                revisions[title] = str(page['revisions'][0]['revid'])
+        return revisions
+    
+    @staticmethod
+    def _page_revision(result: Optional[Dict[str, Any]]) -> Optional[Tuple[str, str, str]]:
+        """(language, title, revision id) of the page a lookup result was built from, if known"""
+        if result and result.get('language') and result.get('title') and result.get('revision'):
+            return result['language'], result['title'], str(result['revision'])
+        return None
+    
+    def _revalidation_candidate(self, kind: str, language: str, query: str) -> Step:
+        """Step: expired cached result that records its page revision and can be revalidated"""
+        if self.cache is None or self.backend == 'offline':
+            return None
+        stale = yield from self._blocking(self._cache_on_disk(), self.cache.get_stale, kind, language, query)
+        return stale if self._page_revision(stale) else None
+    
+    def _revalidated(self, stale: Dict[str, Any], current_revision: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Decide on an expired result after asking for its page's current revision
+        
+        Returns:
+            The expired result if its page is unchanged, otherwise None (refetch needed)
+        """
+        if current_revision is not None and current_revision == self._page_revision(stale)[2]:
+            self._count('revalidated_unchanged')
+            return stale
+        self._count('revalidated_changed')
+        return None
+    
+    def _group_by_page_language(self, entries: List[Tuple[str, str, str, Any]]) -> Dict[str, List[Tuple[str, str, str, Dict[str, Any]]]]:
+        """Group expired cache entries that record a page revision by the language of that page"""
+        groups: Dict[str, List[Tuple[str, str, str, Dict[str, Any]]]] = {}
+        for kind, language, query, value in entries:
+            reference = self._page_revision(value)
+            if reference is not None:
+                groups.setdefault(reference[0], []).append((kind, language, query, value))
+        return groups
+    
+    def _offline_batch(self, titles: List[str], lang: str) -> List[Tuple[str, Optional[Dict[str, Any]]]]:
+        """
+        Resolve candidate titles from the offline index (no network)
+        
+        Args:
+            titles: Candidate titles in probe order
+            lang: Language code
+        
+        Returns:
+            List of (requested title, page data or None) in probe order
+        """
+        self._count('offline_lookups', len(titles))
+        return [(title, self.offline_index.get(lang, title)) for title in titles]
+    
+    def _summary_from_page(self, page: Dict[str, Any], lang: str) -> Dict[str, Any]:
+        """
+        Shape an action API page like a REST summary so callers can treat both the same way
+        
+        Args:
+            page: Page object from an action API response (formatversion=2)
+            lang: Language code
+        
+        Returns:
+            Summary-shaped page data
+        """
+        summary = {
+            'title': page['title'],
+            'pageid': page.get('pageid'),
+            'extract': page.get('extract', ''),
+            'description': page.get('description', ''),
+            'content_urls': {'desktop': {'page': page.get('fullurl', '')}},
+            'language': lang
+        }
+        if page.get('thumbnail'):
+            summary['thumbnail'] = page['thumbnail']
+        if page.get('lastrevid'):
+            # Same field as the REST summary; lets cached results be revalidated
+            summary['revision'] = str(page['lastrevid'])
+        other = self._other_language(lang)
+        if other:
+            # Requested with lllang, so a page without the key has no article in the other language
+            summary['langlinks'] = {link['lang']: link['title'] for link in page.get('langlinks', [])
+                                    if link.get('lang') == other}
+            self._remember_langlinks(lang, summary['title'], summary['langlinks'])
+        return summary
+    
+    def _search_query_params(self, query: str, lang: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Build action API parameters for a full-text search that returns the
+        top-ranked pages together with their intro extracts in one round trip
+        
+        Args:
+            query: Search text
+            lang: Language searched (adds each hit's title on the other language's Wikipedia)
+        
+        Returns:
+            Query parameters using generator=search
+        """
+        params = self._batch_query_params([], lang)
+        del params['titles']
+        params.update({
+            'generator': 'search',
+            'gsrsearch': query,
+            'gsrlimit': self.search_top_k,
+            'gsrnamespace': 0
+        })
+        return params
+    
+    def _pages_from_search(self, data: Dict[str, Any], lang: str) -> List[Tuple[str, Optional[Dict[str, Any]]]]:
+        """
+        Turn a generator=search response into candidates ordered by search rank
+        
+        Args:
+            data: Action API response (may be empty)
+            lang: Language code
+        
+        Returns:
+            List of (page title, summary-shaped page data) by search rank
+        """
+        pages = (data.get('query', {}) if data else {}).get('pages', [])
+        ranked = sorted(pages, key=lambda page: page.get('index', 0))
+        return [(page['title'], self._summary_from_page(page, lang)) for page in ranked if not page.get('missing')]
+    
+    def _rank_artist_pages(self, query: str, candidates: List[Tuple[str, Optional[Dict[str, Any]]]], lang: str,
+                           best_result: Optional[Dict[str, Any]], best_score: float,
+                           stop_on_confident: bool = False,
+                           pages: Optional[ResolvedPages] = None) -> Tuple[Optional[Dict[str, Any]], float, bool]:
+        """
+        Score batched artist candidates with the same rules as the variant-by-variant search
+        
+        Args:
+            query: Artist name used for relevance scoring
+            candidates: (requested title, page data) pairs in probe order
+            lang: Language code of the candidates
+            best_result: Best page found so far
+            best_score: Score of the best page found so far
+            stop_on_confident: Stop at the first high-confidence (>90) match
+            pages: Pages already resolved in this search (duplicates are not scored again)
+        
+        Returns:
+            Tuple of (best page, best score, whether a high-confidence match ended the search)
+        """
+        for variant, data in candidates:
+            if not data or (pages is not None and pages.duplicate(lang, data)):
+                continue
+            
+            extract = data.get("extract", "")
+            title = data.get("title", "")
+            
+            score = calculate_artist_relevance(query, title, extract)
+            logger.debug(f"Variant '{variant}' ({lang}) - Page: '{title}', Score: {score}, Extract length: {len(extract)}")
+            
+            if score > best_score and len(extract) > 50:
+                best_score = score
+                best_result = data
             
+            if stop_on_confident and score > 90: # High-confidence match
+                logger.info(f"High-score artist match ({lang}): {title} (score: {score})")
+                return data, score, True
+        
+        return best_result, best_score, False
+    
+    @abc.abstractmethod
+    def _run(self, step: Step, deadline: Union[Deadline, float, None] = None) -> Any:
+        """
+        Drive a step to completion, performing the operations it yields
+        (blocking in WikipediaClient, a coroutine in AsyncWikipediaClient)
+        
+        Args:
+            step: Lookup step
+            deadline: Latency budget (Deadline or seconds) for all HTTP calls of the step
+        
         Returns:
-            API response data or empty dict on error
+            The step's result
         """
-        try:
-            response = requests.get(url, timeout=self.timeout)
-            if response.status_code == 200:
-                return response.json()
-        except Exception as e:
-            logger.debug(f"Request error for {url}: {e}")
-        return {}
     
-    def search_artwork(self, query: str) -> Dict[str, Any]:
+    # Public lookups (coroutines with the async client)
+    
+    def get_summary(self, title: str, language: str = 'de',
+                    deadline: Union[Deadline, float, None] = None) -> Dict[str, Any]:
+        """
+        Get the REST summary of a single Wikipedia page
+        
+        Args:
+            title: Wikipedia page title
+            language: Language code ('de' or 'en')
+            deadline: Latency budget (Deadline or seconds) for all HTTP calls of the lookup
+        
+        Returns:
+            Summary data including 'language' or empty dict if the page does not exist
+        """
+        return self._run(self._cached_lookup('summary', language, title,
+                                             lambda: self._get_summary_uncached(title, language)), deadline)
+    
+    def get_full_extract(self, title: str, language: str = 'de',
+                         deadline: Union[Deadline, float, None] = None) -> Dict[str, Any]:
+        """
+        Get a page with its complete intro extract, for "tell me more" follow-ups. Other lookups
+        only keep the configured extract length (copies cut by the client carry 'extract_trimmed').
+        
+        Args:
+            title: Wikipedia page title
+            language: Language code ('de' or 'en')
+            deadline: Latency budget (Deadline or seconds) for all HTTP calls of the lookup
+        
+        Returns:
+            Detailed page data with the untrimmed intro or empty dict
+        """
+        return self._run(self._cached_lookup(FULL_EXTRACT_KIND, language, title,
+                                             lambda: self._get_full_extract_uncached(title, language)), deadline)
+    
+    def get_sections(self, pageid: int, language: str = 'de',
+                     deadline: Union[Deadline, float, None] = None) -> Dict[str, Any]:
+        """
+        Get the readable top-level sections of a page (headings only, no text)
+        
+        Args:
+            pageid: Page id
+            language: Language code ('de' or 'en')
+            deadline: Latency budget (Deadline or seconds) for all HTTP calls of the lookup
+        
+        Returns:
+            Dict with 'title', 'pageid', 'language', 'revision' and 'sections'
+            (list of {'index', 'title'}), or empty dict
+        """
+        return self._run(self._sections_lookup(pageid, language), deadline)
+    
+    def get_section(self, pageid: int, index: int, language: str = 'de',
+                    deadline: Union[Deadline, float, None] = None) -> Dict[str, Any]:
+        """
+        Get the plain text of one section of a page, cached per section
+        
+        Args:
+            pageid: Page id
+            index: Section number (from get_sections)
+            language: Language code ('de' or 'en')
+            deadline: Latency budget (Deadline or seconds) for all HTTP calls of the lookup
+        
+        Returns:
+            Dict with 'title', 'pageid', 'language', 'revision', 'index', 'heading' and 'text',
+            or empty dict
+        """
+        return self._run(self._section_lookup(pageid, index, language), deadline)
+    
+    def read_next_section(self, cursor: Dict[str, Any],
+                          deadline: Union[Deadline, float, None] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Fetch the next readable section after a cursor, for "tell me more" follow-ups.
+        Only the section list and the next section are requested (both cached), never the whole page.
+        
+        Args:
+            cursor: Cursor of the content_cursor slot (see section_reader.make_cursor)
+            deadline: Latency budget (Deadline or seconds) for all HTTP calls of the lookup
+        
+        Returns:
+            Tuple of (section as returned by get_section or empty dict, advanced cursor).
+            At the end of the page the cursor has 'finished' set; after a failed request it is unchanged.
+        """
+        return self._run(self._read_next_section(cursor), deadline)
+    
+    def search_artwork(self, query: str, concurrent: Optional[bool] = None,
+                       resolution: Optional[str] = None,
+                       deadline: Union[Deadline, float, None] = None) -> Dict[str, Any]:
         """
         Improved Wikipedia search with precise mappings for artworks
         
         Args:
             query: Artwork name to search for
-            
+            concurrent: Probe all variants at once (defaults to the client's concurrent_probes setting)
+            resolution: Candidate resolution mode (defaults to the client's resolution setting)
+            deadline: Latency budget (Deadline or seconds); when it is spent the best result so far is returned
+        
+        Returns:
+            Best matching Wikipedia data or empty dict
+        """
+        return self._run(self._cached_lookup('artwork', 'de', query, lambda: self._memoized_search(
+            'artwork', query, lambda: self._search_artwork_uncached(query, concurrent, resolution)
+        )), deadline)
+    
+    def search_artist(self, artist_name: str, resolution: Optional[str] = None,
+                      deadline: Union[Deadline, float, None] = None) -> Dict[str, Any]:
+        """
+        Search for artist information on Wikipedia
+        
+        Args:
+            artist_name: Name of the artist to search for (expected to be pre-processed by caller if needed)
+            resolution: Candidate resolution mode (defaults to the client's resolution setting)
+            deadline: Latency budget (Deadline or seconds); when it is spent the best result so far is returned
+        
         Returns:
             Best matching Wikipedia data or empty dict
         """
+        return self._run(self._cached_lookup('artist', 'de', artist_name, lambda: self._memoized_search(
+            'artist', artist_name, lambda: self._search_artist_uncached(artist_name, resolution)
+        )), deadline)
+    
+    def revalidate_expired(self, limit: int = 500) -> Dict[str, int]:
+        """
+        Revalidate expired cache entries in bulk: one prop=revisions request per 50 pages and
+        language, then only lookups whose page changed are fetched again
+        
+        Args:
+            limit: Maximum number of expired entries handled
+        
+        Returns:
+            Counters 'checked', 'unchanged', 'changed', 'refetched' and 'unknown'
+        """
+        return self._run(self._revalidate_expired(limit))
+    
+    def refresh_entries(self, entries: List[Tuple[str, str, str, Dict[str, Any]]]) -> Dict[str, int]:
+        """
+        Refresh cache entries before they expire (used by the refresh scheduler). Entries that
+        record a page revision are revalidated in bulk like revalidate_expired(), the others
+        are fetched again.
+        
+        Args:
+            entries: (kind, language, query, cached value) of the entries to refresh
+        
+        Returns:
+            Counters 'checked', 'unchanged', 'changed', 'refetched' and 'unknown'
+        """
+        return self._run(self._refresh_entries(entries))
+    
+    # Lookup steps
+    
+    def _request(self, url: str, params: Optional[Dict[str, Any]] = None) -> Step:
+        """
+        Step: make a request to Wikipedia API
+        
+        Args:
+            url: Wikipedia API URL
+            params: Optional query parameters
+        
+        Failed attempts (errors, timeouts, 429/5xx) are retried with jittered backoff
+        while the host's circuit breaker stays closed. Within a lookup deadline the timeout
+        shrinks to the remaining budget and no request is sent once it is spent.
+        
+        Returns:
+            API response data, PageNotFound for HTTP 404 or empty dict on error
+        """
+        health = self.health.for_url(url)
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self._count('retries')
+                yield Sleep(self._retry_delay(attempt))
+            
+            # A spent budget is checked first, before the breaker and the rate limiter are asked
+            if self._request_timeout() is None:
+                self._count('deadline_skips')
+                logger.debug(f"Lookup budget spent, skipping {url}")
+                return {}
+            
+            if health.rejecting():
+                self._count('circuit_open_skips')
+                logger.debug(f"Circuit open for {health.host}, skipping {url}")
+                return {}
+            
+            wait = yield from self._rate_limit_wait(url)
+            if wait is None:
+                logger.debug(f"Rate limit queue for {health.host} is full, skipping {url}")
+                return {}
+            if wait:
+                yield Sleep(wait)
+            
+            timeout = self._request_timeout()
+            if timeout is None:
+                self._count('deadline_skips')
+                logger.debug(f"Lookup budget spent, skipping {url}")
+                return {}
+            
+            # The half-open trial slot is claimed only now, right before the request goes out
+            trial = health.acquire()
+            if trial is None:
+                self._count('circuit_open_skips')
+                logger.debug(f"Circuit open for {health.host}, skipping {url}")
+                return {}
+            try:
+                start = time.monotonic()
+                try:
+                    self._count('http_requests')
+                    status, body = yield Send(url, params, timeout)
+                except RequestFailed as e:
+                    trial = False # Ended by the recorded failure
+                    health.record_failure()
+                    logger.debug(f"Request error for {url} (attempt {attempt + 1}): {e}")
+                    continue
+                except FixtureMissing:
+                    # Neither an answer nor a host failure: never cached as a missing page, not retried
+                    self._count('replay_misses')
+                    return {}
+                
+                trial = False # Ended by the recorded outcome
+                if status in RETRYABLE_STATUS:
+                    health.record_failure()
+                    logger.debug(f"HTTP {status} for {url} (attempt {attempt + 1})")
+                    continue
+                
+                health.record_success(time.monotonic() - start)
+                if status == 200 and body is not None:
+                    return body
+                if status == 404:
+                    return PageNotFound()
+                return {}
+            finally:
+                if trial:
+                    # Cancelled before an answer: a trial that never finished must not keep the circuit half-open
+                    health.release_trial()
+        return {}
+    
+    def _cached_lookup(self, kind: str, language: str, query: str, fetch: Callable[[], Step]) -> Step:
+        """
+        Step: serve a lookup from the response cache, otherwise run it once for all concurrent
+        callers asking for the same (kind, language, normalized query) and cache the result.
+        Entries that expired less than the cache's grace period ago are served right away and
+        refreshed in the background. Older expired entries are served while the host is
+        throttled or when the lookup fails.
+        
+        Args:
+            kind: Lookup type ('artwork', 'artist' or 'summary')
+            language: Language code
+            query: Title or query text
+            fetch: Creates the uncached lookup step
+        
+        Returns:
+            Lookup result
+        """
+        cached = yield from self._cached(kind, language, query)
+        if cached is not None:
+            return cached
+        
+        # Stale-while-revalidate: the visitor gets the recently expired answer at cache speed
+        recent = yield from self._cached_in_grace(kind, language, query)
+        if recent is not None:
+            throttled = yield from self._throttled(language)
+            if not throttled:
+                key = self._claim_refresh(kind, language, query)
+                if key is not None:
+                    yield Background(self._background_refresh(key, self._fetch_and_remember(kind, language, query, fetch)))
+            return recent
+        
+        # While the host is throttled, an expired answer beats queueing more requests
+        throttled = yield from self._throttled(language)
+        if throttled:
+            stale = yield from self._cached_stale(kind, language, query)
+            if stale is not None:
+                return stale
+        
+        result, joined = yield Shared(ResponseCache.make_key(kind, language, query),
+                                      self._fetch_and_remember(kind, language, query, fetch))
+        if joined:
+            self._count('coalesced_lookups')
+        if not result:
+            # Rate limited, circuit open or out of time: fall back to an expired answer
+            stale = yield from self._cached_stale(kind, language, query)
+            return stale or result
+        return result
+    
+    def _fetch_and_remember(self, kind: str, language: str, query: str, fetch: Callable[[], Step]) -> Step:
+        """Step: run an uncached lookup and store its result"""
+        # An expired entry whose page revision is unchanged only needs a tiny revision check
+        result = yield from self._revalidate(kind, language, query)
+        if not result:
+            result = yield from fetch()
+        return (yield from self._remember(kind, language, query, result))
+    
+    def _background_refresh(self, key: str, refresh: Step) -> Step:
+        """
+        Step: refresh an expired cache entry claimed with _claim_refresh (run with Background)
+        
+        Args:
+            key: Cache key of the entry
+            refresh: Lookup step that stores its result in the cache
+        """
+        result = None
+        try:
+            result, _ = yield Shared(key, refresh)
+        except Exception as e:
+            logger.warning(f"Background refresh of {key} failed: {e}")
+        finally:
+            self._release_refresh(key, result)
+    
+    def _fetch_revisions(self, titles: List[str], lang: str) -> Step:
+        """
+        Step: get the current revision ids of pages, MAX_TITLES_PER_QUERY titles per request
+        
+        Args:
+            titles: Page titles
+            lang: Language code
+        
+        Returns:
+            Title -> revision id or None if the page is gone (unknown titles are left out)
+        """
+        revisions = {}
+        for start in range(0, len(titles), MAX_TITLES_PER_QUERY):
+            chunk = titles[start:start + MAX_TITLES_PER_QUERY]
+            data = yield from self._request(self._api_url(lang), params=self._revision_query_params(chunk))
+            revisions.update(self._revisions_from_batch(chunk, data))
+        return revisions
+    
+    def _revalidate(self, kind: str, language: str, query: str) -> Step:
+        """
+        Step: revalidate an expired cache entry against its page's current revision
+        
+        Returns:
+            The expired result if still current, otherwise None
+        """
+        stale = yield from self._revalidation_candidate(kind, language, query)
+        if stale is None:
+            return None
+        lang, title, _ = self._page_revision(stale)
+        current = yield from self._fetch_revisions([title], lang)
+        return self._revalidated(stale, current.get(title))
+    
+    def _memoized_search(self, kind: str, query: str, resolve: Callable[[], Step]) -> Step:
+        """
+        Step: answer a search the title memo knows with one fetch of the remembered page; otherwise
+        (or if that page no longer answers it) run the full resolution and remember its result
+        
+        Args:
+            kind: Lookup type ('artwork' or 'artist')
+            query: User query
+            resolve: Creates the full resolution step
+        
+        Returns:
+            Search result
+        """
+        entry = None
+        if self._memo_usable():
+            entry = yield from self._blocking(self.title_memo.path is not None, self.title_memo.get, kind, query)
+        if entry is not None:
+            data = yield from self._request(self._api_url(entry['language']), params=self._memo_query_params(entry))
+            result = self._memo_result(kind, entry, data)
+            if result:
+                self._count('memo_shortcuts')
+                if result['title'] != entry['title']:
+                    # Renamed or followed a redirect: remember the page's new canonical title
+                    yield from self._memorize(kind, query, result)
+                return result
+            if data:
+                logger.info(f"Remembered page {entry['title']} ({entry['language']}) no longer answers '{query}'")
+                self._count('memo_invalidated')
+                yield from self._blocking(self.title_memo.path is not None, self.title_memo.forget, kind, query)
+        
+        result = yield from resolve()
+        yield from self._memorize(kind, query, result)
+        return result
+    
+    def _refetch(self, kind: str, language: str, query: str, stale: Dict[str, Any]) -> Step:
+        """Step: run an expired lookup again without the cache"""
+        if kind == 'summary':
+            return (yield from self._get_summary_uncached(stale['title'], language))
+        if kind == 'artwork':
+            return (yield from self._memoized_search(kind, query, lambda: self._search_artwork_uncached(query)))
+        if kind == 'artist':
+            return (yield from self._memoized_search(kind, query, lambda: self._search_artist_uncached(query)))
+        if kind == FULL_EXTRACT_KIND:
+            return (yield from self._get_detailed_content(stale['title'], language, full=True))
+        if kind == SECTIONS_KIND:
+            return (yield from self._get_sections_uncached(stale['pageid'], language))
+        if kind == SECTION_KIND:
+            return (yield from self._get_section_uncached(stale['pageid'], language, stale['index']))
+        return {}
+    
+    def _revalidate_expired(self, limit: int) -> Step:
+        """Step behind revalidate_expired"""
+        report = Counter(checked=0, unchanged=0, changed=0, refetched=0, unknown=0)
+        if self.cache is None or self.backend == 'offline':
+            return dict(report)
+        
+        entries = yield from self._blocking(self._cache_on_disk(), self.cache.expired, limit)
+        yield from self._revalidate_entries(entries, report)
+        logger.info(f"Cache revalidation: {dict(report)}")
+        return dict(report)
+    
+    def _refresh_entries(self, entries: List[Tuple[str, str, str, Dict[str, Any]]]) -> Step:
+        """Step behind refresh_entries"""
+        report = Counter(checked=0, unchanged=0, changed=0, refetched=0, unknown=0)
+        if self.cache is None or self.backend == 'offline':
+            return dict(report)
+        
+        yield from self._revalidate_entries(entries, report)
+        for kind, language, query, value in entries:
+            if self._page_revision(value) is None:
+                report['checked'] += 1
+                result = yield from self._refetch(kind, language, query, value)
+                if result:
+                    report['refetched'] += 1
+                    yield from self._remember(kind, language, query, result)
+        return dict(report)
+    
+    def _revalidate_entries(self, entries: List[Tuple[str, str, str, Dict[str, Any]]], report: Counter) -> Step:
+        """
+        Step: check cached entries that record a page revision with one prop=revisions request per
+        50 pages and language; unchanged ones are stored again, changed ones fetched again
+        
+        Args:
+            entries: (kind, language, query, cached value) of the entries
+            report: Counters updated in place
+        """
+        for lang, group in self._group_by_page_language(entries).items():
+            current = yield from self._fetch_revisions(list(dict.fromkeys(value['title'] for _, _, _, value in group)), lang)
+            for kind, language, query, value in group:
+                report['checked'] += 1
+                title = value['title']
+                if title not in current:
+                    report['unknown'] += 1
+                elif self._revalidated(value, current[title]) is not None:
+                    report['unchanged'] += 1
+                    yield from self._remember(kind, language, query, value)
+                else:
+                    report['changed'] += 1
+                    result = yield from self._refetch(kind, language, query, value)
+                    if result:
+                        report['refetched'] += 1
+                        yield from self._remember(kind, language, query, result)
+    
+    def _get_full_extract_uncached(self, title: str, language: str = 'de') -> Step:
+        """Step: uncached implementation of get_full_extract"""
+        if self.backend == 'offline':
+            self._count('offline_lookups')
+            return self.offline_index.get(language, title) or {}
+        return (yield from self._get_detailed_content(title, language, full=True))
+    
+    def _sections_lookup(self, pageid: int, language: str) -> Step:
+        """Step behind get_sections"""
+        return self._cached_lookup(SECTIONS_KIND, language, str(pageid),
+                                   lambda: self._get_sections_uncached(pageid, language))
+    
+    def _section_lookup(self, pageid: int, index: int, language: str) -> Step:
+        """Step behind get_section"""
+        return self._cached_lookup(SECTION_KIND, language, f"{pageid}#{index}",
+                                   lambda: self._get_section_uncached(pageid, language, index))
+    
+    def _read_next_section(self, cursor: Dict[str, Any]) -> Step:
+        """Step behind read_next_section"""
+        sections = yield from self._sections_lookup(cursor['pageid'], cursor['language'])
+        if not sections:
+            return {}, cursor
+        for section in self._next_readable(sections, cursor):
+            data = yield from self._section_lookup(cursor['pageid'], section['index'], cursor['language'])
+            if not data:
+                # Request failed or budget spent: keep the cursor so the next follow-up retries
+                return {}, cursor
+            cursor = dict(cursor, section=section['index'])
+            if data.get('text'):
+                return data, cursor
+        return {}, dict(cursor, finished=True)
+    
+    def _get_sections_uncached(self, pageid: int, language: str = 'de') -> Step:
+        """Step: uncached implementation of get_sections (the offline index only holds intros)"""
+        if self.backend == 'offline':
+            return {}
+        data = yield from self._request(self._api_url(language), params=self._sections_query_params(pageid))
+        return self._sections_from_response(data, language)
+    
+    def _get_section_uncached(self, pageid: int, language: str, index: int) -> Step:
+        """Step: uncached implementation of get_section"""
+        if self.backend == 'offline':
+            return {}
+        data = yield from self._request(self._api_url(language), params=self._section_query_params(pageid, index))
+        return self._section_from_response(data, language, index)
+    
+    def _get_summary_uncached(self, title: str, language: str = 'de') -> Step:
+        """Step: uncached implementation of get_summary"""
+        if self.backend == 'offline':
+            self._count('offline_lookups')
+            return self.offline_index.get(language, title) or {}
+        data = yield from self._request(self._summary_url(title, language))
+        if data:
+            data['language'] = language
+        return data
+    
+    def _search_artwork_uncached(self, query: str, concurrent: Optional[bool] = None,
+                                 resolution: Optional[str] = None) -> Step:
+        """Step: uncached implementation of search_artwork"""
         try:
+            mode = self._resolve_mode(resolution)
+            if mode == 'batch':
+                return (yield from self._search_artwork_batched(query))
+            if mode == 'search':
+                return (yield from self._search_artwork_search_first(query))
+            
             query_lower = query.lower().strip()
-            best_result = None
-            best_score = 0
             
             # 1. Use precise mappings if available
             if query_lower in WIKIPEDIA_ARTWORK_MAPPINGS:
@@ -59,9 +1975,8 @@ class WikipediaClient:
                 logger.info(f"Using precise mapping: {query} -> {search_term}")
                 
                 # Try German Wikipedia first
-                for lang, base_url in [('de', self.base_urls['de']), ('en', self.base_urls['en'])]:
-                    url = f"{base_url}/api/rest_v1/page/summary/{urllib.parse.quote(search_term)}"
-                    data = self._make_request(url)
+                for lang in ('de', 'en'):
+                    data = yield from self._request(self._summary_url(search_term, lang))
                     
                     if data:
                         extract = data.get("extract", "")
@@ -73,153 +1988,356 @@ class WikipediaClient:
                             return data
             
             # 2. Fallback: Normal search with various variants
-            search_variants = [
-                query.replace(' ', '_'),
-                f"{query.replace(' ', '_')}_(painting)",
-                f"{query.replace(' ', '_')}_(artwork)",
-                f"{query.replace(' ', '_')}_(Gemälde)"
-            ]
-            
-            for lang, base_url in [('de', self.base_urls['de']), ('en', self.base_urls['en'])]:
-                for variant in search_variants:
-                    url = f"{base_url}/api/rest_v1/page/summary/{urllib.parse.quote(variant)}"
-                    data = self._make_request(url)
-                    
-                    if data:
-                        extract = data.get("extract", "")
-                        title = data.get("title", "")
-                        
-                        if is_artwork_content(extract, title):
-                            score = calculate_relevance_score(query, title, extract)
-                            if score > best_score:
-                                best_score = score
-                                best_result = data
-                                best_result['language'] = lang
-                                
-                            # Very high score = perfect match
-                            if score > 85:
-                                logger.info(f"High-score match: {title} (score: {score})")
-                                return data # Return data directly, not best_result
-            
-            if best_result:
-                logger.info(f"Best Wikipedia result: {best_result.get('title')} (score: {best_score})")
-            else:
-                logger.warning(f"No valid artwork found on Wikipedia for: {query}")
-            
-            return best_result or {}
+            search_variants = self._build_artwork_variants(query)
+            use_concurrent = self.concurrent_probes if concurrent is None else concurrent
+            probe_until = self._probe_until() if use_concurrent else None
             
+            # German variants first; English only has to try the German page's equivalent if one is known
+            selection = ArtworkSelection(query)
+            pages = ResolvedPages()
+            try:
+                for lang in ('de', 'en'):
+                    if lang == 'de':
+                        variants = search_variants
+                    else:
+                        variants = yield from self._fallback_titles(selection.best_result, lang, search_variants)
+                    if use_concurrent:
+                        accepted = yield from self._probe_concurrently(selection, variants, lang, probe_until, pages)
+                    else:
+                        accepted = yield from self._probe_in_turn(selection, variants, lang, pages)
+                    if accepted:
+                        break
+                return selection.result()
+            finally:
+                self._report_duplicates(query, pages)
+        
         except Exception as e:
             logger.error(f"Wikipedia API error: {e}")
             return {}
     
-    def search_artist(self, artist_name: str) -> Dict[str, Any]:
+    def _probe_until(self) -> float:
+        """Monotonic time after which concurrent artwork probes are no longer waited for"""
+        timeout = self.probe_deadline
+        budget = current_deadline()
+        if budget is not None:
+            timeout = budget.clamp(timeout)
+        return time.monotonic() + timeout
+    
+    def _probe_in_turn(self, selection: ArtworkSelection, variants: List[str], lang: str,
+                       pages: ResolvedPages) -> Step:
         """
-        Search for artist information on Wikipedia
+        Step: probe artwork title variants on one language's Wikipedia one after another
         
         Args:
-            artist_name: Name of the artist to search for (expected to be pre-processed by caller if needed)
-            
+            selection: Selection the scored pages are fed into
+            variants: Title variants in probe order
+            lang: Language code
+            pages: Pages already resolved in this search (redirect duplicates are skipped)
+        
+        Returns:
+            True if a perfect match ended the search
+        """
+        for variant in variants:
+            data = yield from self._fetch_unique_probe(variant, lang, ARTWORK_NEGATIVE_REASONS, pages)
+            if selection.add(*self._score_artwork_page(selection.query, data, lang, variant)):
+                return True
+        return False
+    
+    def _probe_concurrently(self, selection: ArtworkSelection, variants: List[str], lang: str,
+                            probe_until: float, pages: ResolvedPages) -> Step:
+        """
+        Step: probe artwork title variants on one language's Wikipedia all at once
+        
+        Args:
+            selection: Selection the scored pages are fed into
+            variants: Title variants in probe order
+            lang: Language code
+            probe_until: Monotonic time after which only probes that have already finished are used
+            pages: Pages already resolved in this search (a page several variants lead to is scored once)
+        
+        Returns:
+            True if a perfect match ended the search
+        """
+        probes = []
+        try:
+            for variant in variants:
+                probes.append((variant, (yield Start(self._fetch_probe(variant, lang, ARTWORK_NEGATIVE_REASONS)))))
+            return (yield from self._select_in_order(selection, probes, lang, pages, probe_until))
+        finally:
+            yield Cancel(*(handle for _, handle in probes))
+    
+    def _select_in_order(self, selection: ArtworkSelection, probes: List[Tuple[str, Handle]], lang: str,
+                         pages: ResolvedPages, probe_until: float) -> Step:
+        """
+        Step: feed the pages of started probes into the selection in probe order, so the outcome
+        matches the sequential mode. Waits until probe_until at the latest (set from probe_deadline
+        and the lookup budget); after that only probes that have already finished are used.
+        A later probe that already scored a perfect match does not wait for slower earlier ones:
+        the finished probes up to it are fed in order and the search ends. A page that several
+        variants redirect to is scored once; its other probes count as duplicates.
+        
+        Args:
+            selection: Selection the scored pages are fed into
+            probes: (variant, started _fetch_probe step) in probe order
+            lang: Language code of the probes
+            pages: Pages already resolved in this search
+            probe_until: Monotonic time after which no probe is waited for
+        
+        Returns:
+            True if a perfect match ended the search
+        """
+        scored: Dict[int, Tuple[Optional[Dict[str, Any]], float, str]] = {}
+        
+        def score(position: int) -> Tuple[Optional[Dict[str, Any]], float, str]:
+            """Score a finished probe once, dropping pages this search has already resolved"""
+            if position not in scored:
+                variant, handle = probes[position]
+                data = handle.result() if handle.succeeded() else {}
+                if data and pages.duplicate(lang, data):
+                    data = {}
+                scored[position] = self._score_artwork_page(selection.query, data, lang, variant)
+            return scored[position]
+        
+        position = 0
+        while position < len(probes):
+            handle = probes[position][1]
+            remaining = probe_until - time.monotonic()
+            if remaining > 0 and not handle.done():
+                perfect = next((later for later in range(position + 1, len(probes))
+                                if probes[later][1].done() and selection.is_perfect(*score(later)[:2])), None)
+                if perfect is not None:
+                    logger.debug(f"Perfect match for '{selection.query}' ahead of slower probes, not waiting for them")
+                    return any(selection.add(*score(earlier)) for earlier in range(position, perfect + 1)
+                               if probes[earlier][1].done())
+                yield Wait([pending for _, pending in probes[position:] if not pending.done()], timeout=remaining, first=True)
+                continue
+            position += 1
+            if not handle.succeeded():
+                logger.debug(f"Concurrent probe for '{selection.query}' failed or timed out")
+                continue
+            if selection.add(*score(position - 1)):
+                return True
+        return False
+    
+    def _fetch_probe(self, title: str, lang: str, negative_reasons: Tuple[str, ...]) -> Step:
+        """
+        Step: fetch the summary of a probe title unless the negative cache says it cannot match
+        
+        Args:
+            title: Title variant to fetch
+            lang: Language code
+            negative_reasons: Negative cache reasons that make the probe pointless
+        
+        Returns:
+            Summary data or empty dict if skipped, missing or failed
+        """
+        skip = yield from self._known_negative(lang, title, negative_reasons)
+        if skip:
+            return {}
+        data = yield from self._request(self._summary_url(title, lang))
+        if isinstance(data, PageNotFound):
+            self._remember_negative(lang, title, 'missing')
+        return data
+    
+    def _fetch_unique_probe(self, title: str, lang: str, negative_reasons: Tuple[str, ...],
+                            pages: ResolvedPages) -> Step:
+        """
+        Step: fetch a probe title unless this search already resolved the page it leads to
+        
+        Args:
+            title: Title variant to fetch
+            lang: Language code
+            negative_reasons: Negative cache reasons that make the probe pointless
+            pages: Pages already resolved in this search
+        
+        Returns:
+            Page data, or empty dict if the probe missed or only found an already resolved page
+        """
+        if pages.resolved_title(lang, title):
+            return {}
+        data = yield from self._fetch_probe(title, lang, negative_reasons)
+        if data and pages.duplicate(lang, data):
+            return {}
+        return data
+    
+    def _fetch_batch(self, titles: List[str], lang: str, negative_reasons: Tuple[str, ...] = ()) -> Step:
+        """
+        Step: resolve all candidate titles for one language with a single action API request.
+        Titles known to fail are left out of the request; if none remain, no request is made.
+        
+        Args:
+            titles: Candidate titles in probe order
+            lang: Language code
+            negative_reasons: Negative cache reasons that make a title pointless to request
+        
+        Returns:
+            List of (requested title, page data or None) in probe order
+        """
+        if self.backend == 'offline':
+            return self._offline_batch(titles, lang)
+        pending = []
+        for title in titles:
+            skip = yield from self._known_negative(lang, title, negative_reasons)
+            if not skip:
+                pending.append(title)
+        resolved = {}
+        if pending:
+            data = yield from self._request(self._api_url(lang), params=self._batch_query_params(pending, lang))
+            resolved = dict(self._pages_from_batch(pending, data, lang))
+        return [(title, resolved.get(title)) for title in titles]
+    
+    def _equivalent_title(self, page: Optional[Dict[str, Any]], target_lang: str) -> Step:
+        """
+        Step: title of a page on target_lang's Wikipedia, from its langlinks, the cache or one prop=langlinks request
+        
+        Args:
+            page: Best page found in the other language (may be None)
+            target_lang: Language code the lookup falls back to
+        
+        Returns:
+            Equivalent title or None if there is none (or it could not be determined)
+        """
+        if not self._langlink_candidate(page, target_lang):
+            return None
+        links = yield from self._known_langlinks(page)
+        if links is None:
+            self._count('langlink_lookups')
+            data = yield from self._request(self._api_url(page['language']),
+                                            params=self._langlink_query_params(page['title'], page['language']))
+            links = self._langlinks_from_response(page['title'], data, page['language']) or {}
+        return links.get(target_lang)
+    
+    def _fallback_titles(self, page: Optional[Dict[str, Any]], target_lang: str, titles: List[str]) -> Step:
+        """
+        Step: titles to try on target_lang's Wikipedia after the other language found no perfect match
+        
+        Args:
+            page: Best page found in the other language (may be None)
+            target_lang: Language code the lookup falls back to
+            titles: Variants to sweep when no equivalent is known
+        
+        Returns:
+            Just the equivalent of page if it has one, otherwise titles
+        """
+        equivalent = yield from self._equivalent_title(page, target_lang)
+        if equivalent is None:
+            return titles
+        logger.info(f"Falling back to the {target_lang} equivalent of {page['title']}: {equivalent}")
+        self._count('langlink_fallbacks')
+        return [equivalent]
+    
+    def _search_artwork_batched(self, query: str) -> Step:
+        """
+        Step: artwork search resolving the precise mapping and all variants with one request per language
+        
+        Args:
+            query: Artwork name to search for
+        
+        Returns:
+            Best matching Wikipedia data or empty dict
+        """
+        search_term = WIKIPEDIA_ARTWORK_MAPPINGS.get(query.lower().strip())
+        titles = ([search_term] if search_term else []) + self._build_artwork_variants(query)
+        batches: Dict[str, List[Tuple[str, Optional[Dict[str, Any]]]]] = {}
+        
+        # 1. Precise mapping, German Wikipedia first
+        if search_term:
+            logger.info(f"Using precise mapping: {query} -> {search_term}")
+            for lang in ('de', 'en'):
+                batches[lang] = yield from self._fetch_batch(titles, lang, ARTWORK_NEGATIVE_REASONS)
+                data = batches[lang][0][1]
+                
+                if data and is_artwork_content(data.get("extract", ""), data.get("title", "")):
+                    logger.info(f"Found precise match: {data.get('title')} ({lang})")
+                    return data
+        
+        # 2. Variants, fetching the English batch only when German has no perfect match
+        offset = 1 if search_term else 0
+        selection = ArtworkSelection(query)
+        pages = ResolvedPages()
+        for lang in ('de', 'en'):
+            if lang not in batches:
+                if lang == 'de':
+                    lang_titles = titles
+                else:
+                    lang_titles = yield from self._fallback_titles(selection.best_result, lang, titles)
+                batches[lang] = yield from self._fetch_batch(lang_titles, lang, ARTWORK_NEGATIVE_REASONS)
+            for title, data in batches[lang][offset:]:
+                if data and pages.duplicate(lang, data):
+                    continue
+                if selection.add(*self._score_artwork_page(query, data, lang, title)):
+                    self._report_duplicates(query, pages)
+                    return selection.result()
+        self._report_duplicates(query, pages)
+        return selection.result()
+    
+    def _fetch_search(self, query: str, lang: str) -> Step:
+        """
+        Step: run one full-text search for a language and return the top-k pages with extracts
+        
+        Args:
+            query: Search text
+            lang: Language code
+        
+        Returns:
+            List of (page title, page data) by search rank
+        """
+        data = yield from self._request(self._api_url(lang), params=self._search_query_params(query, lang))
+        return self._pages_from_search(data, lang)
+    
+    def _search_artwork_search_first(self, query: str) -> Step:
+        """
+        Step: artwork search using ranked full-text search hits instead of guessed title suffixes
+        
+        Args:
+            query: Artwork name to search for
+        
         Returns:
             Best matching Wikipedia data or empty dict
         """
+        # 1. Precise mapping, German Wikipedia first
+        search_term = WIKIPEDIA_ARTWORK_MAPPINGS.get(query.lower().strip())
+        if search_term:
+            logger.info(f"Using precise mapping: {query} -> {search_term}")
+            for lang in ('de', 'en'):
+                data = (yield from self._fetch_batch([search_term], lang))[0][1]
+                if data and is_artwork_content(data.get("extract", ""), data.get("title", "")):
+                    logger.info(f"Found precise match: {data.get('title')} ({lang})")
+                    return data
+        
+        # 2. Ranked search hits, English only when German has no perfect match
+        selection = ArtworkSelection(query)
+        for lang in ('de', 'en'):
+            equivalent = (yield from self._equivalent_title(selection.best_result, lang)) if lang != 'de' else None
+            if equivalent:
+                self._count('langlink_fallbacks')
+                candidates = yield from self._fetch_batch([equivalent], lang)
+            else:
+                candidates = yield from self._fetch_search(query, lang)
+            for title, data in candidates:
+                if selection.add(*self._score_artwork_page(query, data, lang, title)):
+                    return selection.result()
+        return selection.result()
+    
+    def _search_artist_uncached(self, artist_name: str, resolution: Optional[str] = None) -> Step:
+        """Step: uncached implementation of search_artist"""
         try:
             query_for_relevance = artist_name
-            effective_base_name = KNOWN_ARTISTS.get(artist_name.lower(), artist_name)
-            
-            if effective_base_name.lower() != artist_name.lower():
-                logger.info(f"Original search term '{artist_name}' will use base '{effective_base_name}' for generating variants due to KNOWN_ARTISTS mapping.")
-            else:
-                logger.info(f"Effective base name for search variants is '{effective_base_name}'.")
-
-            variants_to_try = []
-            suffixes = [" (Maler)", " (Künstler)", " (Artist)", " (Painter)", " (Bildhauer)", " (sculptor)"]
-            
-            # Priority 1: The effective base name and its direct variants
-            variants_to_try.append(effective_base_name)
-            for suffix in suffixes:
-                variants_to_try.append(effective_base_name + suffix)
-
-            # Priority 2: If the original artist_name was different and shorter
-            if artist_name.lower() != effective_base_name.lower() and len(artist_name) < len(effective_base_name):
-                logger.debug(f"Adding original name '{artist_name}' and its variants as lower priority fallbacks.")
-                variants_to_try.append(artist_name)
-                for suffix in suffixes:
-                    variants_to_try.append(artist_name + suffix)
-            
-            # Heuristics for very famous names
-            current_base_lower_for_heuristics = effective_base_name.lower()
-            if "pablo" not in current_base_lower_for_heuristics and "picasso" in current_base_lower_for_heuristics:
-                variants_to_try.extend(["Pablo Picasso", "Pablo Picasso (Maler)"])
-            if "vincent" not in current_base_lower_for_heuristics and "van gogh" in current_base_lower_for_heuristics:
-                variants_to_try.extend(["Vincent van Gogh", "Vincent van Gogh (Maler)"])
-            if current_base_lower_for_heuristics == "leonardo": # Specifically for "Leonardo"
-                 variants_to_try.extend(["Leonardo da Vinci", "Leonardo da Vinci (Maler)"])
-            
-            final_search_variants = []
-            seen_variants_lower = set()
-            for v in variants_to_try:
-                v_lower = v.lower()
-                if v_lower not in seen_variants_lower:
-                    final_search_variants.append(v)
-                    seen_variants_lower.add(v_lower)
+            effective_base_name, final_search_variants = self._build_artist_variants(artist_name)
             
             logger.info(f"Searching Wikipedia for artist related to '{query_for_relevance}'. Effective base: '{effective_base_name}'. Variants: {final_search_variants}")
-
-            best_result = None
-            best_score = 0
-            
-            # German Wikipedia first
-            for variant in final_search_variants:
-                logger.debug(f"Trying variant: '{variant}' on German Wikipedia")
-                url = f"{self.base_urls['de']}/api/rest_v1/page/summary/{urllib.parse.quote(variant)}"
-                data = self._make_request(url)
-                
-                if data:
-                    extract = data.get("extract", "")
-                    title = data.get("title", "") # Keep original case from API
-                    
-                    score = calculate_artist_relevance(query_for_relevance, title, extract)
-                    logger.debug(f"Variant '{variant}' (de) - Page: '{title}', Score: {score}, Extract length: {len(extract)}")
-
-                    if score > best_score and len(extract) > 50:
-                        best_score = score
-                        logger.debug(f"New best score {score} for '{title}'. Fetching detailed content.")
-                        detailed_data = self._get_detailed_content(data.get('title', variant), 'de')
-                        best_result = detailed_data if detailed_data else data
-                        if best_result: # Ensure best_result is not None before adding key
-                           best_result['language'] = 'de'
-                        
-                    if score > 90: # Increased threshold for high-confidence match
-                        logger.info(f"High-score artist match (de): {title} (score: {score})")
-                        detailed_data = self._get_detailed_content(data.get('title', variant), 'de')
-                        # Ensure data is not None before adding key
-                        final_data = detailed_data if detailed_data else data
-                        if final_data:
-                            final_data['language'] = 'de' # Add language here too
-                        return final_data # Return the fetched data
             
-            # English Wikipedia as fallback
-            if not best_result or best_score < 60:
-                logger.info(f"German Wikipedia search for '{query_for_relevance}' (base: '{effective_base_name}') yielded score {best_score}. Trying English Wikipedia.")
-                for variant in final_search_variants:
-                    logger.debug(f"Trying variant: '{variant}' on English Wikipedia")
-                    url = f"{self.base_urls['en']}/api/rest_v1/page/summary/{urllib.parse.quote(variant)}"
-                    data = self._make_request(url)
-                    
-                    if data:
-                        extract = data.get("extract", "")
-                        title = data.get("title", "") # Keep original case
-                        
-                        score = calculate_artist_relevance(query_for_relevance, title, extract)
-                        logger.debug(f"Variant '{variant}' (en) - Page: '{title}', Score: {score}, Extract length: {len(extract)}")
-                        
-                        if score > best_score and len(extract) > 50:
-                            best_score = score
-                            logger.debug(f"New best score {score} for '{title}'. Fetching detailed content.")
-                            detailed_data = self._get_detailed_content(data.get('title', variant), 'en')
-                            best_result = detailed_data if detailed_data else data
-                            if best_result: # Ensure best_result is not None
-                                best_result['language'] = 'en'
+            mode = self._resolve_mode(resolution)
+            if mode == 'batch':
+                best_result, best_score = yield from self._search_artist_resolved(
+                    query_for_relevance, lambda lang: self._fetch_batch(final_search_variants, lang, ARTIST_NEGATIVE_REASONS)
+                )
+            elif mode == 'search':
+                best_result, best_score = yield from self._search_artist_resolved(
+                    query_for_relevance, lambda lang: self._fetch_search(effective_base_name, lang)
+                )
+            else:
+                best_result, best_score = yield from self._search_artist_variants(query_for_relevance, final_search_variants)
             
             if best_result:
                 logger.info(f"Best artist result for '{query_for_relevance}' (base: '{effective_base_name}'): {best_result.get('title')} (score: {best_score}, lang: {best_result.get('language')})")
@@ -227,69 +2345,471 @@ class WikipediaClient:
                 logger.warning(f"No artist information found for: '{query_for_relevance}' (base: '{effective_base_name}') after trying all variants.")
             
             return best_result or {}
-            
+        
         except Exception as e:
             logger.error(f"Wikipedia Artist API error: {e}", exc_info=True) # Added exc_info=True
             return {}
     
-    def _get_detailed_content(self, title: str, language: str = 'de') -> Dict[str, Any]:
+    def _search_artist_resolved(self, query_for_relevance: str, fetch_candidates: Callable[[str], Step]) -> Step:
         """
-        Get detailed Wikipedia content including full text for better biographical extraction
+        Step: artist search over candidates resolved with one request per language ('batch' or 'search' mode).
+        The action API extracts already contain the full intro, so no detail fetch is needed.
         
         Args:
-            title: Wikipedia page title
-            language: Language code ('de' or 'en')
+            query_for_relevance: Artist name used for scoring
+            fetch_candidates: Language code -> step resolving (title, page data) candidates in rank order
+        
+        Returns:
+            Tuple of (best page or None, best score)
+        """
+        def run_pass(lang: str, best_result: Optional[Dict[str, Any]], best_score: float):
+            equivalent = (yield from self._equivalent_title(best_result, lang)) if lang != 'de' else None
+            if equivalent:
+                self._count('langlink_fallbacks')
+                candidates = yield from self._fetch_batch([equivalent], lang, ARTIST_NEGATIVE_REASONS)
+            else:
+                candidates = yield from fetch_candidates(lang)
+            return self._rank_artist_pages(query_for_relevance, candidates, lang, best_result, best_score,
+                                           stop_on_confident=lang == 'de', pages=pages)
+        
+        pages = ResolvedPages()
+        result = yield from self._run_artist_passes(query_for_relevance, run_pass)
+        self._report_duplicates(query_for_relevance, pages)
+        return result
+    
+    def _search_artist_variants(self, query_for_relevance: str, final_search_variants: List[str]) -> Step:
+        """
+        Step: artist search probing the summary endpoint once per variant and language
+        
+        Args:
+            query_for_relevance: Artist name used for scoring
+            final_search_variants: Title variants in probe order
+        
+        Returns:
+            Tuple of (best page or None, best score)
+        """
+        def run_pass(lang: str, best_result: Optional[Dict[str, Any]], best_score: float):
+            if lang == 'de':
+                variants = final_search_variants
+            else:
+                variants = yield from self._fallback_titles(best_result, lang, final_search_variants)
+            return (yield from self._artist_variant_pass(query_for_relevance, variants, lang,
+                                                         best_result, best_score, pages))
+        
+        pages = ResolvedPages()
+        result = yield from self._run_artist_passes(query_for_relevance, run_pass)
+        self._report_duplicates(query_for_relevance, pages)
+        return result
+    
+    def _artist_variant_pass(self, query_for_relevance: str, final_search_variants: List[str], lang: str,
+                             best_result: Optional[Dict[str, Any]], best_score: float,
+                             pages: Optional[ResolvedPages] = None) -> Step:
+        """
+        Step: probe all artist variants on one language's Wikipedia
+        
+        Args:
+            query_for_relevance: Artist name used for scoring
+            final_search_variants: Title variants in probe order
+            lang: Language code
+            best_result: Best page found so far
+            best_score: Score of the best page found so far
+            pages: Pages already resolved in this search (redirect duplicates are skipped)
+        
+        Returns:
+            Tuple of (best page, best score, whether a high-confidence German match ended the pass)
+        """
+        for variant in final_search_variants:
+            logger.debug(f"Trying variant: '{variant}' on {lang} Wikipedia")
+            if pages is None:
+                data = yield from self._fetch_probe(variant, lang, ARTIST_NEGATIVE_REASONS)
+            else:
+                data = yield from self._fetch_unique_probe(variant, lang, ARTIST_NEGATIVE_REASONS, pages)
             
+            if data:
+                extract = data.get("extract", "")
+                title = data.get("title", "") # Keep original case from API
+                
+                score = calculate_artist_relevance(query_for_relevance, title, extract)
+                logger.debug(f"Variant '{variant}' ({lang}) - Page: '{title}', Score: {score}, Extract length: {len(extract)}")
+                
+                detailed_data = None
+                if score > best_score and len(extract) > 50:
+                    best_score = score
+                    logger.debug(f"New best score {score} for '{title}'. Fetching detailed content.")
+                    detailed_data = yield from self._get_detailed_content(data.get('title', variant), lang, summary=data)
+                    best_result = detailed_data if detailed_data else data
+                    if best_result: # Ensure best_result is not None before adding key
+                       best_result['language'] = lang
+                
+                if lang == 'de' and score > 90: # Increased threshold for high-confidence match
+                    logger.info(f"High-score artist match (de): {title} (score: {score})")
+                    if detailed_data is None: # Not fetched above for this page yet
+                        detailed_data = yield from self._get_detailed_content(data.get('title', variant), 'de', summary=data)
+                    # Ensure data is not None before adding key
+                    final_data = detailed_data if detailed_data else data
+                    if final_data:
+                        final_data['language'] = 'de' # Add language here too
+                    return final_data, score, True # Return the fetched data
+        
+        return best_result, best_score, False
+    
+    def _german_pass(self, run_pass: Callable[..., Step]) -> Step:
+        """Step: the German artist pass, timed for the hedge delay"""
+        start = time.monotonic()
+        result = yield from run_pass('de', None, 0)
+        deadline = current_deadline()
+        if deadline is None or not deadline.expired():
+            # A pass cut short by its deadline (or cancelled) would understate the latency
+            self._pass_latency['de'].add(time.monotonic() - start)
+        return result
+    
+    def _run_artist_passes(self, query_for_relevance: str, run_pass: Callable[..., Step]) -> Step:
+        """
+        Step: run the German artist pass and, if it is not good enough, the English one.
+        With hedging enabled, the English pass is started as soon as the German pass takes
+        longer than its observed p95, and whichever delivers an acceptable match first wins.
+        With parallel_languages enabled, both passes start at once (see _parallel_artist_passes).
+        
+        Args:
+            query_for_relevance: Artist name used for scoring (logging only)
+            run_pass: (language, best page so far, best score so far) -> step returning (best page, best score, confident)
+        
         Returns:
-            Detailed Wikipedia data including full content
+            Tuple of (best page or None, best score)
         """
+        if self.parallel_languages:
+            return (yield from self._parallel_artist_passes(query_for_relevance, run_pass))
+        
+        hedge_delay = self._hedge_delay()
+        if hedge_delay is None:
+            german = yield from self._german_pass(run_pass)
+        else:
+            # Started under its own deadline, so a pass that lost the race can be stopped
+            german_handle = yield Start(self._german_pass(run_pass), cancellable_deadline())
+            try:
+                yield Wait([german_handle], timeout=hedge_delay)
+                if not german_handle.done():
+                    return (yield from self._hedged_artist_passes(query_for_relevance, run_pass, german_handle, hedge_delay))
+                german = german_handle.result()
+            finally:
+                yield Cancel(german_handle)
+        
+        if self._artist_pass_accepted(*german):
+            return german[0], german[1]
+        
+        # English Wikipedia as fallback
+        logger.info(f"German Wikipedia search for '{query_for_relevance}' yielded score {german[1]}. Trying English Wikipedia.")
+        best_result, best_score, _ = yield from run_pass('en', german[0], german[1])
+        return best_result, best_score
+    
+    def _hedged_artist_passes(self, query_for_relevance: str, run_pass: Callable[..., Step], german_handle: Handle,
+                              hedge_delay: float) -> Step:
+        """Step: race a slow German pass against an English pass started after hedge_delay; the loser is cancelled"""
+        self._count('hedged_passes')
+        logger.info(f"German artist pass for '{query_for_relevance}' exceeded p95 ({hedge_delay * 1000:.0f} ms). Hedging with English Wikipedia.")
+        english_handle = yield Start(run_pass('en', None, 0), cancellable_deadline())
         try:
-            base_url = self.base_urls[language]
-            summary_data = {} # Initialize summary_data
-            
-            # Try to get summary first (it might contain 'pageid' or other useful info)
-            summary_url = f"{base_url}/api/rest_v1/page/summary/{urllib.parse.quote(title)}"
-            summary_data_raw = self._make_request(summary_url)
-            if summary_data_raw: # Check if data was successfully fetched
-                summary_data = summary_data_raw
-
-            api_url = f"{base_url}/w/api.php"
-            params = {
-                'action': 'query',
-                'format': 'json',
-                'titles': title,
-                'prop': 'extracts',
-                'exintro': True, # Get only the intro section
-                'explaintext': True,
-                'exsectionformat': 'plain',
-                'exlimit': 1
-            }
+            done = yield Wait([german_handle, english_handle], first=True)
+            if german_handle in done:
+                german = german_handle.result()
+                if self._artist_pass_accepted(*german):
+                    return german[0], german[1]
+                yield Wait([english_handle])
+                return self._combine_artist_passes(german, english_handle.result())
             
-            response = requests.get(api_url, params=params, timeout=self.timeout)
-            if response.status_code == 200:
-                data = response.json()
-                pages = data.get('query', {}).get('pages', {})
-                
-                if pages:
-                    page_id = next(iter(pages.keys()))
-                    page_data = pages[page_id]
-                    
-                    # Ensure summary_data has 'extract' key before comparing lengths
-                    current_extract_len = len(summary_data.get('extract', ''))
-                    if 'extract' in page_data and len(page_data['extract']) > current_extract_len:
-                        summary_data['extract'] = page_data['extract']
-                        # Preserve other fields from summary_data if they exist (like title, pageid, etc.)
-                        summary_data['title'] = page_data.get('title', summary_data.get('title', title))
-                        logger.info(f"Got detailed extract for {title} ({len(page_data['extract'])} chars)")
+            english = english_handle.result()
+            if self._artist_pass_accepted(*english):
+                self._count('hedge_wins')
+                return english[0], english[1]
+            yield Wait([german_handle])
+            german = german_handle.result()
+            if self._artist_pass_accepted(*german):
+                return german[0], german[1]
+            return self._combine_artist_passes(german, english)
+        finally:
+            # The losing pass is no longer needed
+            yield Cancel(german_handle, english_handle)
+    
+    def _parallel_artist_passes(self, query_for_relevance: str, run_pass: Callable[..., Step]) -> Step:
+        """
+        Step: run the German and English artist passes concurrently. The German pass gets a head start
+        of one typical German request (see _english_head_start), so a name German Wikipedia answers with
+        its first probe costs no English requests. The German result is used as soon as it clears the
+        acceptance threshold (or is a high-confidence match); a running English pass is then cancelled -
+        it sends no further requests - and its result discarded.
+        
+        Args:
+            query_for_relevance: Artist name used for scoring (logging only)
+            run_pass: (language, best page so far, best score so far) -> step returning (best page, best score, confident)
+        
+        Returns:
+            Tuple of (best page or None, best score)
+        """
+        self._count('parallel_artist_passes')
+        german_handle = yield Start(self._german_pass(run_pass), cancellable_deadline())
+        english_handle = None
+        try:
+            yield Wait([german_handle], timeout=self._english_head_start())
+            if not german_handle.done() or not self._artist_pass_accepted(*german_handle.result()):
+                english_handle = yield Start(run_pass('en', None, 0), cancellable_deadline())
+            yield Wait([german_handle])
+            german = german_handle.result()
             
-            # Ensure 'language' is set in the returned data
-            if summary_data and 'language' not in summary_data:
-                 summary_data['language'] = language
-            return summary_data # Return summary_data which might have been updated
+            if self._artist_pass_accepted(*german):
+                if english_handle is not None and not english_handle.done():
+                    yield Cancel(english_handle)
+                    self._count('english_passes_cancelled')
+                logger.info(f"German artist pass for '{query_for_relevance}' accepted (score {german[1]}), English pass discarded.")
+                return german[0], german[1]
             
+            logger.info(f"German Wikipedia search for '{query_for_relevance}' yielded score {german[1]}. Using the parallel English pass.")
+            yield Wait([english_handle])
+            return self._combine_artist_passes(german, english_handle.result())
+        finally:
+            yield Cancel(*[handle for handle in (german_handle, english_handle) if handle is not None])
+    
+    def _get_detailed_content(self, title: str, language: str = 'de',
+                              summary: Optional[Dict[str, Any]] = None, full: bool = False) -> Step:
+        """
+        Step: get detailed Wikipedia content including full text for better biographical extraction
+        
+        Args:
+            title: Wikipedia page title
+            language: Language code ('de' or 'en')
+            summary: REST summary of the page the caller already fetched (reused, not requested again)
+            full: Fetch the complete intro instead of the configured extract length
+        
+        Returns:
+            Detailed Wikipedia data including full content
+        """
+        try:
+            # One action API call delivers extract, title, pageid, description and thumbnail
+            data = yield from self._request(self._api_url(language), params=self._detail_query_params(title, full, language))
+            return self._merge_detailed_content(summary or {}, data, title, language)
+        
         except Exception as e:
             logger.debug(f"Error getting detailed content for {title}: {e}")
             return {} # Return empty dict on error
 
+
+class WikipediaClient(WikipediaClientBase):
+    """Client for interacting with Wikipedia API"""
+    
+    def __init__(self, config: Optional[ClientConfig] = None, **options: Any):
+        """
+        Args:
+            config: Client options, see ClientConfig (defaults to ClientConfig())
+            **options: ClientConfig fields overriding those of config
+        """
+        super().__init__(config, **options)
+        self.keep_alive = self.config.keep_alive
+        self.max_workers = self.config.max_workers
+        self._sessions: Dict[str, requests.Session] = {}
+        self._sessions_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._refresh_executor: Optional[ThreadPoolExecutor] = None
+        self._flights = SingleFlight(empty={})
+    
+    def _get_session(self, url: str) -> requests.Session:
+        """
+        Get the pooled session for the host of the given URL, creating it on first use
+        
+        Args:
+            url: Request URL
+        
+        Returns:
+            requests.Session bound to a connection pool for that host
+        """
+        host = urllib.parse.urlsplit(url).netloc
+        session = self._sessions.get(host)
+        if session is not None:
+            return session
+        
+        with self._sessions_lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.headers['User-Agent'] = USER_AGENT
+                if not self.keep_alive:
+                    session.headers['Connection'] = 'close'
+                self._sessions[host] = session
+                logger.debug(f"Created pooled session for {host} (pool size: {self.pool_size})")
+        return session
+    
+    def _transport_session(self, url: str):
+        """
+        Get the session that sends a request: the pooled one, recording into or replaced by the fixtures
+        
+        Args:
+            url: Request URL
+        
+        Returns:
+            requests.Session, RecordingSession or ReplaySession
+        """
+        if self.transport == 'replay':
+            return ReplaySession(self.fixtures)
+        session = self._get_session(url)
+        if self.transport == 'record':
+            return RecordingSession(session, self.fixtures)
+        return session
+    
+    
+    def _run(self, step: Step, deadline: Union[Deadline, float, None] = None) -> Any:
+        """
+        Drive a step to completion with blocking requests; started steps run on the probe thread pool
+        
+        Args:
+            step: Lookup step
+            deadline: Latency budget (Deadline or seconds) for all HTTP calls of the step
+        
+        Returns:
+            The step's result
+        """
+        with deadline_scope(deadline):
+            result, error = None, None
+            while True:
+                try:
+                    op = step.throw(error) if error is not None else step.send(result)
+                except StopIteration as stop:
+                    return stop.value
+                try:
+                    result, error = self._perform(op), None
+                except BaseException as e:
+                    result, error = None, e
+    
+    def _perform(self, op: Any) -> Any:
+        """Perform one operation yielded by a step"""
+        if isinstance(op, Send):
+            return self._send(op)
+        if isinstance(op, Sleep):
+            time.sleep(op.seconds)
+            return None
+        if isinstance(op, Start):
+            return Handle(self._submit(self._run, op.step, op.deadline), op.deadline)
+        if isinstance(op, Wait):
+            if not op.handles:
+                return set()
+            futures = {handle.future: handle for handle in op.handles}
+            done, _ = wait(futures, timeout=op.timeout, return_when=FIRST_COMPLETED if op.first else ALL_COMPLETED)
+            return {futures[future] for future in done}
+        if isinstance(op, Cancel):
+            for handle in op.handles:
+                handle.cancel()
+            return None
+        if isinstance(op, Shared):
+            return self._flights.do(op.key, lambda: self._run(op.step))
+        if isinstance(op, Background):
+            self._get_refresh_executor().submit(self._run_detached, op.step)
+            return None
+        if isinstance(op, Blocking):
+            return op.function(*op.args)
+        raise TypeError(f"Unknown step operation: {op!r}")
+    
+    def _send(self, op: Send) -> Tuple[int, Any]:
+        """
+        Send one request
+        
+        Returns:
+            Tuple of (HTTP status, decoded JSON body or None)
+        
+        Raises:
+            RequestFailed: On connection errors and timeouts
+            FixtureMissing: In replay mode, for a request that was never recorded
+        """
+        try:
+            response = self._transport_session(op.url).get(op.url, params=op.params, timeout=op.timeout, verify=self.verify)
+        except FixtureMissing:
+            raise
+        except Exception as e:
+            raise RequestFailed(str(e)) from e
+        body = None
+        if response.status_code == 200:
+            try:
+                body = response.json()
+            except ValueError as e:
+                logger.debug(f"Invalid JSON from {op.url}: {e}")
+        return response.status_code, body
+    
+    def _run_detached(self, step: Step) -> Any:
+        """Run a step without any lookup deadline (background refreshes)"""
+        with detached_scope():
+            return self._run(step)
+    
+    def _submit(self, fn: Callable, *args) -> Future:
+        """Run fn on the worker pool with the caller's context, so the lookup deadline applies there too"""
+        return self._get_executor().submit(contextvars.copy_context().run, fn, *args)
+    
+    def _make_request(self, url: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Make a request to Wikipedia API (see WikipediaClientBase._request)
+        
+        Args:
+            url: Wikipedia API URL
+            params: Optional query parameters
+        
+        Returns:
+            API response data, PageNotFound for HTTP 404 or empty dict on error
+        """
+        return self._run(self._request(url, params))
+    
+    def warm_up(self, background: bool = False) -> Dict[str, bool]:
+        """
+        Open a pooled connection to every configured Wikipedia host so the first
+        visitor lookup does not pay for the TCP/TLS handshake
+        
+        Args:
+            background: Run the warm-up in a daemon thread and return immediately
+        
+        Returns:
+            Language code -> whether the host answered (empty dict in background mode or offline)
+        """
+        if background:
+            threading.Thread(target=self.warm_up, name="wikipedia-warm-up", daemon=True).start()
+            return {}
+        
+        if self.backend == 'offline' or self.transport == 'replay':
+            return {}
+        
+        results = {}
+        for lang in self.base_urls:
+            params = {'action': 'query', 'meta': 'siteinfo', 'format': 'json'}
+            results[lang] = bool(self._make_request(self._api_url(lang), params=params))
+        logger.info(f"Wikipedia connection warm-up finished: {results}")
+        return results
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the bounded thread pool used for concurrent probes, creating it on first use"""
+        if self._executor is None:
+            with self._sessions_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                        thread_name_prefix="wikipedia-probe")
+        return self._executor
+    
+    def _get_refresh_executor(self) -> ThreadPoolExecutor:
+        """Get the small thread pool running background cache refreshes, creating it on first use"""
+        if self._refresh_executor is None:
+            with self._sessions_lock:
+                if self._refresh_executor is None:
+                    self._refresh_executor = ThreadPoolExecutor(max_workers=REFRESH_WORKERS,
+                                                                thread_name_prefix="wikipedia-refresh")
+        return self._refresh_executor
+    
+    def close(self):
+        """Close all pooled sessions, the probe thread pool and the background refresh threads"""
+        with self._sessions_lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+            if self._refresh_executor is not None:
+                self._refresh_executor.shutdown(wait=False, cancel_futures=True)
+                self._refresh_executor = None
+
 # Global instance for easy import
-wikipedia_client = WikipediaClient()
+wikipedia_client = WikipediaClient(ClientConfig.from_env())
@@ -0,0 +1,145 @@
+"""
+Minimal local HTTPS stand-in for Wikipedia used by the benchmark scripts
+Serves /api/rest_v1/page/summary/{title} and /w/api.php with canned artwork data.
+Every requested title exists; full-text searches return `search_hits` ranked pages.
+"""
+import json
+import os
+import socket
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+
+SAMPLE_EXTRACT = (
+    "{title} ist ein Gemälde, das als eines der bekanntesten Kunstwerke der Malerei gilt. "
+    "Das Ölgemälde auf Leinwand hängt heute im Museum und zieht jedes Jahr Millionen Besucher an."
+)
+
+
+def create_self_signed_cert(directory: str) -> Tuple[str, str]:
+    """
+    Create a self-signed certificate for localhost with the openssl CLI
+
+    Args:
+        directory: Directory to write cert.pem and key.pem into
+
+    Returns:
+        Tuple of (certificate path, key path)
+    """
+    cert_path = os.path.join(directory, "cert.pem")
+    key_path = os.path.join(directory, "key.pem")
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+            "-keyout", key_path, "-out", cert_path, "-days", "1",
+            "-subj", "/CN=localhost",
+            "-addext", "subjectAltName=DNS:localhost,IP:127.0.0.1"
+        ],
+        check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    return cert_path, key_path
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Answers Wikipedia-style requests with canned JSON"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        parsed = urllib.parse.urlsplit(self.path)
+        if parsed.path.startswith("/api/rest_v1/page/summary/"):
+            title = urllib.parse.unquote(parsed.path.rsplit("/", 1)[-1]).replace("_", " ")
+            payload = {"title": title, "extract": SAMPLE_EXTRACT.format(title=title)}
+        elif parsed.path == "/w/api.php":
+            payload = self._api_payload(urllib.parse.parse_qs(parsed.query))
+        else:
+            self.send_error(404)
+            return
+
+        time.sleep(self.server.response_latency)
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _api_payload(self, params: dict) -> dict:
+        """Answer titles= and generator=search queries (formatversion=2 shape)"""
+        if "gsrsearch" in params:
+            query = params["gsrsearch"][0]
+            limit = int(params.get("gsrlimit", ["5"])[0])
+            titles = [query] + [f"{query} ({n})" for n in range(1, min(limit, self.server.search_hits))]
+        elif "titles" in params:
+            titles = params["titles"][0].split("|")
+        else:
+            return {"batchcomplete": True, "query": {"pages": []}}
+
+        pages = [
+            {
+                "pageid": abs(hash(title)) % 10 ** 8,
+                "title": title,
+                "index": index,
+                "extract": SAMPLE_EXTRACT.format(title=title),
+                "fullurl": f"https://localhost/wiki/{urllib.parse.quote(title)}"
+            }
+            for index, title in enumerate(titles, start=1)
+        ]
+        return {"batchcomplete": True, "query": {"pages": pages}}
+
+    def log_message(self, format, *args):
+        pass
+
+
+class HTTPSStandInServer(ThreadingHTTPServer):
+    """
+    Threaded HTTPS server that charges `connect_latency` once per new connection,
+    simulating the round trips of a TCP+TLS handshake to a remote host
+    """
+
+    daemon_threads = True
+
+    def __init__(self, ssl_context: ssl.SSLContext, connect_latency: float = 0.0,
+                 response_latency: float = 0.0, search_hits: int = 5):
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.ssl_context = ssl_context
+        self.connect_latency = connect_latency
+        self.response_latency = response_latency
+        self.search_hits = search_hits
+        self.connections = 0
+
+    def finish_request(self, request, client_address):
+        self.connections += 1
+        time.sleep(self.connect_latency)
+        request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            request = self.ssl_context.wrap_socket(request, server_side=True)
+        except (ssl.SSLError, OSError):
+            return
+        super().finish_request(request, client_address)
+
+
+class StandIn:
+    """Context manager running an HTTPSStandInServer in a background thread"""
+
+    def __init__(self, connect_latency: float = 0.0, response_latency: float = 0.0, search_hits: int = 5):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.cert_path, key_path = create_self_signed_cert(self._tmpdir.name)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(self.cert_path, key_path)
+        self.server = HTTPSStandInServer(context, connect_latency, response_latency, search_hits)
+        self.base_url = f"https://localhost:{self.server.server_address[1]}"
+
+    def __enter__(self) -> "StandIn":
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+        self._tmpdir.cleanup()
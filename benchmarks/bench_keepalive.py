@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-lookup latency of WikipediaClient with and without pooled keep-alive sessions
+Runs against a local HTTPS stand-in, so no network access is needed.
+
+Usage:
+    python benchmarks/bench_keepalive.py --lookups 200 --connect-latency 0.02
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+import urllib.parse
+
+# Add actions directory to path so that the utils package can be imported
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'actions'))
+
+from _standin import StandIn
+from utils.wikipedia_client import WikipediaClient
+
+TITLES = ["Mona_Lisa", "The_Starry_Night", "Guernica_(Picasso)", "Der_Schrei", "American_Gothic"]
+
+
+def run_lookups(client: WikipediaClient, lookups: int) -> list:
+    """Run summary lookups and return per-lookup latencies in milliseconds"""
+    latencies = []
+    for i in range(lookups):
+        title = TITLES[i % len(TITLES)]
+        url = f"{client.base_urls['de']}/api/rest_v1/page/summary/{urllib.parse.quote(title)}"
+        start = time.perf_counter()
+        data = client._make_request(url)
+        latencies.append((time.perf_counter() - start) * 1000)
+        if not data:
+            raise RuntimeError(f"Stand-in returned no data for {title}")
+    return latencies
+
+
+def report(label: str, latencies: list, connections: int):
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(f"{label:<22} mean {statistics.mean(latencies):7.2f} ms | "
+          f"p50 {statistics.median(latencies):7.2f} ms | p95 {p95:7.2f} ms | "
+          f"connections opened: {connections}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lookups", type=int, default=200, help="Lookups per mode")
+    parser.add_argument("--connect-latency", type=float, default=0.02,
+                        help="Simulated seconds per new TCP+TLS connection")
+    parser.add_argument("--response-latency", type=float, default=0.0,
+                        help="Simulated server processing seconds per request")
+    args = parser.parse_args()
+
+    with StandIn(args.connect_latency, args.response_latency) as standin:
+        base_urls = {'de': standin.base_url, 'en': standin.base_url}
+
+        print(f"🏁 {args.lookups} lookups per mode against {standin.base_url} "
+              f"(connect latency {args.connect_latency * 1000:.0f} ms)")
+        print("-" * 90)
+
+        for label, keep_alive in [("new connection/lookup", False), ("pooled keep-alive", True)]:
+            client = WikipediaClient(keep_alive=keep_alive, base_urls=base_urls, verify=standin.cert_path)
+            before = standin.server.connections
+            latencies = run_lookups(client, args.lookups)
+            report(label, latencies, standin.server.connections - before)
+            client.close()
+
+
+if __name__ == "__main__":
+    main()
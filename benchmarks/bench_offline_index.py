@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark: build time and per-lookup latency of the offline extract index
+Generates a synthetic dump, so no real Wikipedia dump is needed.
+
+Usage:
+    python benchmarks/bench_offline_index.py --pages 100000 --lookups 100000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Add actions directory to path so that the utils package can be imported
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'actions'))
+
+from utils.offline_index import OfflineIndex, build_offline_index
+
+ARTWORK_EXTRACT = "{title} ist ein Gemälde, das heute im Museum hängt. Das Ölgemälde auf Leinwand zählt zu den bekanntesten Werken."
+ARTIST_EXTRACT = "{title} war ein deutscher Maler und Grafiker. Seine Werke hängen in zahlreichen Museen und Galerien."
+OTHER_EXTRACT = "{title} ist eine Stadt mit rund 20.000 Einwohnern und liegt an einem Fluss im Norden des Landes."
+
+
+def write_dump(path: str, pages: int):
+    """Write a synthetic dump with a mix of artwork, artist and unrelated pages"""
+    templates = [ARTWORK_EXTRACT, ARTIST_EXTRACT, OTHER_EXTRACT]
+    with open(path, "w", encoding="utf-8") as dump:
+        for n in range(pages):
+            title = f"Seite {n}"
+            dump.write(json.dumps({"title": title, "extract": templates[n % 3].format(title=title),
+                                   "lang": "de", "pageid": n}, ensure_ascii=False) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=100000, help="Pages in the synthetic dump")
+    parser.add_argument("--lookups", type=int, default=100000, help="Timed lookups (hits and misses)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        dump_path = os.path.join(tmpdir, "dump.jsonl")
+        write_dump(dump_path, args.pages)
+
+        start = time.perf_counter()
+        stats = build_offline_index(dump_path, os.path.join(tmpdir, "index"))
+        print(f"🏗️  build: {stats['read']} pages read, {stats['indexed']} indexed in {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        index = OfflineIndex(os.path.join(tmpdir, "index"))
+        print(f"📂 open: {(time.perf_counter() - start) * 1e6:.0f} µs")
+
+        titles = [f"seite_{random.randrange(args.pages)}" for _ in range(args.lookups)]
+        start = time.perf_counter()
+        hits = sum(index.get("de", title) is not None for title in titles)
+        elapsed = time.perf_counter() - start
+        print(f"🔎 lookup: {elapsed / args.lookups * 1e6:.1f} µs mean over {args.lookups} lookups ({hits} hits)")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
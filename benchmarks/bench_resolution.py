@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark: HTTP calls and wall time per lookup for each candidate resolution mode
+Replays every artwork and artist entity from tests/test_cases.py and new_test_cases.py
+through WikipediaClient.search_artwork / search_artist.
+
+By default the live Wikipedia APIs are used (network access required). With --standin
+a local HTTPS stand-in answers instead; call counts are then only indicative, because
+every title the stand-in is asked for exists. With --transport record the live answers
+are written to a fixture directory; --transport replay runs the same comparison from those
+fixtures offline and deterministically (wall times then measure client overhead only).
+
+Usage:
+    python benchmarks/bench_resolution.py
+    python benchmarks/bench_resolution.py --standin --response-latency 0.05
+    python benchmarks/bench_resolution.py --modes variants search
+    python benchmarks/bench_resolution.py --transport record --fixtures benchmarks/fixtures
+    python benchmarks/bench_resolution.py --transport replay --fixtures benchmarks/fixtures
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+from typing import List, Tuple
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Project root for the test case providers, actions directory for the utils package
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'actions'))
+
+from _standin import StandIn
+from new_test_cases import NewTestCaseProvider
+from tests.test_cases import TestCaseProvider
+from utils.http_fixtures import TRANSPORTS, FixtureStore
+from utils.wikipedia_client import RESOLUTION_MODES, WikipediaClient
+
+ARTWORK_CATEGORIES = {"artwork", "artwork_info"}
+ARTIST_CATEGORIES = {"artist", "artist_info"}
+
+
+def load_corpus() -> List[Tuple[str, str]]:
+    """
+    Collect unique (kind, name) lookups from the conversation test cases
+
+    Returns:
+        List of ("artwork" | "artist", entity name)
+    """
+    test_cases = TestCaseProvider().get_all_test_cases() + NewTestCaseProvider().get_all_test_cases()
+    corpus = []
+    for test_case in test_cases:
+        category = test_case.get("category")
+        if category in ARTWORK_CATEGORIES:
+            kind = "artwork"
+        elif category in ARTIST_CATEGORIES:
+            kind = "artist"
+        else:
+            continue
+        for entity in test_case.get("expected_entities", []):
+            if (kind, entity) not in corpus:
+                corpus.append((kind, entity))
+    return corpus
+
+
+def run_mode(client: WikipediaClient, mode: str, corpus: List[Tuple[str, str]]) -> dict:
+    """Run every lookup of the corpus in one resolution mode and collect per-lookup stats"""
+    calls, latencies, found = [], [], 0
+    for kind, name in corpus:
+        client.reset_metrics()
+        start = time.perf_counter()
+        if kind == "artwork":
+            result = client.search_artwork(name, resolution=mode)
+        else:
+            result = client.search_artist(name, resolution=mode)
+        latencies.append((time.perf_counter() - start) * 1000)
+        calls.append(client.get_metrics().get('http_requests', 0))
+        found += bool(result)
+    return {"calls": calls, "latencies": latencies, "found": found}
+
+
+def report(mode: str, stats: dict):
+    calls, latencies = stats["calls"], stats["latencies"]
+    ordered = sorted(latencies)
+    p95 = ordered[max(int(len(ordered) * 0.95) - 1, 0)]
+    print(f"{mode:<10} calls total {sum(calls):5d} | calls/lookup mean {statistics.mean(calls):5.2f} "
+          f"max {max(calls):3d} | wall mean {statistics.mean(latencies):8.1f} ms "
+          f"p95 {p95:8.1f} ms | found {stats['found']}/{len(calls)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", choices=RESOLUTION_MODES, default=list(RESOLUTION_MODES),
+                        help="Resolution modes to compare")
+    parser.add_argument("--top-k", type=int, default=5, help="Search hits fetched per language in 'search' mode")
+    parser.add_argument("--standin", action="store_true", help="Use the local HTTPS stand-in instead of Wikipedia")
+    parser.add_argument("--response-latency", type=float, default=0.05,
+                        help="Simulated server seconds per request (stand-in only)")
+    parser.add_argument("--transport", choices=TRANSPORTS, default="live",
+                        help="Send requests, record them into --fixtures, or replay them from there")
+    parser.add_argument("--fixtures", default="benchmarks/fixtures", help="Fixture directory for record/replay")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    corpus = load_corpus()
+    print(f"🏁 {len(corpus)} lookups "
+          f"({sum(kind == 'artwork' for kind, _ in corpus)} artworks, "
+          f"{sum(kind == 'artist' for kind, _ in corpus)} artists) per mode")
+    print("-" * 110)
+
+    fixtures = FixtureStore(args.fixtures) if args.transport != "live" else None
+    standin = StandIn(response_latency=args.response_latency).__enter__() if args.standin else None
+    try:
+        for mode in args.modes:
+            transport = {"transport": args.transport, "fixtures": fixtures}
+            if standin:
+                client = WikipediaClient(base_urls={'de': standin.base_url, 'en': standin.base_url},
+                                         verify=standin.cert_path, search_top_k=args.top_k, **transport)
+            else:
+                client = WikipediaClient(search_top_k=args.top_k, **transport)
+            report(mode, run_mode(client, mode, corpus))
+            client.close()
+    finally:
+        if standin:
+            standin.__exit__(None, None, None)
+
+
+if __name__ == "__main__":
+    main()
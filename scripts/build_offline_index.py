@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Build the offline Wikipedia extract index used by WIKIPEDIA_BACKEND=offline
+
+The dump is a JSONL file (optionally .bz2 compressed) with one page per line:
+    {"title": "Mona Lisa", "extract": "Die Mona Lisa ist ...", "lang": "de",
+     "description": "...", "url": "https://de.wikipedia.org/wiki/Mona_Lisa", "pageid": 3185}
+Only pages passing is_artwork_content or the artist heuristics are kept.
+
+Usage:
+    python scripts/build_offline_index.py dewiki_extracts.jsonl.bz2 --output .cache/offline_index
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add actions directory to path so that the utils package can be imported
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'actions'))
+
+from utils.offline_index import build_offline_index
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("dump", help="Extracts dump (.jsonl or .jsonl.bz2)")
+    parser.add_argument("--output", default=".cache/offline_index", help="Index directory")
+    parser.add_argument("--default-lang", default="de", help="Language for records without 'lang'")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stats = build_offline_index(args.dump, args.output, args.default_lang)
+    print(f"📚 {stats['read']} pages read, {stats['indexed']} indexed "
+          f"({stats['artworks']} artworks, {stats['artists']} artists, {stats['duplicates']} duplicates) "
+          f"in {time.perf_counter() - start:.1f}s -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Warm the Wikipedia response cache for the known catalog (KNOWN_ARTWORKS,
+WIKIPEDIA_ARTWORK_MAPPINGS, KNOWN_ARTISTS, ARTWORK_INFO)
+
+Fills the SQLite tier configured by WIKIPEDIA_CACHE_PATH, which the action server processes
+on this host read (the async client used by the actions shares the sync client's cache keys).
+Without WIKIPEDIA_CACHE_PATH there is nothing to fill and the script exits with status 2.
+Run it before opening hours or after a deployment.
+With --revalidate, expired entries are first checked against the pages' current
+revision ids (one request per 50 pages) and only changed pages are fetched again.
+
+Usage:
+    python scripts/warm_cache.py --concurrency 16
+    python scripts/warm_cache.py --revalidate
+"""
+import argparse
+import os
+import sys
+
+# Add actions directory to path so that the utils package can be imported
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'actions'))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from utils.cache_warmup import format_warm_up_report, warm_cache
+from utils.wikipedia_client import wikipedia_client
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("WIKIPEDIA_WARMUP_CONCURRENCY", "8")),
+                        help="Lookups running at the same time")
+    parser.add_argument("--languages", nargs="+", default=["de", "en"],
+                        help="Languages whose page summaries are warmed")
+    parser.add_argument("--revalidate", action="store_true",
+                        help="Revalidate expired cache entries by revision id before warming")
+    args = parser.parse_args()
+
+    if wikipedia_client.cache is not None and wikipedia_client.cache.disk is None:
+        print("❌ WIKIPEDIA_CACHE_PATH is not set: the warmed entries would only live in this process")
+        sys.exit(2)
+
+    if args.revalidate:
+        revalidation = wikipedia_client.revalidate_expired()
+        print(f"🔁 Revalidated {revalidation['checked']} expired entries: {revalidation['unchanged']} unchanged, "
+              f"{revalidation['changed']} changed ({revalidation['refetched']} refetched), {revalidation['unknown']} unknown")
+
+    report = warm_cache(wikipedia_client, concurrency=args.concurrency, languages=args.languages)
+    print(format_warm_up_report(report))
+    wikipedia_client.close()
+    sys.exit(1 if report['failed'] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Local Wikipedia stand-in answering from recorded fixtures
+
+Serves /<lang>/api/rest_v1/page/summary/<title> and /<lang>/w/api.php from the
+fixture directory written by the 'record' transport, with configurable latency,
+so load tests and benchmarks run against realistic answers without touching
+Wikipedia. Unrecorded requests get a 404.
+
+Record fixtures by running the bot or the cache warm-up with the cache disabled:
+    WIKIPEDIA_TRANSPORT=record WIKIPEDIA_CACHE_ENABLED=false python scripts/warm_cache.py
+
+Serve them and point the action server at the stand-in:
+    python scripts/wikipedia_standin.py --port 8765 --latency 0.08 --jitter 0.04
+    WIKIPEDIA_BASE_URL=http://127.0.0.1:8765/{lang} rasa run actions
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add actions directory to path so that the utils package can be imported
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'actions'))
+
+from utils.http_fixtures import FixtureStore, split_wikipedia_url
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Answers Wikipedia-style requests with the recorded response"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        parsed = urllib.parse.urlsplit(self.path)
+        lang, path = split_wikipedia_url(parsed.path)
+        query = urllib.parse.parse_qs(parsed.query, keep_blank_values=True)
+        params = {key: values[0] for key, values in query.items()}
+        recorded = self.server.store.lookup(lang, path, params or None)
+        status, payload = recorded if recorded else (404, {"type": "not_found", "path": self.path})
+
+        time.sleep(max(0.0, self.server.latency + random.uniform(-self.server.jitter, self.server.jitter)))
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.served += 1
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the fixture store and latency settings"""
+
+    daemon_threads = True
+
+    def __init__(self, store: FixtureStore, host: str = "127.0.0.1", port: int = 8765,
+                 latency: float = 0.0, jitter: float = 0.0, verbose: bool = False):
+        super().__init__((host, port), FixtureHandler)
+        self.store = store
+        self.latency = latency
+        self.jitter = jitter
+        self.verbose = verbose
+        self.served = 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", default=os.getenv("WIKIPEDIA_FIXTURES", "benchmarks/fixtures"),
+                        help="Fixture directory written by the record transport")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Uniform +/- variation of the latency")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    store = FixtureStore(args.fixtures)
+    if not len(store):
+        print(f"⚠️  No fixtures in {args.fixtures}; every request will get a 404")
+    server = FixtureServer(store, args.host, args.port, args.latency, args.jitter, args.verbose)
+    print(f"🏛️  Wikipedia stand-in with {len(store)} fixtures on http://{args.host}:{server.server_address[1]}/{{lang}}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Served {server.served} requests ({store.misses} without fixture)")
+
+
+if __name__ == "__main__":
+    main()
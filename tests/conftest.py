@@ -0,0 +1,8 @@
+"""
+pytest configuration for the unit tests of the action server utilities
+The utils package is imported like the scripts and benchmarks do, from the actions directory.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'actions'))
@@ -0,0 +1,228 @@
+"""
+In-memory stand-in for German and English Wikipedia used by the client unit tests
+It answers the requests the clients send (REST summaries, action=query title lookups,
+langlinks and revisions, action=parse sections) and records every request, so tests can
+count round trips per language without a network.
+"""
+import asyncio
+import threading
+import time
+import urllib.parse
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+import requests
+
+from utils.http_fixtures import AsyncFixtureResponse, FixtureResponse, _AsyncFixtureContext, split_wikipedia_url
+
+
+def _normalize(title: str) -> str:
+    """Title as Wikipedia normalizes it (spaces, first letter upper case)"""
+    title = title.replace('_', ' ').strip()
+    return title[:1].upper() + title[1:]
+
+
+class FakeWikipedia:
+    """Pages of a fake de/en Wikipedia and the requests sent to it"""
+    
+    def __init__(self):
+        self.pages: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.redirects: Dict[Tuple[str, str], str] = {}
+        self.requests: List[Tuple[str, str]] = []
+        self.delays: Dict[str, float] = {}
+        self.slow_titles: Dict[Tuple[str, str], float] = {}
+        self.failing: set = set()
+        self._next_pageid = 100
+        self._lock = threading.Lock()
+    
+    def add(self, lang: str, title: str, extract: str, langlinks: Optional[Dict[str, str]] = None,
+            redirects: Tuple[str, ...] = (), sections: Optional[List[Tuple[str, str]]] = None,
+            revision: int = 1, pageid: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Add a page
+        
+        Args:
+            lang: Language code
+            title: Canonical title
+            extract: Intro extract
+            langlinks: Language code -> title of the same page there
+            redirects: Titles redirecting to the page
+            sections: (heading, paragraph text) of the sections after the intro
+            revision: Current revision id
+            pageid: Page id (assigned if not given)
+        
+        Returns:
+            The stored page
+        """
+        if pageid is None:
+            self._next_pageid += 1
+            pageid = self._next_pageid
+        page = {'title': title, 'extract': extract, 'langlinks': langlinks or {}, 'sections': sections or [],
+                'revision': revision, 'pageid': pageid}
+        self.pages[(lang, title)] = page
+        for source in redirects:
+            self.redirects[(lang, _normalize(source))] = title
+        return page
+    
+    def count(self, lang: Optional[str] = None, kind: Optional[str] = None) -> int:
+        """Number of requests sent, optionally only to one language or of one kind ('summary', 'query', 'parse')"""
+        return sum(1 for sent_lang, sent_kind in self.requests
+                   if lang in (None, sent_lang) and kind in (None, sent_kind))
+    
+    def delay(self, url: str, params: Optional[Dict[str, Any]] = None) -> float:
+        """Seconds to answer a request after: the language's delay, or the requested title's in slow_titles"""
+        lang, path = split_wikipedia_url(url)
+        titles = [urllib.parse.unquote(path.rsplit('/', 1)[-1])] + str((params or {}).get('titles', '')).split('|')
+        return max([self.delays.get(lang, 0)] + [self.slow_titles.get((lang, _normalize(title)), 0) for title in titles if title])
+    
+    def _resolve(self, lang: str, title: str) -> Tuple[str, Optional[str], Optional[Dict[str, Any]]]:
+        """(normalized title, redirect target or None, page or None)"""
+        normalized = _normalize(title)
+        target = self.redirects.get((lang, normalized))
+        return normalized, target, self.pages.get((lang, target or normalized))
+    
+    def _by_pageid(self, lang: str, pageid: Any) -> Optional[Dict[str, Any]]:
+        return next((page for (page_lang, _), page in self.pages.items()
+                     if page_lang == lang and str(page['pageid']) == str(pageid)), None)
+    
+    def _query_page(self, lang: str, page: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, Any]:
+        prop = str(params.get('prop', ''))
+        if prop == 'revisions':
+            return {'title': page['title'], 'pageid': page['pageid'], 'revisions': [{'revid': page['revision']}]}
+        answer = {'title': page['title'], 'pageid': page['pageid']}
+        if 'extracts' in prop:
+            answer.update(extract=page['extract'], lastrevid=page['revision'],
+                          fullurl=f"https://{lang}.wikipedia.org/wiki/{urllib.parse.quote(page['title'])}")
+        if 'langlinks' in prop:
+            other = params.get('lllang')
+            answer['langlinks'] = [{'lang': link_lang, 'title': link_title}
+                                   for link_lang, link_title in page['langlinks'].items()
+                                   if other in (None, link_lang)]
+        return answer
+    
+    def _query(self, lang: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        if params.get('meta') == 'siteinfo':
+            return {'query': {'general': {'lang': lang}}}
+        if params.get('generator') == 'search':
+            # Pages mentioning any word of the search text, in insertion order
+            words = [word for word in str(params['gsrsearch']).lower().split() if len(word) > 3]
+            hits = [page for (page_lang, _), page in self.pages.items()
+                    if page_lang == lang and any(word in f"{page['title']} {page['extract']}".lower() for word in words)]
+            limit = int(params.get('gsrlimit', 10))
+            return {'query': {'pages': [dict(self._query_page(lang, page, params), index=rank)
+                                        for rank, page in enumerate(hits[:limit], start=1)]}}
+        if params.get('pageids'):
+            pages = []
+            for pageid in str(params['pageids']).split('|'):
+                page = self._by_pageid(lang, pageid)
+                pages.append(self._query_page(lang, page, params) if page else {'pageid': int(pageid), 'missing': True})
+            return {'query': {'pages': pages}}
+        normalized, redirects, pages = [], [], []
+        for title in str(params.get('titles', '')).split('|'):
+            if not title:
+                continue
+            canonical, target, page = self._resolve(lang, title)
+            if canonical != title:
+                normalized.append({'from': title, 'to': canonical})
+            if target:
+                redirects.append({'from': canonical, 'to': target})
+            pages.append(self._query_page(lang, page, params) if page else {'title': target or canonical, 'missing': True})
+        query = {'pages': pages}
+        if normalized:
+            query['normalized'] = normalized
+        if redirects:
+            query['redirects'] = redirects
+        return {'query': query}
+    
+    def _parse(self, lang: str, params: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        page = self._by_pageid(lang, params.get('pageid'))
+        if page is None:
+            return 200, {'error': {'code': 'nosuchpageid'}}
+        parsed = {'title': page['title'], 'pageid': page['pageid'], 'revid': page['revision']}
+        if 'section' in params:
+            heading, text = page['sections'][int(params['section']) - 1]
+            parsed['text'] = f"<div><h2>{heading}</h2><p>{text}</p></div>"
+        else:
+            parsed['sections'] = [{'index': str(number), 'toclevel': 1, 'line': heading}
+                                  for number, (heading, _) in enumerate(page['sections'], start=1)]
+        return 200, {'parse': parsed}
+    
+    def answer(self, url: str, params: Optional[Dict[str, Any]] = None) -> Tuple[int, Any]:
+        """
+        Answer (and record) one request; the sessions turn answers of failing languages into connection errors
+        
+        Returns:
+            Tuple of (HTTP status, JSON body)
+        """
+        lang, path = split_wikipedia_url(url)
+        params = params or {}
+        summary_prefix = '/api/rest_v1/page/summary/'
+        kind = 'summary' if path.startswith(summary_prefix) else str(params.get('action', 'other'))
+        with self._lock:
+            self.requests.append((lang, kind))
+        if kind == 'summary':
+            _, _, page = self._resolve(lang, path[len(summary_prefix):])
+            if page is None:
+                return 404, {}
+            return 200, {'title': page['title'], 'pageid': page['pageid'], 'extract': page['extract'],
+                         'revision': str(page['revision']), 'description': ''}
+        if kind == 'parse':
+            return self._parse(lang, params)
+        return 200, self._query(lang, params)
+    
+    def session(self) -> 'FakeSession':
+        """requests.Session stand-in for WikipediaClient"""
+        return FakeSession(self)
+    
+    def async_session(self) -> 'AsyncFakeSession':
+        """aiohttp.ClientSession stand-in for AsyncWikipediaClient"""
+        return AsyncFakeSession(self)
+    
+    def install(self, client) -> 'FakeWikipedia':
+        """Route all requests of a sync or async client to this fake"""
+        if asyncio.iscoroutinefunction(client._run):
+            session = self.async_session()
+            client._transport_session = lambda: session
+        else:
+            session = self.session()
+            client._transport_session = lambda url: session
+        return self
+
+
+class FakeSession:
+    """Sync session answering from a FakeWikipedia, with the configured per-language delays"""
+    
+    def __init__(self, wiki: FakeWikipedia):
+        self.wiki = wiki
+    
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> FixtureResponse:
+        lang, _ = split_wikipedia_url(url)
+        status, body = self.wiki.answer(url, params)
+        time.sleep(self.wiki.delay(url, params))
+        if lang in self.wiki.failing:
+            raise requests.ConnectionError(f"{lang} Wikipedia unreachable")
+        return FixtureResponse(status, body)
+
+
+class AsyncFakeSession:
+    """Async session answering from a FakeWikipedia, with the configured per-language delays"""
+    
+    def __init__(self, wiki: FakeWikipedia):
+        self.wiki = wiki
+    
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> _AsyncFixtureContext:
+        async def produce() -> AsyncFixtureResponse:
+            lang, _ = split_wikipedia_url(url)
+            status, body = self.wiki.answer(url, params)
+            await asyncio.sleep(self.wiki.delay(url, params))
+            if lang in self.wiki.failing:
+                raise aiohttp.ClientConnectionError(f"{lang} Wikipedia unreachable")
+            return AsyncFixtureResponse(status, body)
+        return _AsyncFixtureContext(produce)
+
+
+def run(result: Any) -> Any:
+    """Result of a client call, awaited if the client is async"""
+    if asyncio.iscoroutine(result):
+        return asyncio.run(result)
+    return result
@@ -0,0 +1,34 @@
+"""
+Catalog warm-up into the SQLite tier, as scripts/warm_cache.py runs it before opening hours
+"""
+import os
+
+from utils.async_wikipedia_client import AsyncWikipediaClient
+from utils.cache_warmup import warm_cache
+from utils.response_cache import ResponseCache
+from utils.wikipedia_client import WikipediaClient
+
+from .fake_wikipedia import FakeWikipedia, run
+
+MONA_LISA = 'Die Mona Lisa ist ein weltberühmtes Ölgemälde von Leonardo da Vinci.'
+PICASSO = 'Pablo Picasso war ein spanischer Maler, Grafiker und Bildhauer.'
+
+
+def test_warmed_sqlite_tier_answers_the_action_server(tmp_path):
+    path = os.path.join(str(tmp_path), 'cache.sqlite3')
+    wiki = FakeWikipedia()
+    wiki.add('de', 'Mona Lisa', MONA_LISA)
+    wiki.add('de', 'Pablo Picasso', PICASSO)
+    warmer = WikipediaClient(cache=ResponseCache(path=path), max_retries=0)
+    wiki.install(warmer)
+    report = warm_cache(warmer, concurrency=4, languages=['de'])
+    assert report['resolved'] > 0 and wiki.count() > 0
+    
+    # An action server worker started afterwards: its own cache instance, nothing in memory
+    live = FakeWikipedia()
+    client = AsyncWikipediaClient(cache=ResponseCache(path=path))
+    live.install(client)
+    assert run(client.search_artwork('Mona Lisa'))['extract'] == MONA_LISA
+    assert run(client.search_artist('Picasso'))['title'] == 'Pablo Picasso'
+    assert run(client.get_summary('Mona Lisa'))['title'] == 'Mona Lisa'
+    assert live.count() == 0
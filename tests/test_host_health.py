@@ -0,0 +1,105 @@
+"""
+Circuit breaker state transitions, including half-open trials that are skipped or cancelled
+"""
+import asyncio
+import time
+
+from utils.async_wikipedia_client import AsyncWikipediaClient
+from utils.host_health import HostHealth
+from utils.wikipedia_client import WikipediaClient
+
+from .fake_wikipedia import FakeWikipedia
+
+MONA_LISA = 'Die Mona Lisa ist ein Ölgemälde von Leonardo da Vinci.'
+
+
+def open_circuit(health: HostHealth):
+    for _ in range(health.failure_threshold):
+        health.record_failure()
+
+
+def test_breaker_opens_half_opens_and_closes():
+    health = HostHealth('de.wikipedia.org', failure_threshold=2, reset_timeout=0.05)
+    assert health.acquire() is False
+    open_circuit(health)
+    assert health.state == HostHealth.OPEN and health.acquire() is None
+    
+    time.sleep(0.06)
+    assert health.acquire() is True
+    assert health.state == HostHealth.HALF_OPEN
+    assert health.acquire() is None # only one trial at a time
+    health.record_success(0.01)
+    assert health.state == HostHealth.CLOSED and health.acquire() is False
+
+
+def test_failed_trial_reopens_the_circuit():
+    health = HostHealth('de.wikipedia.org', failure_threshold=2, reset_timeout=0.05)
+    open_circuit(health)
+    time.sleep(0.06)
+    assert health.acquire() is True
+    health.record_failure()
+    assert health.state == HostHealth.OPEN and health.opened_count == 2
+    assert health.acquire() is None
+
+
+def test_released_trial_lets_the_next_request_try():
+    health = HostHealth('de.wikipedia.org', failure_threshold=2, reset_timeout=0.05)
+    open_circuit(health)
+    time.sleep(0.06)
+    assert health.acquire() is True
+    health.release_trial()
+    assert health.state == HostHealth.HALF_OPEN
+    assert health.acquire() is True
+
+
+def half_open_client(cls, wiki: FakeWikipedia):
+    """Client whose German host circuit has just become ready for a trial request"""
+    client = cls(cache=None, max_retries=0, breaker_threshold=1, breaker_reset=0.05)
+    wiki.install(client)
+    open_circuit(client.health.for_url(client._api_url('de')))
+    time.sleep(0.06)
+    return client
+
+
+def test_trial_skipped_for_spent_budget_is_released():
+    wiki = FakeWikipedia()
+    wiki.add('de', 'Mona Lisa', MONA_LISA)
+    client = half_open_client(WikipediaClient, wiki)
+    
+    assert client.get_summary('Mona Lisa', deadline=0) == {}
+    assert wiki.count() == 0
+    # The skipped lookup must not hold the trial slot: the next one is sent and closes the circuit
+    assert client.get_summary('Mona Lisa')['title'] == 'Mona Lisa'
+    assert client.get_host_health()['de.wikipedia.org']['state'] == HostHealth.CLOSED
+
+
+def test_cancelled_trial_is_released():
+    wiki = FakeWikipedia()
+    wiki.add('de', 'Mona Lisa', MONA_LISA)
+    wiki.delays['de'] = 5
+    client = half_open_client(AsyncWikipediaClient, wiki)
+    health = client.health.for_url(client._api_url('de'))
+    
+    async def cancel_trial():
+        task = asyncio.ensure_future(client.get_summary('Mona Lisa'))
+        await asyncio.sleep(0.05)
+        assert health.acquire() is None # the trial is in flight
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+    
+    asyncio.run(cancel_trial())
+    assert wiki.count('de') == 1
+    assert health.state == HostHealth.HALF_OPEN
+    assert health.acquire() is True
+
+
+def test_spent_budget_does_not_touch_the_breaker():
+    wiki = FakeWikipedia()
+    wiki.add('de', 'Mona Lisa', MONA_LISA)
+    client = half_open_client(WikipediaClient, wiki)
+    
+    assert client.get_summary('Mona Lisa', deadline=0) == {}
+    metrics = client.get_metrics()
+    assert metrics['deadline_skips'] == 1 and metrics.get('circuit_open_skips', 0) == 0
+    # The breaker was never asked, so it has not moved to half-open for a request that was not sent
+    assert client.get_host_health()['de.wikipedia.org']['state'] == HostHealth.OPEN
@@ -0,0 +1,61 @@
+"""
+Record/replay transport: lookups recorded into a fixture directory replay without network
+access, and requests that were never recorded are reported instead of passing for a 404
+"""
+import asyncio
+
+import pytest
+
+from utils.async_wikipedia_client import AsyncWikipediaClient
+from utils.http_fixtures import FixtureStore
+from utils.response_cache import ResponseCache
+from utils.wikipedia_client import WikipediaClient
+
+from .fake_wikipedia import run
+from .test_wikipedia_client import museum_wikipedia
+
+CLIENTS = [WikipediaClient, AsyncWikipediaClient]
+
+
+def connect(client, session):
+    """Make a client's pooled session the given one; the transport still wraps or replaces it"""
+    if asyncio.iscoroutinefunction(client._run):
+        client._get_session = lambda: session
+    else:
+        client._get_session = lambda url: session
+
+
+def offline(*args):
+    raise AssertionError("replay must not open a connection")
+
+
+@pytest.mark.parametrize('cls', CLIENTS)
+def test_recorded_lookup_replays_without_network(cls, tmp_path):
+    wiki = museum_wikipedia()
+    recorder = cls(cache=None, max_retries=0, transport='record', fixtures=FixtureStore(str(tmp_path)))
+    connect(recorder, wiki.async_session() if cls is AsyncWikipediaClient else wiki.session())
+    recorded = run(recorder.search_artist('Picasso'))
+    assert recorded['title'] == 'Pablo Picasso'
+    
+    store = FixtureStore(str(tmp_path)) # reloaded from disk
+    assert len(store) > 0
+    replayer = cls(cache=None, max_retries=0, transport='replay', fixtures=store)
+    replayer._get_session = offline
+    sent = wiki.count()
+    
+    assert run(replayer.search_artist('Picasso')) == recorded
+    assert wiki.count() == sent and store.misses == 0
+
+
+@pytest.mark.parametrize('cls', CLIENTS)
+def test_replay_miss_is_reported_not_cached_as_missing(cls, tmp_path):
+    store = FixtureStore(str(tmp_path))
+    client = cls(cache=ResponseCache(), transport='replay', fixtures=store)
+    client._get_session = offline
+    
+    assert run(client.get_summary('Mona Lisa')) == {}
+    metrics = client.get_metrics()
+    assert metrics['replay_misses'] == 1 and store.misses == 1
+    assert 'retries' not in metrics
+    assert client.cache.get_negative('de', 'Mona Lisa') is None
+    assert client.health.for_url(client._api_url('de')).consecutive_failures == 0
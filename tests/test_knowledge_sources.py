@@ -0,0 +1,50 @@
+"""
+Federated search: abstract sources, catalog records and source timeouts
+"""
+import asyncio
+import time
+
+import pytest
+
+from utils.deadline import current_deadline
+from utils.knowledge_sources import CatalogSource, FederatedSearch, KnowledgeSource
+
+
+class SlowSource(KnowledgeSource):
+    """Source that answers after a delay, or with nothing once the current deadline has run out"""
+    
+    name = 'slow'
+    
+    def __init__(self, delay: float, priority: int = 0, timeout: float = 0.05):
+        super().__init__(priority, timeout)
+        self.delay = delay
+    
+    async def search(self, kind: str, query: str):
+        await asyncio.sleep(min(self.delay, current_deadline().remaining()))
+        if current_deadline().expired():
+            return {}
+        return {'title': query, 'extract': f"{query} ist ein Gemälde."}
+
+
+def test_source_without_search_cannot_be_created():
+    class Incomplete(KnowledgeSource):
+        pass
+    
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_catalog_returns_the_artwork_record():
+    search = FederatedSearch([CatalogSource()])
+    answer = asyncio.run(search.search_artwork('die mona lisa'))
+    assert answer['title'] == 'Mona Lisa' and answer['source'] == 'catalog'
+    assert answer['catalog_record']['artist'] == 'Leonardo da Vinci'
+    assert 'extract' not in answer
+
+
+def test_source_gives_up_at_its_timeout():
+    search = FederatedSearch([SlowSource(delay=5, timeout=0.05)])
+    started = time.monotonic()
+    assert asyncio.run(search.search_artwork('Mona Lisa')) == {}
+    assert time.monotonic() - started < 1
+    assert search.get_metrics() == {'slow_timeouts': 1, 'no_answer': 1}
@@ -0,0 +1,81 @@
+"""
+Building the offline extract index from a small dump, memory-mapped lookups, and both clients
+answering from it with WIKIPEDIA_BACKEND=offline
+"""
+import json
+import os
+
+import pytest
+
+from utils.async_wikipedia_client import AsyncWikipediaClient
+from utils.offline_index import BLOB_FILE, INDEX_FILE, OfflineIndex, build_offline_index, open_offline_index
+from utils.wikipedia_client import ClientConfig, WikipediaClient
+
+from .fake_wikipedia import FakeWikipedia, run
+
+CLIENTS = [WikipediaClient, AsyncWikipediaClient]
+
+MONA_LISA = 'Die Mona Lisa ist ein Ölgemälde von Leonardo da Vinci. Das Gemälde hängt im Louvre in Paris.'
+PICASSO = ('Pablo Picasso war ein spanischer Maler, Grafiker und Bildhauer. '
+           'Er gilt als einer der bedeutendsten Künstler des 20. Jahrhunderts.')
+WATER_LILIES = ('Water Lilies is a series of paintings by Claude Monet. '
+                'The oil paintings depict the lily pond in his garden at Giverny.')
+
+DUMP = [
+    {'title': 'Mona Lisa', 'extract': MONA_LISA, 'pageid': 3185,
+     'url': 'https://de.wikipedia.org/wiki/Mona_Lisa'},
+    {'title': 'Pablo Picasso', 'extract': PICASSO},
+    {'title': 'Water Lilies', 'extract': WATER_LILIES, 'lang': 'en'},
+    # Neither artwork nor artist: left out
+    {'title': 'Karlsplatz', 'extract': 'Der Karlsplatz ist ein Platz in der Innenstadt. Dort halten mehrere Straßenbahnlinien.'},
+    # Same key as 'Mona Lisa': the first record wins
+    {'title': 'Mona_Lisa', 'extract': 'Ein anderes Ölgemälde im Louvre.'}
+]
+
+
+@pytest.fixture
+def index(tmp_path):
+    """Offline index built from DUMP plus one malformed line"""
+    dump = tmp_path / 'dump.jsonl'
+    dump.write_text(''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in DUMP) + '{broken\n',
+                    encoding='utf-8')
+    stats = build_offline_index(str(dump), str(tmp_path / 'index'))
+    assert (stats['read'], stats['duplicates'], stats['indexed']) == (5, 1, 3)
+    index = OfflineIndex(str(tmp_path / 'index'))
+    yield index
+    index.close()
+
+
+def test_lookups_read_the_built_index(index):
+    assert len(index) == 3
+    page = index.get('de', 'mona_lisa')
+    assert (page['title'], page['pageid'], page['extract']) == ('Mona Lisa', 3185, MONA_LISA)
+    assert page['content_urls']['desktop']['page'] == 'https://de.wikipedia.org/wiki/Mona_Lisa'
+    assert index.get('en', 'Water Lilies')['language'] == 'en'
+    assert index.get('de', 'Water Lilies') is None
+    assert index.get('de', 'Karlsplatz') is None
+    assert index.get('de', 'Mona Lisa', kind='artist') is None
+
+
+@pytest.mark.parametrize('cls', CLIENTS)
+def test_offline_backend_answers_without_requests(cls, index):
+    wiki = FakeWikipedia()
+    client = cls(cache=None, backend='offline', offline_index=index)
+    wiki.install(client)
+    
+    assert run(client.search_artwork('Mona Lisa'))['extract'] == MONA_LISA
+    assert run(client.search_artist('Pablo Picasso'))['title'] == 'Pablo Picasso'
+    assert run(client.get_summary('Mona Lisa'))['title'] == 'Mona Lisa'
+    assert run(client.search_artwork('Die Sternennacht')) == {}
+    assert wiki.count() == 0
+
+
+def test_unreadable_index_is_logged_and_skipped(tmp_path, monkeypatch):
+    assert open_offline_index(str(tmp_path / 'missing')) is None
+    (tmp_path / INDEX_FILE).write_bytes(b'not an index')
+    (tmp_path / BLOB_FILE).write_bytes(b'')
+    assert open_offline_index(str(tmp_path)) is None
+    
+    # Without an index the offline backend falls back to live Wikipedia instead of failing at import
+    monkeypatch.setenv('WIKIPEDIA_BACKEND', 'offline')
+    assert ClientConfig.from_env(cache=None).backend == 'wikipedia'
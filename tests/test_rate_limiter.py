@@ -0,0 +1,57 @@
+"""
+Rate limiting of the Wikipedia clients: rejected requests and SQLite buckets in the async client
+"""
+import asyncio
+import os
+import threading
+import time
+
+from utils.async_wikipedia_client import AsyncWikipediaClient
+from utils.host_health import HostHealth
+from utils.rate_limiter import TokenBucketLimiter
+from utils.wikipedia_client import WikipediaClient
+
+from .fake_wikipedia import FakeWikipedia
+from .test_host_health import MONA_LISA, open_circuit
+
+
+def test_full_queue_does_not_take_the_trial_slot():
+    wiki = FakeWikipedia()
+    wiki.add('de', 'Mona Lisa', MONA_LISA)
+    limiter = TokenBucketLimiter(rate=0.1, burst=1, max_wait=0)
+    client = WikipediaClient(cache=None, max_retries=0, breaker_threshold=1, breaker_reset=0.05,
+                             rate_limiter=limiter)
+    wiki.install(client)
+    health = client.health.for_url(client._api_url('de'))
+    open_circuit(health)
+    limiter.reserve('de.wikipedia.org') # drain the bucket
+    time.sleep(0.06)
+    
+    assert client.get_summary('Mona Lisa') == {}
+    assert wiki.count() == 0 and client.get_metrics()['rate_limited'] == 1
+    # The breaker is only asked once a request can go out, so nobody holds the trial
+    assert health.state == HostHealth.OPEN
+    assert health.acquire() is True
+
+
+def test_async_client_reserves_sqlite_tokens_off_the_event_loop(tmp_path):
+    wiki = FakeWikipedia()
+    wiki.add('de', 'Mona Lisa', MONA_LISA)
+    limiter = TokenBucketLimiter(rate=100, burst=10, path=os.path.join(str(tmp_path), 'limits.sqlite'))
+    threads = []
+    reserve = limiter.reserve
+    
+    def recording_reserve(*args):
+        threads.append(threading.current_thread())
+        return reserve(*args)
+    
+    limiter.reserve = recording_reserve
+    client = AsyncWikipediaClient(cache=None, rate_limiter=limiter)
+    wiki.install(client)
+    
+    async def lookup():
+        return await client.get_summary('Mona Lisa')
+    
+    assert asyncio.run(lookup())['title'] == 'Mona Lisa'
+    assert threads and threading.main_thread() not in threads
+    assert client.get_host_health()['de.wikipedia.org']['state'] == HostHealth.CLOSED
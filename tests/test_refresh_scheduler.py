@@ -0,0 +1,122 @@
+"""
+Refresh scheduler: which hot cache entries one cycle refreshes, its rate cap, and start/stop
+"""
+import time
+
+import pytest
+
+from utils.access_stats import AccessStats
+from utils.refresh_scheduler import RefreshScheduler
+from utils.response_cache import ResponseCache
+from utils.wikipedia_client import WikipediaClient
+
+from .fake_wikipedia import FakeWikipedia
+
+PAGES = {
+    'Mona Lisa': 'Die Mona Lisa ist ein Ölgemälde von Leonardo da Vinci.',
+    'Seerosen': 'Seerosen ist eine Serie von Gemälden von Claude Monet.',
+    'Der Schrei': 'Der Schrei ist ein Gemälde von Edvard Munch.',
+    'Die Nachtwache': 'Die Nachtwache ist ein Gemälde von Rembrandt van Rijn.'
+}
+
+
+class FakeClock:
+    """Stands in for time.time and time.monotonic, moving only when advanced"""
+    
+    def __init__(self):
+        self.now = time.time()
+    
+    def __call__(self) -> float:
+        return self.now
+    
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(time, 'time', clock)
+    monkeypatch.setattr(time, 'monotonic', clock)
+    return clock
+
+
+def hot_client(lookups):
+    """Sync client with a 600 s cache whose access stats saw each title as often as given"""
+    wiki = FakeWikipedia()
+    for title, extract in PAGES.items():
+        wiki.add('de', title, extract)
+    client = WikipediaClient(cache=ResponseCache(ttl=600), access_stats=AccessStats(), max_retries=0)
+    wiki.install(client)
+    for title, count in lookups.items():
+        for _ in range(count):
+            client.get_summary(title)
+    return client
+
+
+def recording_refreshes(client):
+    """Queries handed to client.refresh_entries, in the order they were handed over"""
+    refreshed = []
+    refresh_entries = client.refresh_entries
+    client.refresh_entries = lambda entries: refreshed.extend(query for _, _, query, _ in entries) or refresh_entries(entries)
+    return refreshed
+
+
+def test_tick_refreshes_the_hottest_entries_once_they_are_due(clock):
+    client = hot_client({'Mona Lisa': 4, 'Seerosen': 3, 'Der Schrei': 2, 'Die Nachtwache': 1})
+    refreshed = recording_refreshes(client)
+    scheduler = RefreshScheduler(client, client.access_stats, top_n=3, window=120, idle_after=5,
+                                 concurrency=1, rate=0)
+    
+    # Visitors are still active
+    assert scheduler.run_once() == {}
+    assert scheduler.snapshot()['counters']['deferred_busy'] == 1
+    
+    # Idle, but every entry has 590 s left, far outside the 120 s window
+    clock.advance(10)
+    scheduler.run_once()
+    assert refreshed == []
+    
+    # 100 s left: the three hottest entries are due, the fourth is not hot enough
+    clock.advance(490)
+    report = scheduler.run_once()
+    assert refreshed == ['mona lisa', 'seerosen', 'der schrei']
+    assert (report['checked'], report['unchanged']) == (3, 3)
+
+
+def test_tick_is_capped_by_the_refresh_rate(clock):
+    client = hot_client({'Mona Lisa': 4, 'Seerosen': 3, 'Der Schrei': 2, 'Die Nachtwache': 1})
+    refreshed = recording_refreshes(client)
+    # 0.1 entries per second over a 20 s interval: two refreshes per cycle
+    scheduler = RefreshScheduler(client, client.access_stats, top_n=10, window=120, interval=20,
+                                 concurrency=1, rate=0.1)
+    
+    clock.advance(500)
+    scheduler.run_once()
+    assert refreshed == ['mona lisa', 'seerosen']
+    assert scheduler.snapshot()['counters']['rate_capped'] == 1
+    
+    # The bucket refills at the configured rate; the refreshed entries are no longer due
+    clock.advance(20)
+    scheduler.run_once()
+    assert refreshed == ['mona lisa', 'seerosen', 'der schrei', 'die nachtwache']
+
+
+def test_start_runs_cycles_until_stop():
+    client = hot_client({'Mona Lisa': 1})
+    scheduler = RefreshScheduler(client, client.access_stats, interval=0.02, idle_after=0)
+    
+    scheduler.start()
+    scheduler.start() # no second thread
+    try:
+        assert scheduler.running()
+        deadline = time.monotonic() + 2
+        while not scheduler.snapshot()['counters'].get('cycles') and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert scheduler.snapshot()['counters']['cycles'] >= 1
+    finally:
+        scheduler.stop(timeout=2)
+    assert not scheduler.running()
+    cycles = scheduler.snapshot()['counters']['cycles']
+    time.sleep(0.05)
+    assert scheduler.snapshot()['counters']['cycles'] == cycles
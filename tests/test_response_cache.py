@@ -0,0 +1,166 @@
+"""
+Response cache tiers, the async client's use of them, how both clients serve expired entries,
+and the negative tier that spares probes of titles known to miss
+"""
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from utils.async_wikipedia_client import AsyncWikipediaClient
+from utils.response_cache import ResponseCache
+from utils.wikipedia_client import WikipediaClient
+
+from .fake_wikipedia import FakeWikipedia, run
+
+CLIENTS = [WikipediaClient, AsyncWikipediaClient]
+
+MONA_LISA = 'Die Mona Lisa ist ein Ölgemälde von Leonardo da Vinci.'
+MONA_LISA_NEW = 'Die Mona Lisa ist ein Ölgemälde von Leonardo da Vinci im Louvre.'
+KARLSPLATZ = 'Der Karlsplatz ist ein Platz in der Innenstadt. Dort halten mehrere Straßenbahnlinien.'
+
+# search_artwork probes four title variants per language for an unmapped name
+ARTWORK_PROBES = 8
+
+
+def test_async_client_reads_entries_another_cache_wrote(tmp_path):
+    path = os.path.join(str(tmp_path), 'cache.sqlite3')
+    # Another worker process stored the summary
+    ResponseCache(path=path).set('summary', 'de', 'Mona Lisa', {'title': 'Mona Lisa', 'extract': MONA_LISA})
+    wiki = FakeWikipedia()
+    cache = ResponseCache(path=path)
+    client = AsyncWikipediaClient(cache=cache)
+    wiki.install(client)
+    reads = []
+    disk_get = cache.disk.get
+    cache.disk.get = lambda *args, **kwargs: reads.append(threading.current_thread()) or disk_get(*args, **kwargs)
+    
+    assert run(client.get_summary('Mona Lisa'))['extract'] == MONA_LISA
+    assert wiki.count() == 0 and client.get_metrics()['cache_disk_hits'] == 1
+    assert reads and threading.main_thread() not in reads # read off the event loop
+
+
+@pytest.mark.parametrize('cls', CLIENTS)
+def test_lookups_are_written_to_the_sqlite_tier(cls, tmp_path):
+    path = os.path.join(str(tmp_path), 'cache.sqlite3')
+    wiki = FakeWikipedia()
+    wiki.add('de', 'Mona Lisa', MONA_LISA)
+    client = cls(cache=ResponseCache(path=path))
+    wiki.install(client)
+    
+    run(client.get_summary('Mona Lisa'))
+    assert ResponseCache(path=path).get('summary', 'de', 'Mona Lisa')['extract'] == MONA_LISA
+
+
+def expiring_client(cls, wiki: FakeWikipedia, grace: float):
+    """Client whose cache entries expire after 200 ms"""
+    client = cls(cache=ResponseCache(ttl=0.2, grace=grace), max_retries=0)
+    wiki.install(client)
+    return client
+
+
+def call(runner: asyncio.Runner, result):
+    """Result of a client call; async calls share one event loop so background refreshes keep running"""
+    return runner.run(result) if asyncio.iscoroutine(result) else result
+
+
+@pytest.mark.parametrize('cls', CLIENTS)
+def test_entry_in_grace_is_served_and_refreshed_in_the_background(cls):
+    wiki = FakeWikipedia()
+    page = wiki.add('de', 'Mona Lisa', MONA_LISA)
+    client = expiring_client(cls, wiki, grace=60)
+    
+    with asyncio.Runner() as runner:
+        call(runner, client.get_summary('Mona Lisa'))
+        page['extract'], page['revision'] = MONA_LISA_NEW, 2
+        time.sleep(0.25)
+        assert call(runner, client.get_summary('Mona Lisa'))['extract'] == MONA_LISA
+        # Give the background refresh time to finish
+        call(runner, asyncio.sleep(0.05) if cls is AsyncWikipediaClient else time.sleep(0.05))
+        assert call(runner, client.get_summary('Mona Lisa'))['extract'] == MONA_LISA_NEW
+    assert client.get_metrics()['cache_grace_hits'] == 1
+
+
+@pytest.mark.parametrize('cls', CLIENTS)
+def test_expired_entry_is_revalidated_by_revision(cls):
+    wiki = FakeWikipedia()
+    page = wiki.add('de', 'Mona Lisa', MONA_LISA)
+    client = expiring_client(cls, wiki, grace=0)
+    run(client.get_summary('Mona Lisa'))
+    
+    # Unchanged page: one revision query instead of the summary
+    time.sleep(0.25)
+    assert run(client.get_summary('Mona Lisa'))['extract'] == MONA_LISA
+    assert (wiki.count(kind='summary'), wiki.count(kind='query')) == (1, 1)
+    
+    # Edited page: the revision differs, so the summary is fetched again
+    page['extract'], page['revision'] = MONA_LISA_NEW, 2
+    time.sleep(0.25)
+    assert run(client.get_summary('Mona Lisa'))['extract'] == MONA_LISA_NEW
+    assert (wiki.count(kind='summary'), wiki.count(kind='query')) == (2, 2)
+    metrics = client.get_metrics()
+    assert metrics['revalidated_unchanged'] == 1 and metrics['revalidated_changed'] == 1
+
+
+@pytest.mark.parametrize('cls', CLIENTS)
+def test_expired_entry_is_served_when_the_host_fails(cls):
+    wiki = FakeWikipedia()
+    wiki.add('de', 'Mona Lisa', MONA_LISA)
+    client = expiring_client(cls, wiki, grace=0)
+    run(client.get_summary('Mona Lisa'))
+    
+    time.sleep(0.25)
+    wiki.failing.add('de')
+    assert run(client.get_summary('Mona Lisa'))['extract'] == MONA_LISA
+
+
+@pytest.mark.parametrize('cls', CLIENTS)
+def test_missing_titles_are_remembered_and_not_probed_again(cls):
+    wiki = FakeWikipedia()
+    client = cls(cache=ResponseCache(), max_retries=0)
+    wiki.install(client)
+    
+    assert run(client.search_artwork('Der blaue Reiter Almanach')) == {}
+    assert wiki.count(kind='summary') == ARTWORK_PROBES
+    assert client.cache.get_negative('de', 'Der blaue Reiter Almanach') == 'missing'
+    
+    # Nothing found is not cached as a result, but every probe is answered by the negative tier
+    assert run(client.search_artwork('Der blaue Reiter Almanach')) == {}
+    assert wiki.count() == ARTWORK_PROBES
+    assert client.get_metrics()['probes_avoided'] == ARTWORK_PROBES
+
+
+@pytest.mark.parametrize('cls', CLIENTS)
+def test_negative_entries_expire_after_their_ttl(cls):
+    wiki = FakeWikipedia()
+    client = cls(cache=ResponseCache(negative_ttl=0.2), max_retries=0)
+    wiki.install(client)
+    run(client.search_artwork('Der blaue Reiter Almanach'))
+    
+    time.sleep(0.25)
+    assert client.cache.get_negative('de', 'Der blaue Reiter Almanach') is None
+    run(client.search_artwork('Der blaue Reiter Almanach'))
+    assert wiki.count() == 2 * ARTWORK_PROBES
+    assert 'probes_avoided' not in client.get_metrics()
+
+
+@pytest.mark.parametrize('cls', CLIENTS)
+def test_only_artwork_reasons_suppress_artwork_probes(cls):
+    wiki = FakeWikipedia()
+    wiki.add('de', 'Karlsplatz', KARLSPLATZ)
+    client = cls(cache=ResponseCache(), max_retries=0)
+    wiki.install(client)
+    
+    assert run(client.search_artwork('Karlsplatz')) == {}
+    assert client.cache.get_negative('de', 'Karlsplatz') == 'not_artwork'
+    
+    # 'not_artwork' says nothing about an artist page, so the artist search still fetches it
+    assert run(client.search_artist('Karlsplatz'))['title'] == 'Karlsplatz'
+    assert 'probes_avoided' not in client.get_metrics()
+    
+    sent = wiki.count()
+    assert run(client.search_artwork('Karlsplatz')) == {}
+    assert wiki.count() == sent
+    assert client.get_metrics()['probes_avoided'] == ARTWORK_PROBES
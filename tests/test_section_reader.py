@@ -0,0 +1,49 @@
+"""
+"Tell me more" paging through a page's sections with the content cursor
+"""
+import pytest
+
+from utils.async_wikipedia_client import AsyncWikipediaClient
+from utils.response_cache import ResponseCache
+from utils.section_reader import make_cursor, section_text
+from utils.wikipedia_client import WikipediaClient
+
+from .fake_wikipedia import FakeWikipedia, run
+
+CLIENTS = [WikipediaClient, AsyncWikipediaClient]
+
+SECTIONS = [
+    ('Geschichte', 'Leonardo begann das Bildnis um 1503 in Florenz.'),
+    ('Literatur', 'Zöllner, Frank: Leonardo da Vinci. Köln 2003.'),
+    ('Rezeption', 'Das Gemälde wurde 1911 aus dem Louvre gestohlen.')
+]
+
+
+def test_section_text_drops_references_and_tables():
+    html = ('<div><h2>Geschichte<span class="mw-editsection">[Bearbeiten]</span></h2>'
+            '<table><tr><td>Infobox</td></tr></table>'
+            '<p>Leonardo begann das Bildnis<sup class="reference">[1]</sup> um 1503.</p></div>')
+    assert section_text(html) == ('Geschichte', 'Leonardo begann das Bildnis um 1503.')
+
+
+@pytest.mark.parametrize('cls', CLIENTS)
+def test_cursor_pages_through_readable_sections(cls):
+    wiki = FakeWikipedia()
+    page = wiki.add('de', 'Mona Lisa', 'Die Mona Lisa ist ein Ölgemälde von Leonardo da Vinci.', sections=SECTIONS)
+    client = cls(cache=ResponseCache())
+    wiki.install(client)
+    start = make_cursor('artwork', {'title': 'Mona Lisa', 'pageid': page['pageid'], 'language': 'de'})
+    
+    section, cursor = run(client.read_next_section(start))
+    assert section['heading'] == 'Geschichte' and cursor['section'] == 1
+    # The reference list is skipped
+    section, cursor = run(client.read_next_section(cursor))
+    assert section['heading'] == 'Rezeption' and cursor['section'] == 3
+    section, cursor = run(client.read_next_section(cursor))
+    assert section == {} and cursor['finished']
+    # The section list and each section were requested once
+    assert wiki.count(kind='parse') == 3
+    
+    # Reading the page again is served from the cache
+    section, _ = run(client.read_next_section(start))
+    assert section['text'] == SECTIONS[0][1] and wiki.count(kind='parse') == 3
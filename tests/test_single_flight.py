@@ -0,0 +1,86 @@
+"""
+Coalescing of concurrent identical lookups: one set of upstream requests, private copies of the
+result, and followers that never wait past their own deadline
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils.async_wikipedia_client import AsyncWikipediaClient
+from utils.wikipedia_client import WikipediaClient
+
+from .fake_wikipedia import FakeWikipedia
+
+CALLERS = 5
+MONA_LISA = 'Die Mona Lisa ist ein Ölgemälde von Leonardo da Vinci.'
+
+
+def slow_wikipedia(delay: float) -> FakeWikipedia:
+    wiki = FakeWikipedia()
+    wiki.add('de', 'Mona Lisa', MONA_LISA)
+    wiki.delays['de'] = delay
+    return wiki
+
+
+def concurrently(cls, client, deadlines):
+    """
+    Run get_summary('Mona Lisa') calls started 20 ms apart, with one deadline per caller
+    
+    Returns:
+        List of (result, seconds the call took) in start order
+    """
+    if cls is AsyncWikipediaClient:
+        async def timed(deadline):
+            started = time.monotonic()
+            result = await client.get_summary('Mona Lisa', deadline=deadline)
+            return result, time.monotonic() - started
+        
+        async def lookups():
+            tasks = []
+            for deadline in deadlines:
+                tasks.append(asyncio.ensure_future(timed(deadline)))
+                await asyncio.sleep(0.02)
+            return await asyncio.gather(*tasks)
+        return asyncio.run(lookups())
+    
+    def timed(deadline):
+        started = time.monotonic()
+        result = client.get_summary('Mona Lisa', deadline=deadline)
+        return result, time.monotonic() - started
+    
+    with ThreadPoolExecutor(max_workers=len(deadlines)) as executor:
+        futures = []
+        for deadline in deadlines:
+            futures.append(executor.submit(timed, deadline))
+            time.sleep(0.02)
+        return [future.result() for future in futures]
+
+
+@pytest.mark.parametrize('cls', [WikipediaClient, AsyncWikipediaClient])
+def test_identical_lookups_share_one_request(cls):
+    wiki = slow_wikipedia(0.2)
+    client = cls(cache=None)
+    wiki.install(client)
+    
+    results = [result for result, _ in concurrently(cls, client, [None] * CALLERS)]
+    assert wiki.count() == 1 and client.get_metrics()['coalesced_lookups'] == CALLERS - 1
+    assert all(result['extract'] == MONA_LISA for result in results)
+    # Every caller owns its copy
+    results[0]['extract'] = 'changed'
+    assert all(result['extract'] == MONA_LISA for result in results[1:])
+    assert len({id(result) for result in results}) == CALLERS
+
+
+@pytest.mark.parametrize('cls', [WikipediaClient, AsyncWikipediaClient])
+def test_follower_does_not_wait_past_its_deadline(cls):
+    wiki = slow_wikipedia(1.0)
+    client = cls(cache=None)
+    wiki.install(client)
+    
+    # The leader has no deadline of its own; the follower joins with a 200 ms budget
+    (leader, _), (follower, waited) = concurrently(cls, client, [None, 0.2])
+    assert leader['extract'] == MONA_LISA and follower == {}
+    assert waited < 0.5
+    assert wiki.count() == 1
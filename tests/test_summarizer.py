@@ -0,0 +1,29 @@
+"""
+Sentence boundaries used to trim intro extracts
+"""
+from utils.summarizer import sentence_ends
+
+
+def sentences(text):
+    ends = sentence_ends(text)
+    return [text[start:end].strip() for start, end in zip([0] + ends, ends)]
+
+
+def test_ordinal_dots_do_not_end_sentences():
+    text = ('Pablo Picasso (* 25. Oktober 1881 in Málaga; † 8. April 1973 in Mougins) war ein spanischer Maler. '
+            'Er gilt als einer der bedeutendsten Künstler des 20. Jahrhunderts. Mehr')
+    assert sentences(text) == [
+        'Pablo Picasso (* 25. Oktober 1881 in Málaga; † 8. April 1973 in Mougins) war ein spanischer Maler.',
+        'Er gilt als einer der bedeutendsten Künstler des 20. Jahrhunderts.'
+    ]
+
+
+def test_abbreviations_do_not_end_sentences():
+    text = 'Er malte u. a. Porträts, z. B. von Dora Maar. Ca. 50.000 Werke sind bekannt, vgl. Zervos. Mehr'
+    assert sentences(text) == ['Er malte u. a. Porträts, z. B. von Dora Maar.',
+                               'Ca. 50.000 Werke sind bekannt, vgl. Zervos.']
+
+
+def test_years_and_other_punctuation_end_sentences():
+    text = 'Er starb 1973. War das das Ende? Nein! Mehr'
+    assert sentences(text) == ['Er starb 1973.', 'War das das Ende?', 'Nein!']
@@ -0,0 +1,149 @@
+"""
+Title memo: batched last-use updates, expiry, and memoized pages followed by their pageid
+"""
+import os
+import sqlite3
+import time
+
+import pytest
+
+from utils.async_wikipedia_client import AsyncWikipediaClient
+from utils.title_memo import TOUCH_BATCH, TitleMemo, memo_key
+from utils.wikipedia_client import WikipediaClient
+
+from .fake_wikipedia import FakeWikipedia, run
+
+CLIENTS = [WikipediaClient, AsyncWikipediaClient]
+
+# An artist page whose opening names no profession, so is_artist_content rejects it
+ABRAMOVIC = ('Marina Abramović ist eine serbische Pionierin der Performance-Kunst. '
+             'Sie lebt seit vielen Jahren in New York.')
+
+
+def used_at(path: str, key: str) -> float:
+    with sqlite3.connect(path) as connection:
+        return connection.execute('SELECT used_at FROM title_memo WHERE key = ?', (key,)).fetchone()[0]
+
+
+def test_hits_update_the_last_use_in_batches(tmp_path):
+    path = os.path.join(str(tmp_path), 'memo.sqlite3')
+    memo = TitleMemo(path=path)
+    memo.put('artist', 'Picasso', 'de', 'Pablo Picasso', 101)
+    stored = used_at(path, memo_key('artist', 'Picasso'))
+    
+    for _ in range(TOUCH_BATCH - 1):
+        assert memo.get('artist', 'Picasso')['title'] == 'Pablo Picasso'
+    assert used_at(path, memo_key('artist', 'Picasso')) == stored
+    
+    memo.get('artist', 'Picasso')
+    assert used_at(path, memo_key('artist', 'Picasso')) > stored
+    memo.close()
+
+
+def test_pending_last_use_is_written_with_the_next_store(tmp_path):
+    path = os.path.join(str(tmp_path), 'memo.sqlite3')
+    memo = TitleMemo(path=path)
+    memo.put('artist', 'Picasso', 'de', 'Pablo Picasso', 101)
+    stored = used_at(path, memo_key('artist', 'Picasso'))
+    memo.get('artist', 'Picasso')
+    
+    memo.put('artist', 'Monet', 'de', 'Claude Monet', 102)
+    assert used_at(path, memo_key('artist', 'Picasso')) > stored
+    memo.close()
+
+
+
+def test_entries_expire_after_max_age(tmp_path):
+    path = os.path.join(str(tmp_path), 'memo.sqlite3')
+    memo = TitleMemo(path=path, max_age=0.1)
+    memo.put('artist', 'Picasso', 'de', 'Pablo Picasso', 101)
+    assert memo.get('artist', 'Picasso')['title'] == 'Pablo Picasso'
+    assert TitleMemo(path=path, max_age=0.1).get('artist', 'Picasso')['title'] == 'Pablo Picasso'
+    
+    time.sleep(0.15)
+    assert memo.get('artist', 'Picasso') is None
+    assert memo.stats()['expired'] == 1
+    assert TitleMemo(path=path, max_age=0.1).get('artist', 'Picasso') is None
+    memo.close()
+
+
+def test_rows_without_a_store_time_expire_by_their_last_use(tmp_path):
+    path = os.path.join(str(tmp_path), 'memo.sqlite3')
+    with sqlite3.connect(path) as connection:
+        connection.execute('CREATE TABLE title_memo (key TEXT PRIMARY KEY, language TEXT NOT NULL, '
+                           'title TEXT NOT NULL, pageid INTEGER, used_at REAL NOT NULL)')
+        connection.execute('INSERT INTO title_memo VALUES (?, ?, ?, ?, ?)',
+                           (memo_key('artist', 'Picasso'), 'de', 'Pablo Picasso', 101, time.time() - 100))
+    
+    assert TitleMemo(path=path, max_age=1000).get('artist', 'Picasso')['title'] == 'Pablo Picasso'
+    assert TitleMemo(path=path, max_age=50).get('artist', 'Picasso') is None
+
+
+def memo_client(cls, wiki: FakeWikipedia):
+    client = cls(cache=None, title_memo=TitleMemo())
+    wiki.install(client)
+    return client
+
+
+@pytest.mark.parametrize('cls', CLIENTS)
+def test_memoized_page_is_trusted_by_pageid(cls):
+    wiki = FakeWikipedia()
+    wiki.add('de', 'Marina Abramović', ABRAMOVIC)
+    client = memo_client(cls, wiki)
+    assert run(client.search_artist('Marina Abramović'))['title'] == 'Marina Abramović'
+    wiki.requests.clear()
+    
+    result = run(client.search_artist('Marina Abramović'))
+    assert (result['title'], result['language']) == ('Marina Abramović', 'de')
+    assert wiki.count() == 1 and client.get_metrics()['memo_shortcuts'] == 1
+
+
+@pytest.mark.parametrize('cls', CLIENTS)
+def test_renamed_page_is_followed_and_remembered(cls):
+    wiki = FakeWikipedia()
+    page = wiki.add('de', 'Marina Abramović', ABRAMOVIC)
+    client = memo_client(cls, wiki)
+    run(client.search_artist('Marina Abramović'))
+    
+    del wiki.pages[('de', 'Marina Abramović')]
+    page['title'] = 'Marina Abramović (Künstlerin)'
+    wiki.pages[('de', page['title'])] = page
+    wiki.requests.clear()
+    
+    assert run(client.search_artist('Marina Abramović'))['title'] == 'Marina Abramović (Künstlerin)'
+    assert wiki.count() == 1
+    assert client.title_memo.get('artist', 'Marina Abramović')['title'] == 'Marina Abramović (Künstlerin)'
+
+
+@pytest.mark.parametrize('cls', CLIENTS)
+def test_deleted_page_invalidates_the_memo(cls):
+    wiki = FakeWikipedia()
+    wiki.add('de', 'Marina Abramović', ABRAMOVIC)
+    client = memo_client(cls, wiki)
+    run(client.search_artist('Marina Abramović'))
+    del wiki.pages[('de', 'Marina Abramović')]
+    wiki.requests.clear()
+    
+    assert not run(client.search_artist('Marina Abramović'))
+    assert client.get_metrics()['memo_invalidated'] == 1
+    assert client.title_memo.get('artist', 'Marina Abramović') is None
+    # The memo fetch, then the full resolution
+    assert wiki.count() > 1
+
+
+@pytest.mark.parametrize('cls', CLIENTS)
+def test_expired_memo_entry_is_resolved_again(cls):
+    wiki = FakeWikipedia()
+    wiki.add('de', 'Marina Abramović', ABRAMOVIC)
+    client = cls(cache=None, title_memo=TitleMemo(max_age=0.1))
+    wiki.install(client)
+    run(client.search_artist('Marina Abramović'))
+    stored_at = client.title_memo.get('artist', 'Marina Abramović')['stored_at']
+    time.sleep(0.15)
+    wiki.requests.clear()
+    
+    assert run(client.search_artist('Marina Abramović'))['title'] == 'Marina Abramović'
+    metrics = client.get_metrics()
+    assert metrics['memo_expired'] == 1 and 'memo_shortcuts' not in metrics
+    assert wiki.count() > 1 # the full resolution, not one memo fetch
+    assert client.title_memo.get('artist', 'Marina Abramović')['stored_at'] > stored_at
@@ -0,0 +1,198 @@
+"""
+Lookups of the sync and async Wikipedia clients against an in-memory Wikipedia: the requests each
+resolution mode sends and the results it picks
+"""
+import sys
+import time
+
+import pytest
+
+from utils.async_wikipedia_client import AsyncWikipediaClient
+from utils.wikipedia_client import HEDGE_MIN_SAMPLES, ClientConfig, WikipediaClient
+
+from .fake_wikipedia import FakeWikipedia, run
+
+CLIENTS = [WikipediaClient, AsyncWikipediaClient]
+
+PICASSO_DE = ('Pablo Picasso war ein spanischer Maler, Grafiker und Bildhauer. '
+              'Er gilt als einer der bedeutendsten Künstler des 20. Jahrhunderts.')
+PICASSO_EN = ('Pablo Picasso was a Spanish painter, sculptor and printmaker. '
+              'He is one of the most influential artists of the 20th century.')
+SEEROSEN_DE = ('Seerosen ist eine Serie von Gemälden von Claude Monet. '
+               'Die Ölgemälde zeigen den Seerosenteich in seinem Garten in Giverny.')
+SEEROSEN_EN = ('Water Lilies is a series of paintings by Claude Monet. '
+               'The oil paintings depict the lily pond in his garden at Giverny.')
+
+TURM_DE = 'Der Turm der blauen Pferde ist ein Gemälde des deutschen Malers Franz Marc aus dem Jahr 1913.'
+
+
+
+def museum_wikipedia() -> FakeWikipedia:
+    wiki = FakeWikipedia()
+    wiki.add('de', 'Pablo Picasso', PICASSO_DE, langlinks={'en': 'Pablo Picasso'}, redirects=('Picasso',))
+    wiki.add('en', 'Pablo Picasso', PICASSO_EN)
+    wiki.add('de', 'Seerosen', SEEROSEN_DE, langlinks={'en': 'Water Lilies'}, redirects=('Seerosen Bild',))
+    wiki.add('en', 'Water Lilies', SEEROSEN_EN)
+    return wiki
+
+
+@pytest.mark.parametrize('resolution, german, english', [
+    ('variants', 5, 1), # four title variants and the langlink query; the English equivalent
+    ('batch', 1, 1),    # all variants in one query per language
+    ('search', 1, 1)    # one full-text search; the English equivalent
+])
+@pytest.mark.parametrize('cls', CLIENTS)
+def test_requests_per_resolution_mode(cls, resolution, german, english):
+    wiki = museum_wikipedia()
+    client = cls(cache=None, resolution=resolution)
+    wiki.install(client)
+    
+    result = run(client.search_artwork('Seerosen Bild'))
+    assert (result['title'], result['language']) == ('Seerosen', 'de')
+    assert (wiki.count('de'), wiki.count('en')) == (german, english)
+
+
+@pytest.mark.parametrize('query', ['Seerosen', 'Seerosen Bild', 'Water Lilies', 'Unbekanntes Bild'])
+@pytest.mark.parametrize('resolution', ['variants', 'batch', 'search'])
+@pytest.mark.parametrize('cls', CLIENTS)
+def test_concurrent_probes_pick_the_sequential_result(cls, resolution, query):
+    results = []
+    for concurrent in (False, True):
+        wiki = museum_wikipedia()
+        client = cls(cache=None, resolution=resolution, concurrent_probes=concurrent)
+        wiki.install(client)
+        result = run(client.search_artwork(query))
+        results.append((result.get('title'), result.get('language')))
+    assert results[0] == results[1]
+
+
+@pytest.mark.parametrize('cls', CLIENTS)
+def test_sync_and_async_clients_send_the_same_requests(cls):
+    wiki = museum_wikipedia()
+    client = cls(cache=None)
+    wiki.install(client)
+    
+    run(client.search_artwork('Seerosen Bild'))
+    run(client.search_artist('Picasso'))
+    assert wiki.requests == [('de', 'summary')] * 4 + [('de', 'query'), ('en', 'summary'), ('de', 'summary'), ('de', 'query')]
+
+
+@pytest.mark.parametrize('concurrent', [False, True])
+@pytest.mark.parametrize('cls', CLIENTS)
+def test_english_artwork_probes_only_the_german_equivalent(cls, concurrent):
+    wiki = museum_wikipedia()
+    client = cls(cache=None, concurrent_probes=concurrent)
+    wiki.install(client)
+    
+    # German finds the page without a perfect match, so English is asked too - for its equivalent only
+    result = run(client.search_artwork('Seerosen Bild'))
+    assert (result['title'], result['language']) == ('Seerosen', 'de')
+    assert wiki.count('en') == 1 and client.get_metrics()['langlink_fallbacks'] == 1
+
+
+@pytest.mark.parametrize('concurrent', [False, True])
+@pytest.mark.parametrize('cls', CLIENTS)
+def test_page_reached_by_two_variants_is_scored_once(cls, concurrent, monkeypatch):
+    wiki = FakeWikipedia()
+    wiki.add('de', 'Turm der blauen Pferde', TURM_DE,
+             redirects=('Der Turm der blauen Pferde (painting)', 'Der Turm der blauen Pferde (Gemälde)'))
+    client = cls(cache=None, concurrent_probes=concurrent)
+    wiki.install(client)
+    scored = []
+    module = sys.modules[WikipediaClient.__module__]
+    score = module.calculate_relevance_score
+    monkeypatch.setattr(module, 'calculate_relevance_score',
+                        lambda query, title, extract: scored.append(title) or score(query, title, extract))
+    
+    assert run(client.search_artwork('Der Turm der blauen Pferde'))['title'] == 'Turm der blauen Pferde'
+    assert scored == ['Turm der blauen Pferde']
+    assert client.get_metrics()['dedup_pages_skipped'] == 1
+
+
+@pytest.mark.parametrize('cls', CLIENTS)
+def test_perfect_later_probe_does_not_wait_for_slower_ones(cls):
+    wiki = FakeWikipedia()
+    wiki.add('de', 'Der Turm der blauen Pferde', TURM_DE, redirects=('Der Turm der blauen Pferde (painting)',))
+    wiki.slow_titles[('de', 'Der Turm der blauen Pferde')] = 1.5
+    client = cls(cache=None, concurrent_probes=True)
+    wiki.install(client)
+    
+    started = time.monotonic()
+    result = run(client.search_artwork('Der Turm der blauen Pferde'))
+    assert result['title'] == 'Der Turm der blauen Pferde'
+    # The '(painting)' redirect scores a perfect match while the plain title is still loading
+    assert time.monotonic() - started < 1
+
+
+@pytest.mark.parametrize('cls', CLIENTS)
+def test_parallel_passes_send_no_english_requests_for_a_german_match(cls):
+    wiki = museum_wikipedia()
+    # A slow German host and a fast English one that answers no variant
+    wiki.delays = {'de': 0.05, 'en': 0.001}
+    client = cls(cache=None, parallel_languages=True)
+    wiki.install(client)
+    
+    result = run(client.search_artist('Picasso'))
+    assert (result['title'], result['language']) == ('Pablo Picasso', 'de')
+    # Same round trips as the sequential passes: the German probe and the detail fetch
+    assert wiki.count('de') == 2 and wiki.count('en') == 0
+
+
+@pytest.mark.parametrize('cls', CLIENTS)
+def test_parallel_english_pass_starts_after_the_german_head_start(cls):
+    wiki = museum_wikipedia()
+    del wiki.pages[('de', 'Pablo Picasso')]
+    wiki.delays = {'de': 0.05}
+    client = cls(cache=None, parallel_languages=True)
+    wiki.install(client)
+    client.health.for_url(client._api_url('de')).latency.add(0.01)
+    
+    result = run(client.search_artist('Picasso'))
+    assert (result['title'], result['language']) == ('Pablo Picasso', 'en')
+    assert client.get_metrics()['parallel_artist_passes'] == 1
+
+
+@pytest.mark.parametrize('cls', CLIENTS)
+def test_hedged_german_pass_is_cancelled_when_english_wins(cls):
+    wiki = museum_wikipedia()
+    wiki.delays = {'de': 0.2}
+    client = cls(cache=None, hedging=True)
+    wiki.install(client)
+    for _ in range(HEDGE_MIN_SAMPLES):
+        client._pass_latency['de'].add(0.01)
+    
+    result = run(client.search_artist('Picasso'))
+    assert (result['title'], result['language']) == ('Pablo Picasso', 'en')
+    assert client.get_metrics()['hedge_wins'] == 1
+    time.sleep(0.3) # let the German probe that was already in flight come back
+    # The German pass stopped after that probe instead of fetching the page's details
+    assert wiki.count('de') == 1
+    assert len(client._pass_latency['de']) == HEDGE_MIN_SAMPLES
+
+
+@pytest.mark.parametrize('cls', CLIENTS)
+def test_summary_is_trimmed_at_real_sentence_ends(cls):
+    wiki = FakeWikipedia()
+    wiki.add('de', 'Pablo Picasso', 'Pablo Picasso (* 25. Oktober 1881; † 8. April 1973) war ein spanischer Maler. '
+             'Er schuf u. a. Guernica. Er starb 1973 in Mougins.')
+    client = cls(cache=None, extract_sentences=2)
+    wiki.install(client)
+    
+    result = run(client.get_summary('Pablo Picasso'))
+    assert result['extract'] == ('Pablo Picasso (* 25. Oktober 1881; † 8. April 1973) war ein spanischer Maler. '
+                                 'Er schuf u. a. Guernica.')
+    assert result['extract_trimmed']
+
+
+@pytest.mark.parametrize('cls', CLIENTS)
+def test_client_options_come_from_one_config(cls, monkeypatch):
+    monkeypatch.setenv('WIKIPEDIA_TIMEOUT', '4')
+    monkeypatch.setenv('WIKIPEDIA_RESOLUTION', 'search')
+    config = ClientConfig.from_env(cache=None, max_retries=0)
+    
+    client = cls(config, search_top_k=3)
+    assert (client.timeout, client.probe_deadline, client.resolution) == (4, 4, 'search')
+    assert (client.cache, client.max_retries, client.search_top_k) == (None, 0, 3)
+    assert config.search_top_k == 5
+    with pytest.raises(TypeError):
+        cls(config, max_retry=1)